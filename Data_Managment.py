@@ -12,15 +12,17 @@ Contents:
 - High-level responsibilities of this module
 - Key classes and functions defined here
 - Notes on usage and important behaviors
+- A trigram index per table (text_search.TrigramIndex) kept current by add_*, load_all and the Person setters
 """'''
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, List, Optional, Union
 from pathlib import Path
 import json
 from person import ValidationError
 from Student import Student
 from instructor import Instructor
 from course import Course
+from text_search import TrigramIndex
 STUDENTS_JSON = Path('students.json')
 INSTRUCTORS_JSON = Path('instructors.json')
 COURSES_JSON = Path('courses.json')
@@ -35,6 +37,42 @@ class DataStore:
         self.students: Dict[str, Student] = {}
         self.instructors: Dict[str, Instructor] = {}
         self.courses: Dict[str, Course] = {}
+        self.search_index: Dict[str, TrigramIndex] = {'students': TrigramIndex(), 'instructors': TrigramIndex(), 'courses': TrigramIndex()}
+
+    def index_entity(self, entity: Union[Student, Instructor, Course]) -> None:
+        '''    """Add or refresh one entity in its table's search index and watch it for later edits.
+
+Person name/email setters call back here; a renamed Course must be passed in again by the caller.
+
+Parameters:
+    entity: parameter.
+    """'''
+        if isinstance(entity, Student):
+            self.search_index['students'].add(entity.student_id, entity.student_id, entity.name, entity.email)
+        elif isinstance(entity, Instructor):
+            self.search_index['instructors'].add(entity.instructor_id, entity.instructor_id, entity.name, entity.email)
+        else:
+            self.search_index['courses'].add(entity.course_id, entity.course_id, entity.course_name)
+        entity._on_change = self.index_entity
+
+    def search(self, table: str, query: str, limit: Optional[int]=None) -> List[Union[Student, Instructor, Course]]:
+        '''    """Entities whose ID, name or email (courses: ID or name) contain query, ignoring case and accents.
+
+Parameters:
+    table: 'students', 'instructors' or 'courses'.
+    query: parameter.
+    limit: return at most this many matches.
+    """'''
+        if table not in self.search_index:
+            raise ValidationError(f"Unknown table '{table}'.")
+        rows = getattr(self, table)
+        return [rows[k] for k in self.search_index[table].search(query, limit)]
+
+    def search_index_memory(self) -> Dict[str, Dict[str, int]]:
+        '''"""Approximate memory held by each table's search index.
+
+"""'''
+        return {t: idx.memory_usage() for t, idx in self.search_index.items()}
 
     def add_student(self, name: str, age: int, email: str, student_id: str) -> Student:
         '''    """Add a new student to the store or current view.
@@ -49,6 +87,7 @@ Parameters:
             raise ValidationError(f"Student ID '{student_id}' exists.")
         s = Student(name, age, email, student_id)
         self.students[student_id] = s
+        self.index_entity(s)
         return s
 
     def add_instructor(self, name: str, age: int, email: str, instructor_id: str) -> Instructor:
@@ -64,6 +103,7 @@ Parameters:
             raise ValidationError(f"Instructor ID '{instructor_id}' exists.")
         i = Instructor(name, age, email, instructor_id)
         self.instructors[instructor_id] = i
+        self.index_entity(i)
         return i
 
     def add_course(self, course_id: str, course_name: str) -> Course:
@@ -77,6 +117,7 @@ Parameters:
             raise ValidationError(f"Course ID '{course_id}' exists.")
         c = Course(course_id, course_name)
         self.courses[course_id] = c
+        self.index_entity(c)
         return c
     adstudent = add_student
     adinstructor = add_instructor
@@ -175,33 +216,35 @@ Parameters:
     def load_all(cls) -> 'DataStore':
         '''"""Load data into memory from JSON files.
 
+Records were validated when save_all wrote them, so entities are rebuilt
+through the trusted from_trusted constructors and each file is parsed once.
 """'''
         ds = cls()
-        if STUDENTS_JSON.exists():
-            for s in json.loads(STUDENTS_JSON.read_text(encoding='utf-8')):
-                ds.students[s['student_id']] = Student(s['name'], int(s['age']), s['email'], s['student_id'])
-        if INSTRUCTORS_JSON.exists():
-            for rec in json.loads(INSTRUCTORS_JSON.read_text(encoding='utf-8')):
-                ds.instructors[rec['instructor_id']] = Instructor(rec['name'], int(rec['age']), rec['email'], rec['instructor_id'])
-        if COURSES_JSON.exists():
-            for c in json.loads(COURSES_JSON.read_text(encoding='utf-8')):
-                ds.courses[c['course_id']] = Course(c['course_id'], c['course_name'])
-        if STUDENTS_JSON.exists():
-            for s in json.loads(STUDENTS_JSON.read_text(encoding='utf-8')):
-                st = ds.students[s['student_id']]
-                for cid in s.get('registered_course_ids', []):
-                    st.register_course(ds._get_course(cid))
-        if INSTRUCTORS_JSON.exists():
-            for rec in json.loads(INSTRUCTORS_JSON.read_text(encoding='utf-8')):
-                ins = ds.instructors[rec['instructor_id']]
-                for cid in rec.get('assigned_course_ids', []):
-                    ins.assign_course(ds._get_course(cid))
-        if COURSES_JSON.exists():
-            for c in json.loads(COURSES_JSON.read_text(encoding='utf-8')):
-                crs = ds.courses[c['course_id']]
-                ins_id = c.get('instructor_id')
-                if ins_id:
-                    crs.set_instructor(ds._get_instructor(ins_id))
-                for sid in c.get('enrolled_student_ids', []):
-                    crs.add_student(ds._get_student(sid))
+        students = json.loads(STUDENTS_JSON.read_text(encoding='utf-8')) if STUDENTS_JSON.exists() else []
+        instructors = json.loads(INSTRUCTORS_JSON.read_text(encoding='utf-8')) if INSTRUCTORS_JSON.exists() else []
+        courses = json.loads(COURSES_JSON.read_text(encoding='utf-8')) if COURSES_JSON.exists() else []
+        for s in students:
+            ds.students[s['student_id']] = Student.from_trusted(s['name'], int(s['age']), s['email'], s['student_id'])
+        for rec in instructors:
+            ds.instructors[rec['instructor_id']] = Instructor.from_trusted(rec['name'], int(rec['age']), rec['email'], rec['instructor_id'])
+        for c in courses:
+            ds.courses[c['course_id']] = Course.from_trusted(c['course_id'], c['course_name'])
+        for table in (ds.students, ds.instructors, ds.courses):
+            for entity in table.values():
+                ds.index_entity(entity)
+        for s in students:
+            st = ds.students[s['student_id']]
+            for cid in s.get('registered_course_ids', []):
+                st.register_course(ds._get_course(cid))
+        for rec in instructors:
+            ins = ds.instructors[rec['instructor_id']]
+            for cid in rec.get('assigned_course_ids', []):
+                ins.assign_course(ds._get_course(cid))
+        for c in courses:
+            crs = ds.courses[c['course_id']]
+            ins_id = c.get('instructor_id')
+            if ins_id:
+                crs.set_instructor(ds._get_instructor(ins_id))
+            for sid in c.get('enrolled_student_ids', []):
+                crs.add_student(ds._get_student(sid))
         return ds
\ No newline at end of file
@@ -15,6 +15,7 @@ Contents:
 """'''
 from typing import List
 from person import Person, ValidationError
+from validators import require_text
 from course import Course
 
 class Student(Person):
@@ -30,11 +31,24 @@ Parameters:
     student_id: parameter.
     """'''
         super().__init__(name, age, email)
-        if not isinstance(student_id, str) or not student_id.strip():
-            raise ValidationError('Student ID cannot be empty.')
-        self.student_id = student_id.strip()
+        self.student_id = require_text(student_id, 'Student ID cannot be empty.')
         self.registered_courses: List[Course] = []
 
+    @classmethod
+    def from_trusted(cls, name: str, age: int, email: str, student_id: str) -> 'Student':
+        '''    """Build a student from already-validated data (e.g. rows written by DataStore.save_all).
+
+Parameters:
+    name: parameter.
+    age: parameter.
+    email: parameter.
+    student_id: parameter.
+    """'''
+        obj = super().from_trusted(name, age, email)
+        obj.student_id = student_id
+        obj.registered_courses = []
+        return obj
+
     def register_course(self, course: Course) -> None:
         '''    """Register course.
 
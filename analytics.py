@@ -0,0 +1,270 @@
+'''"""
+Columnar Enrollment Analytics — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- EnrollmentMatrix: integer-coded NumPy snapshot of students, instructors, courses and registrations
+- CSR-style course -> student adjacency (indptr/indices) plus its student -> course transpose
+- Vectorized aggregations (counts, histograms, top-k) for reports and UI summary panels
+"""'''
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from db_store import DBStore, _SQL
+from person import ValidationError
+
+class EnrollmentMatrix:
+    """Read-only columnar snapshot of a DBStore with integer-coded entities and CSR enrollment adjacency."""
+
+    def __init__(self, student_ids: Sequence[str], student_ages: Sequence[int], instructor_ids: Sequence[str], course_ids: Sequence[str], course_instructor: Sequence[int], reg_course: Sequence[int], reg_student: Sequence[int]):
+        '''    """  init  .
+
+Parameters:
+    student_ids: student IDs; position is the student code.
+    student_ages: ages aligned with student_ids.
+    instructor_ids: instructor IDs; position is the instructor code.
+    course_ids: course IDs; position is the course code.
+    course_instructor: instructor code per course (-1 when unassigned).
+    reg_course: course code of each registration.
+    reg_student: student code of each registration.
+    """'''
+        self.student_ids = np.asarray(student_ids, dtype=object)
+        self.student_ages = np.asarray(student_ages, dtype=np.int64)
+        self.instructor_ids = np.asarray(instructor_ids, dtype=object)
+        self.course_ids = np.asarray(course_ids, dtype=object)
+        self.course_instructor = np.asarray(course_instructor, dtype=np.int64)
+        reg_course = np.asarray(reg_course, dtype=np.int64)
+        reg_student = np.asarray(reg_student, dtype=np.int64)
+        n_courses = len(self.course_ids)
+        n_students = len(self.student_ids)
+        order = np.lexsort((reg_student, reg_course))
+        self.indices = reg_student[order]
+        self.indptr = np.zeros(n_courses + 1, dtype=np.int64)
+        np.cumsum(np.bincount(reg_course, minlength=n_courses), out=self.indptr[1:])
+        t_order = np.lexsort((reg_course, reg_student))
+        self.t_indices = reg_course[t_order]
+        self.t_indptr = np.zeros(n_students + 1, dtype=np.int64)
+        np.cumsum(np.bincount(reg_student, minlength=n_students), out=self.t_indptr[1:])
+        self._student_code: Optional[Dict[str, int]] = None
+        self._course_code: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_db(cls, db: DBStore) -> 'EnrollmentMatrix':
+        '''    """Load a snapshot with one query per table instead of per-course lookups.
+
+The four queries run in one read transaction, so a commit from another
+connection cannot add registrations whose student or course the snapshot lacks.
+
+Parameters:
+    db: open DBStore to read from.
+    """'''
+        conn = db.conn
+        own = not conn.in_transaction
+        if own:
+            conn.execute('BEGIN')
+        try:
+            students = conn.execute(_SQL['analytics_students']).fetchall()
+            instructors = [r[0] for r in conn.execute(_SQL['analytics_instructors'])]
+            courses = conn.execute(_SQL['analytics_courses']).fetchall()
+            regs = conn.execute(_SQL['analytics_registrations']).fetchall()
+        finally:
+            if own:
+                conn.commit()
+        s_code = {sid: n for n, (sid, _age) in enumerate(students)}
+        i_code = {iid: n for n, iid in enumerate(instructors)}
+        c_code = {cid: n for n, (cid, _ins) in enumerate(courses)}
+        m = cls([r[0] for r in students], [r[1] for r in students], instructors, [r[0] for r in courses], [i_code.get(r[1], -1) for r in courses], [c_code[c] for c, _s in regs], [s_code[s] for _c, s in regs])
+        m._student_code = s_code
+        m._course_code = c_code
+        return m
+
+    @property
+    def n_students(self) -> int:
+        '''"""Number of students in the snapshot.
+
+"""'''
+        return len(self.student_ids)
+
+    @property
+    def n_courses(self) -> int:
+        '''"""Number of courses in the snapshot.
+
+"""'''
+        return len(self.course_ids)
+
+    @property
+    def n_registrations(self) -> int:
+        '''"""Number of registrations in the snapshot.
+
+"""'''
+        return len(self.indices)
+
+    def student_code(self, student_id: str) -> int:
+        '''    """Return the integer code for a student ID.
+
+Parameters:
+    student_id: parameter.
+    """'''
+        if self._student_code is None:
+            self._student_code = {sid: n for n, sid in enumerate(self.student_ids)}
+        if student_id not in self._student_code:
+            raise ValidationError(f"Unknown student_id '{student_id}'.")
+        return self._student_code[student_id]
+
+    def course_code(self, course_id: str) -> int:
+        '''    """Return the integer code for a course ID.
+
+Parameters:
+    course_id: parameter.
+    """'''
+        if self._course_code is None:
+            self._course_code = {cid: n for n, cid in enumerate(self.course_ids)}
+        if course_id not in self._course_code:
+            raise ValidationError(f"Unknown course_id '{course_id}'.")
+        return self._course_code[course_id]
+
+    def students_per_course(self) -> np.ndarray:
+        '''"""Enrollment count for every course, aligned with course_ids.
+
+"""'''
+        return np.diff(self.indptr)
+
+    def courses_per_student(self) -> np.ndarray:
+        '''"""Course count for every student, aligned with student_ids.
+
+"""'''
+        return np.diff(self.t_indptr)
+
+    def courses_per_instructor(self) -> np.ndarray:
+        '''"""Assigned course count for every instructor, aligned with instructor_ids.
+
+"""'''
+        assigned = self.course_instructor[self.course_instructor >= 0]
+        return np.bincount(assigned, minlength=len(self.instructor_ids))
+
+    def students_per_instructor(self) -> np.ndarray:
+        '''"""Total enrollments across each instructor's courses, aligned with instructor_ids.
+
+"""'''
+        mask = self.course_instructor >= 0
+        return np.bincount(self.course_instructor[mask], weights=self.students_per_course()[mask], minlength=len(self.instructor_ids)).astype(np.int64)
+
+    def course_students(self, course_id: str) -> List[str]:
+        '''    """Return student IDs for a given course from the CSR slice.
+
+Parameters:
+    course_id: parameter.
+    """'''
+        c = self.course_code(course_id)
+        return self.student_ids[self.indices[self.indptr[c]:self.indptr[c + 1]]].tolist()
+
+    def student_courses(self, student_id: str) -> List[str]:
+        '''    """Return course IDs for a given student from the transposed CSR slice.
+
+Parameters:
+    student_id: parameter.
+    """'''
+        s = self.student_code(student_id)
+        return self.course_ids[self.t_indices[self.t_indptr[s]:self.t_indptr[s + 1]]].tolist()
+
+    def registration_courses(self) -> np.ndarray:
+        '''"""Course code of every entry in indices (the expanded CSR row index).
+
+"""'''
+        return np.repeat(np.arange(self.n_courses), self.students_per_course())
+
+    def unenrolled_students(self) -> List[str]:
+        '''"""Student IDs with no registrations.
+
+"""'''
+        return self.student_ids[self.courses_per_student() == 0].tolist()
+
+    def age_histogram(self, bins: Sequence[int]=(0, 18, 21, 25, 30, 40, 150)) -> Tuple[np.ndarray, np.ndarray]:
+        '''    """Histogram of student ages.
+
+Parameters:
+    bins: bin edges, as accepted by numpy.histogram.
+    """'''
+        return np.histogram(self.student_ages, bins=np.asarray(bins))
+
+    def age_distribution_by_course(self, bins: Sequence[int]=(0, 18, 21, 25, 30, 40, 150)) -> np.ndarray:
+        '''    """Matrix of shape (n_courses, len(bins) - 1) with age-bin counts per course.
+
+Parameters:
+    bins: bin edges; ages outside the edges are ignored.
+    """'''
+        edges = np.asarray(bins)
+        out = np.zeros((self.n_courses, len(edges) - 1), dtype=np.int64)
+        if not self.n_registrations:
+            return out
+        ages = self.student_ages[self.indices]
+        course_of_reg = self.registration_courses()
+        b = np.searchsorted(edges, ages, side='right') - 1
+        b[ages == edges[-1]] = len(edges) - 2
+        keep = (b >= 0) & (b < len(edges) - 1)
+        np.add.at(out, (course_of_reg[keep], b[keep]), 1)
+        return out
+
+    def mean_age_by_course(self) -> np.ndarray:
+        '''"""Mean enrolled-student age per course (NaN for empty courses).
+
+"""'''
+        counts = self.students_per_course()
+        sums = np.bincount(self.registration_courses(), weights=self.student_ages[self.indices], minlength=self.n_courses)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def top_k(self, ids: np.ndarray, values: np.ndarray, k: int=10) -> List[Tuple[str, int]]:
+        '''    """Return the k largest (id, value) pairs, ties broken by ID order.
+
+Parameters:
+    ids: entity IDs aligned with values.
+    values: counts to rank by.
+    k: number of entries to return.
+    """'''
+        if k <= 0 or len(values) == 0:
+            return []
+        k = min(k, len(values))
+        part = np.argpartition(-values, k - 1)[:k]
+        part = part[np.lexsort((part, -values[part]))]
+        return [(ids[n], int(values[n])) for n in part]
+
+    def top_courses(self, k: int=10) -> List[Tuple[str, int]]:
+        '''    """Most-enrolled courses.
+
+Parameters:
+    k: parameter.
+    """'''
+        return self.top_k(self.course_ids, self.students_per_course(), k)
+
+    def top_students(self, k: int=10) -> List[Tuple[str, int]]:
+        '''    """Students taking the most courses.
+
+Parameters:
+    k: parameter.
+    """'''
+        return self.top_k(self.student_ids, self.courses_per_student(), k)
+
+    def top_instructors(self, k: int=10) -> List[Tuple[str, int]]:
+        '''    """Instructors with the most assigned courses.
+
+Parameters:
+    k: parameter.
+    """'''
+        return self.top_k(self.instructor_ids, self.courses_per_instructor(), k)
+
+    def summary(self, k: int=5) -> Dict[str, object]:
+        '''    """Plain-Python summary suitable for a UI panel or JSON report.
+
+Parameters:
+    k: size of the top-k lists.
+    """'''
+        per_course = self.students_per_course()
+        per_student = self.courses_per_student()
+        return {'students': self.n_students, 'instructors': len(self.instructor_ids), 'courses': self.n_courses, 'registrations': self.n_registrations, 'unassigned_courses': int((self.course_instructor < 0).sum()), 'unenrolled_students': int((per_student == 0).sum()), 'mean_course_size': float(per_course.mean()) if self.n_courses else 0.0, 'max_course_size': int(per_course.max()) if self.n_courses else 0, 'mean_courses_per_student': float(per_student.mean()) if self.n_students else 0.0, 'top_courses': self.top_courses(k), 'top_instructors': self.top_instructors(k)}
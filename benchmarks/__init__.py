@@ -0,0 +1,16 @@
+'''"""
+Benchmarks — School Management System
+
+This package is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- datagen: seeded synthetic schools (N students, M instructors, K courses, skewed enrollments)
+- scenarios: pytest-benchmark style storage, export and search scenarios
+- run: fixture-injecting runner that saves JSON results per commit and compares runs
+- startup: import-time and time-to-first-paint measurements for the four GUI front-ends
+"""'''
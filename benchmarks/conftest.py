@@ -0,0 +1,56 @@
+'''"""
+Benchmark pytest Fixtures — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Exposes the benchmarks.fixtures factories as pytest fixtures for benchmarks/scenarios.py
+- Dataset size comes from the BENCH_SIZE environment variable (default: small)
+- Falls back to SimpleBenchmark when pytest-benchmark is not installed
+"""'''
+import importlib.util
+import os
+import pytest
+from benchmarks.fixtures import DEFAULT_SEED, DEFAULT_SIZE, SimpleBenchmark, make_json_store_dir, make_school, make_school_db
+
+@pytest.fixture(scope='session')
+def school():
+    '''"""Generated school shared by every scenario.
+
+"""'''
+    return make_school(os.environ.get('BENCH_SIZE', DEFAULT_SIZE), int(os.environ.get('BENCH_SEED', DEFAULT_SEED)))
+
+@pytest.fixture(scope='session')
+def school_db(school, tmp_path_factory):
+    '''    """Populated DBStore, opened once per session.
+
+Parameters:
+    school: parameter.
+    tmp_path_factory: parameter.
+    """'''
+    db = make_school_db(school, tmp_path_factory.mktemp('db'))
+    yield db
+    db.close()
+
+@pytest.fixture(scope='session')
+def json_store(school, tmp_path_factory):
+    '''    """Directory holding the school as DataStore JSON files.
+
+Parameters:
+    school: parameter.
+    tmp_path_factory: parameter.
+    """'''
+    return make_json_store_dir(school, tmp_path_factory.mktemp('store'))
+if importlib.util.find_spec('pytest_benchmark') is None:
+
+    @pytest.fixture
+    def benchmark():
+        '''"""SimpleBenchmark stand-in when pytest-benchmark is unavailable.
+
+"""'''
+        return SimpleBenchmark(min_rounds=1, min_time=0.0)
@@ -0,0 +1,138 @@
+'''"""
+Synthetic School Data — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- generate: seeded N students / M instructors / K courses with skewed course popularity
+- SchoolData: the generated rows plus loaders into DBStore, DataStore and JSON shards
+- SIZES: named presets used by the benchmark runner
+"""'''
+from __future__ import annotations
+import random
+from bisect import bisect
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Dict, List, Tuple
+SIZES = {'small': (1000, 40, 120), 'medium': (10000, 200, 600), 'large': (50000, 800, 2400)}
+_FIRST = ('Ava', 'Liam', 'Maya', 'Noah', 'Zoe', 'Omar', 'Lina', 'Karim', 'Sara', 'Elie', 'Nour', 'Jad', 'Rita', 'Tony', 'Hala', 'Sami')
+_LAST = ('Haddad', 'Khoury', 'Saleh', 'Nassar', 'Farah', 'Aoun', 'Chami', 'Mansour', 'Rizk', 'Daher', 'Issa', 'Karam')
+_SUBJECTS = ('Algebra', 'Biology', 'Chemistry', 'Databases', 'Economics', 'French', 'Geometry', 'History', 'Literature', 'Networks', 'Physics', 'Statistics')
+
+@dataclass
+class SchoolData:
+    """Generated rows in the tuple layouts the DBStore bulk methods accept."""
+    seed: int
+    students: List[Tuple[str, str, int, str]] = field(default_factory=list)
+    instructors: List[Tuple[str, str, int, str]] = field(default_factory=list)
+    courses: List[Tuple[str, str]] = field(default_factory=list)
+    assignments: List[Tuple[str, str]] = field(default_factory=list)
+    enrollments: List[Tuple[str, str]] = field(default_factory=list)
+
+    def shape(self) -> Dict[str, int]:
+        '''"""Row counts per table.
+
+"""'''
+        return {'students': len(self.students), 'instructors': len(self.instructors), 'courses': len(self.courses), 'registrations': len(self.enrollments)}
+
+    def load_into_db(self, db) -> None:
+        '''    """Write everything into an open DBStore through the bulk paths.
+
+Parameters:
+    db: DBStore.
+    """'''
+        db.bulk_upsert_students(self.students)
+        db.bulk_upsert_instructors(self.instructors)
+        db.bulk_upsert_courses(self.courses)
+        db.bulk_assign(self.assignments)
+        db.bulk_enroll(self.enrollments)
+
+    def to_datastore(self):
+        '''"""Build an in-memory DataStore holding the same school.
+
+"""'''
+        from Data_Managment import DataStore
+        from Student import Student
+        from instructor import Instructor
+        from course import Course
+        ds = DataStore()
+        for sid, name, age, email in self.students:
+            ds.students[sid] = Student.from_trusted(name, age, email, sid)
+        for iid, name, age, email in self.instructors:
+            ds.instructors[iid] = Instructor.from_trusted(name, age, email, iid)
+        for cid, name in self.courses:
+            ds.courses[cid] = Course.from_trusted(cid, name)
+        for iid, cid in self.assignments:
+            ds.instructors[iid].assign_course(ds.courses[cid])
+            ds.courses[cid].set_instructor(ds.instructors[iid])
+        for sid, cid in self.enrollments:
+            ds.students[sid].register_course(ds.courses[cid])
+            ds.courses[cid].add_student(ds.students[sid])
+        for table in (ds.students, ds.instructors, ds.courses):
+            for entity in table.values():
+                ds.index_entity(entity)
+        return ds
+
+    def to_sections(self) -> Dict[str, List[Dict[str, Any]]]:
+        '''"""The DBStore.dump_json layout, for import benchmarks.
+
+"""'''
+        by_student: Dict[str, List[str]] = {}
+        by_course: Dict[str, List[str]] = {}
+        for sid, cid in self.enrollments:
+            by_student.setdefault(sid, []).append(cid)
+            by_course.setdefault(cid, []).append(sid)
+        teacher = {cid: iid for iid, cid in self.assignments}
+        by_instructor: Dict[str, List[str]] = {}
+        for iid, cid in self.assignments:
+            by_instructor.setdefault(iid, []).append(cid)
+        return {'students': [{'student_id': sid, 'name': n, 'age': a, 'email': e, 'courses': by_student.get(sid, [])} for sid, n, a, e in self.students], 'instructors': [{'instructor_id': iid, 'name': n, 'age': a, 'email': e, 'courses': by_instructor.get(iid, [])} for iid, n, a, e in self.instructors], 'courses': [{'course_id': cid, 'course_name': n, 'instructor_id': teacher.get(cid), 'students': by_course.get(cid, [])} for cid, n in self.courses]}
+
+def generate(n_students: int, n_instructors: int, n_courses: int, *, seed: int=0, mean_load: float=4.0, skew: float=1.1, unassigned: float=0.05) -> SchoolData:
+    '''    """Generate a reproducible school.
+
+Course popularity follows a Zipf-like curve (a few large intro courses, a long
+tail of small electives); each student takes about mean_load distinct courses
+and each course has at most one instructor, with some left unassigned.
+
+Parameters:
+    n_students: parameter.
+    n_instructors: parameter.
+    n_courses: parameter.
+    seed: random seed; equal seeds give identical data.
+    mean_load: average courses per student.
+    skew: Zipf exponent for course popularity.
+    unassigned: fraction of courses without an instructor.
+    """'''
+    rng = random.Random(seed)
+    data = SchoolData(seed)
+    for n in range(n_students):
+        name = f'{rng.choice(_FIRST)} {rng.choice(_LAST)}'
+        data.students.append((f'S{n:06d}', name, int(rng.triangular(17, 30, 19)), f's{n}@school.edu'))
+    for n in range(n_instructors):
+        name = f'{rng.choice(_FIRST)} {rng.choice(_LAST)}'
+        data.instructors.append((f'I{n:05d}', name, rng.randint(28, 67), f'i{n}@school.edu'))
+    for n in range(n_courses):
+        data.courses.append((f'C{n:05d}', f'{_SUBJECTS[n % len(_SUBJECTS)]} {100 + n // len(_SUBJECTS)}'))
+    if n_instructors:
+        for cid, _name in data.courses:
+            if rng.random() >= unassigned:
+                data.assignments.append((data.instructors[rng.randrange(n_instructors)][0], cid))
+    if not n_courses:
+        return data
+    order = list(range(n_courses))
+    rng.shuffle(order)
+    cum = list(accumulate((1.0 / (rank + 1) ** skew for rank in range(n_courses))))
+    total = cum[-1]
+    for sid, _n, _a, _e in data.students:
+        k = max(1, min(n_courses, round(rng.gauss(mean_load, 1.5))))
+        taken = set()
+        while len(taken) < k:
+            taken.add(order[bisect(cum, rng.random() * total)])
+        data.enrollments.extend(((sid, data.courses[c][0]) for c in sorted(taken)))
+    return data
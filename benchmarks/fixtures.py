@@ -0,0 +1,144 @@
+'''"""
+Benchmark Fixtures — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Plain factory functions for the objects scenarios receive (school data, populated stores, scratch dirs)
+- SimpleBenchmark: a stand-in for the pytest-benchmark fixture used by benchmarks.run
+- Shared by benchmarks.run and benchmarks/conftest.py so both drivers measure the same setup
+"""'''
+from __future__ import annotations
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from benchmarks.datagen import SIZES, SchoolData, generate
+DEFAULT_SIZE = 'small'
+DEFAULT_SEED = 20250922
+
+def make_school(size: str=DEFAULT_SIZE, seed: int=DEFAULT_SEED) -> SchoolData:
+    '''    """Generate the dataset for a named size.
+
+Parameters:
+    size: key of SIZES.
+    seed: parameter.
+    """'''
+    return generate(*SIZES[size], seed=seed)
+
+def make_school_db(school: SchoolData, folder: Path):
+    '''    """Open a DBStore in folder and load the school into it.
+
+Parameters:
+    school: parameter.
+    folder: parameter.
+    """'''
+    from db_store import DBStore
+    db = DBStore(str(folder / 'school.db'))
+    school.load_into_db(db)
+    return db
+
+def make_json_store_dir(school: SchoolData, folder: Path) -> Path:
+    '''    """Write the school as DataStore JSON files (students/instructors/courses.json) in folder.
+
+Parameters:
+    school: parameter.
+    folder: parameter.
+    """'''
+    with chdir(folder):
+        school.to_datastore().save_all()
+    return folder
+
+@contextmanager
+def chdir(path: Path) -> Iterator[Path]:
+    '''    """Temporarily change directory; DataStore reads and writes relative paths.
+
+Parameters:
+    path: parameter.
+    """'''
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(old)
+
+class SimpleBenchmark:
+    """Minimal stand-in for pytest-benchmark's ``benchmark`` fixture.
+
+Calling it runs the function enough times to fill min_time (at least
+min_rounds), records per-call wall times and returns the last result.
+"""
+
+    def __init__(self, min_rounds: int=5, min_time: float=0.5, max_rounds: int=1000):
+        '''    """  init  .
+
+Parameters:
+    min_rounds: parameter.
+    min_time: seconds of total run time to aim for.
+    max_rounds: parameter.
+    """'''
+        self.min_rounds = min_rounds
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.times: List[float] = []
+        self.extra_info: Dict[str, Any] = {}
+
+    def __call__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        '''    """Time fn(*args, **kwargs) repeatedly.
+
+Parameters:
+    fn: parameter.
+    args: parameter.
+    kwargs: parameter.
+    """'''
+        return self.pedantic(fn, args, kwargs)
+
+    def pedantic(self, fn: Callable[..., Any], args: tuple=(), kwargs: Optional[dict]=None, setup: Optional[Callable[[], Any]]=None, rounds: Optional[int]=None, iterations: int=1) -> Any:
+        '''    """Time fn with an optional per-round setup, like pytest-benchmark's pedantic mode.
+
+Parameters:
+    fn: parameter.
+    args: parameter.
+    kwargs: parameter.
+    setup: called before each round; if it returns (args, kwargs) those are used.
+    rounds: fixed round count (default: adaptive).
+    iterations: calls per round.
+    """'''
+        kwargs = kwargs or {}
+        result = None
+        started = time.perf_counter()
+        n = 0
+        while True:
+            a, kw = (args, kwargs)
+            if setup is not None:
+                prepared = setup()
+                if prepared is not None:
+                    a, kw = prepared
+            t0 = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*a, **kw)
+            self.times.append((time.perf_counter() - t0) / iterations)
+            n += 1
+            if rounds is not None:
+                if n >= rounds:
+                    break
+            elif n >= self.max_rounds or (n >= self.min_rounds and time.perf_counter() - started >= self.min_time):
+                break
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        '''"""Summary statistics in seconds, mirroring pytest-benchmark's JSON keys.
+
+"""'''
+        t = self.times
+        if not t:
+            return {}
+        return {'min': min(t), 'max': max(t), 'mean': statistics.fmean(t), 'median': statistics.median(t), 'stddev': statistics.stdev(t) if len(t) > 1 else 0.0, 'rounds': len(t)}
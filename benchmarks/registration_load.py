@@ -0,0 +1,169 @@
+'''"""
+Registration Load Test — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Worker processes enrolling random students in random courses through RegistrationEngine, all against one school.db
+- Reports sustained enrollments per second while seats remain, every request's outcome and batch latency percentiles
+- Audits the file afterwards: no course above its capacity, every enrolled_count equal to its registrations
+- python -m benchmarks.registration_load --db school.db --workers 8 --seconds 10 --out load.json
+"""'''
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from benchmarks.datagen import SIZES
+from benchmarks.fixtures import DEFAULT_SEED, make_school, make_school_db
+START_DELAY = 1.0
+
+def prepare(db_path: str, seats: int, journal: str) -> Dict[str, List[str]]:
+    '''    """Give every course seats free places and return the student and course IDs to draw from.
+
+Parameters:
+    db_path: school.db to load-test (modified in place).
+    seats: free seats per course on top of its current enrollment.
+    journal: SQLite journal mode, e.g. 'wal' or 'delete'; it is stored in the file.
+    """'''
+    from db_store import DBStore
+    db = DBStore(db_path)
+    try:
+        db.conn.execute(f'PRAGMA journal_mode = {journal}')
+        courses = list(db.iter_courses())
+        db.bulk_set_capacity(((c.course_id, c.enrolled_count + seats) for c in courses))
+        return {'students': [s.student_id for s in db.iter_students()], 'courses': [c.course_id for c in courses]}
+    finally:
+        db.close()
+
+def _worker(db_path: str, ids: Dict[str, List[str]], start_at: float, seconds: float, batch: int, seed: int) -> Dict[str, Any]:
+    '''    """One clerk process: enroll random pairs in batches until the deadline.
+
+Parameters:
+    db_path: parameter.
+    ids: output of prepare().
+    start_at: time.time() at which every worker starts, so the run measures them together.
+    seconds: run length.
+    batch: requests per transaction.
+    seed: parameter.
+    """'''
+    from db_store import DBStore
+    from registration import RegistrationEngine
+    rng = random.Random(seed)
+    students, courses = (ids['students'], ids['courses'])
+    db = DBStore(db_path, cache_size=0)
+    engine = RegistrationEngine(db)
+    latencies = []
+    last_claim = start_at
+    time.sleep(max(start_at - time.time(), 0))
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        pairs = [(rng.choice(students), rng.choice(courses)) for _ in range(batch)]
+        t0 = time.perf_counter()
+        results = engine.enroll_batch(pairs)
+        latencies.append(time.perf_counter() - t0)
+        if any((r.ok for r in results)):
+            last_claim = time.time()
+    end = time.time()
+    db.close()
+    return {'stats': engine.stats, 'latencies': latencies, 'last_claim': last_claim, 'end': end}
+
+def _percentile(values: List[float], q: float) -> float:
+    '''    """Nearest-rank percentile of an unsorted list.
+
+Parameters:
+    values: parameter.
+    q: fraction between 0 and 1.
+    """'''
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+def run(db_path: str, workers: int=4, seconds: float=10.0, batch: int=20, seats: int=100, journal: str='wal', seed: int=DEFAULT_SEED) -> Dict[str, Any]:
+    '''    """Load-test db_path with workers concurrent processes and audit it afterwards.
+
+enrollments_per_s is measured up to the last successful claim, so a run that
+sells out every seat reports the rate it sustained while seats remained;
+requests_per_s covers the whole run.
+
+Parameters:
+    db_path: school.db to load-test (modified in place).
+    workers: concurrent processes, each with its own connection.
+    seconds: run length.
+    batch: requests per transaction; 1 measures one commit per enrollment.
+    seats: free seats given to every course before the run.
+    journal: SQLite journal mode.
+    seed: parameter.
+    """'''
+    from db_store import DBStore
+    from registration import REASONS, RegistrationEngine
+    ids = prepare(db_path, seats, journal)
+    if not ids['students'] or not ids['courses']:
+        raise SystemExit(f'{db_path} has no students or no courses to enroll.')
+    start_at = time.time() + START_DELAY
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_worker, db_path, ids, start_at, seconds, batch, seed + i) for i in range(workers)]
+        parts = [f.result() for f in futures]
+    elapsed = max((p['end'] for p in parts)) - start_at
+    claiming = max((p['last_claim'] for p in parts)) - start_at
+    outcomes = {reason: sum((p['stats'][reason] for p in parts)) for reason in REASONS}
+    latencies = [t for p in parts for t in p['latencies']]
+    db = DBStore(db_path)
+    try:
+        audit = RegistrationEngine(db).audit()
+    finally:
+        db.close()
+    requests = sum(outcomes.values())
+    return {'db': os.path.abspath(db_path), 'python': sys.version.split()[0], 'workers': workers, 'batch': batch, 'seats_per_course': seats, 'journal': journal, 'elapsed_s': round(elapsed, 3), 'requests': requests, 'outcomes': outcomes, 'claiming_s': round(claiming, 3), 'enrollments_per_s': round(outcomes['enrolled'] / claiming, 1) if claiming > 0 else 0.0, 'requests_per_s': round(requests / elapsed, 1), 'batch_p50_ms': round(_percentile(latencies, 0.5) * 1000, 3), 'batch_p99_ms': round(_percentile(latencies, 0.99) * 1000, 3), 'overbooked': audit['overbooked'], 'drifted': audit['drifted']}
+
+def main(argv: Optional[List[str]]=None) -> int:
+    '''    """Main.
+
+Parameters:
+    argv: parameter.
+    """'''
+    p = argparse.ArgumentParser(prog='python -m benchmarks.registration_load', description='Measure sustained enrollments per second on one school.db.')
+    p.add_argument('--db', help='school.db to test; a copy is used unless --in-place (default: generate one with --size)')
+    p.add_argument('--in-place', action='store_true', help='write to --db itself instead of a copy')
+    p.add_argument('--size', choices=sorted(SIZES), default='medium')
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--seconds', type=float, default=10.0)
+    p.add_argument('--batch', type=int, default=20, help='enrollment requests per transaction')
+    p.add_argument('--seats', type=int, default=100, help='free seats per course before the run')
+    p.add_argument('--journal', default='wal', help='SQLite journal mode (default: wal)')
+    p.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p.add_argument('--out', help='write the JSON results here')
+    args = p.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db and args.in_place:
+            path = args.db
+        elif args.db:
+            from db_store import DBStore
+            path = str(Path(tmp) / 'school.db')
+            src = DBStore(args.db)
+            try:
+                src.backup_db(path)
+            finally:
+                src.close()
+        else:
+            make_school_db(make_school(args.size, args.seed), Path(tmp)).close()
+            path = str(Path(tmp) / 'school.db')
+        results = run(path, args.workers, args.seconds, args.batch, args.seats, args.journal, args.seed)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0 if not results['overbooked'] and (not results['drifted']) else 1
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+'''"""
+Benchmark Runner — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Runs benchmarks.scenarios without pytest, injecting fixtures by parameter name
+- Writes JSON results tagged with the git commit; --compare prints ratios against an earlier file
+- python -m benchmarks.run --size medium --out bench-$(git rev-parse --short HEAD).json
+"""'''
+from __future__ import annotations
+import argparse
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from benchmarks import scenarios
+from benchmarks.datagen import SIZES
+from benchmarks.fixtures import DEFAULT_SEED, DEFAULT_SIZE, SimpleBenchmark, make_json_store_dir, make_school, make_school_db
+
+def _git_commit() -> Optional[str]:
+    '''"""Current commit hash, or None outside a git checkout.
+
+"""'''
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).resolve().parent, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+def discover(pattern: str='') -> Dict[str, Callable[..., Any]]:
+    '''    """Scenario functions by name, optionally filtered by substring.
+
+Parameters:
+    pattern: parameter.
+    """'''
+    return {name: fn for name, fn in inspect.getmembers(scenarios, inspect.isfunction) if name.startswith('test_') and pattern in name}
+
+def run(size: str=DEFAULT_SIZE, seed: int=DEFAULT_SEED, pattern: str='', min_time: float=0.5) -> Dict[str, Any]:
+    '''    """Run every matching scenario once against one generated school.
+
+Parameters:
+    size: key of SIZES.
+    seed: parameter.
+    pattern: substring filter on scenario names.
+    min_time: seconds to spend per scenario (adaptive rounds).
+    """'''
+    school = make_school(size, seed)
+    results: Dict[str, Any] = {'commit': _git_commit(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'machine': platform.machine(), 'size': size, 'seed': seed, 'shape': school.shape(), 'benchmarks': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        db_dir = root / 'db'
+        db_dir.mkdir()
+        school_db = make_school_db(school, db_dir)
+        store_dir = root / 'store'
+        store_dir.mkdir()
+        make_json_store_dir(school, store_dir)
+        try:
+            for name, fn in sorted(discover(pattern).items()):
+                scratch = root / name
+                scratch.mkdir()
+                bench = SimpleBenchmark(min_time=min_time)
+                available = {'benchmark': bench, 'school': school, 'school_db': school_db, 'json_store': store_dir, 'tmp_path': scratch}
+                fn(**{p: available[p] for p in inspect.signature(fn).parameters})
+                stats = bench.stats()
+                ops = bench.extra_info.get('ops')
+                if ops and stats:
+                    stats['ops_per_sec'] = ops / stats['mean']
+                stats['extra_info'] = bench.extra_info
+                results['benchmarks'][name] = stats
+                print(f"{name:32s} mean {stats['mean'] * 1000.0:10.3f} ms  rounds {stats['rounds']}", file=sys.stderr)
+        finally:
+            school_db.close()
+    return results
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    '''    """Lines of new/old mean-time ratios for scenarios present in both runs.
+
+Parameters:
+    old: parameter.
+    new: parameter.
+    """'''
+    lines = []
+    for name, stats in sorted(new['benchmarks'].items()):
+        before = old.get('benchmarks', {}).get(name)
+        if not before or not before.get('mean'):
+            continue
+        ratio = stats['mean'] / before['mean']
+        flag = '  SLOWER' if ratio > 1.1 else '  faster' if ratio < 0.9 else ''
+        lines.append(f'{name:32s} {ratio:6.2f}x{flag}')
+    return lines
+
+def main(argv: Optional[List[str]]=None) -> int:
+    '''    """Main.
+
+Parameters:
+    argv: parameter.
+    """'''
+    p = argparse.ArgumentParser(prog='python -m benchmarks.run', description='Run the storage/search benchmark scenarios.')
+    p.add_argument('--size', choices=sorted(SIZES), default=DEFAULT_SIZE)
+    p.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p.add_argument('-k', dest='pattern', default='', help='only scenarios whose name contains this text')
+    p.add_argument('--min-time', type=float, default=0.5, help='seconds per scenario')
+    p.add_argument('--out', help='write the JSON results here')
+    p.add_argument('--compare', help='earlier results JSON to compare against')
+    args = p.parse_args(argv)
+    results = run(args.size, args.seed, args.pattern, args.min_time)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print('\n'.join(compare(json.load(f), results)))
+    elif not args.out:
+        print(json.dumps(results, indent=2))
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,342 @@
+'''"""
+Benchmark Scenarios — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- pytest-benchmark style scenarios: each test_* function takes a ``benchmark`` fixture plus data fixtures
+- Covers add/enroll throughput (plain and capacity-checked batches), list_*, to_dict/dump_json, load_all/save_all, CSV export and search latency
+- list_* and paging scenarios drop DBStore's read cache before every round so they time SQLite; test_db_list_students_cached times a cache hit
+- Run with ``python -m benchmarks.run`` or ``pytest benchmarks/scenarios.py --benchmark-json=out.json``
+"""'''
+from __future__ import annotations
+from itertools import count
+from pathlib import Path
+from benchmarks.fixtures import chdir
+WRITE_OPS = 1000
+SEARCH_TERM = 'haddad'
+COLD_ROUNDS = 20
+_seq = count()
+
+def _fresh_db(folder: Path, school=None):
+    '''    """Open an empty (or entity-only) DBStore on a new file.
+
+Parameters:
+    folder: parameter.
+    school: when given, its students, instructors and courses are bulk-loaded.
+    """'''
+    from db_store import DBStore
+    db = DBStore(str(folder / f'write-{next(_seq)}.db'))
+    if school is not None:
+        db.bulk_upsert_students(school.students)
+        db.bulk_upsert_instructors(school.instructors)
+        db.bulk_upsert_courses(school.courses)
+    return db
+
+def _cold(db):
+    '''    """pedantic() setup that drops the read cache, so the timed call reads from SQLite.
+
+Parameters:
+    db: parameter.
+    """'''
+    db.invalidate_cache()
+
+def test_db_add_students(benchmark, school, tmp_path):
+    '''    """DBStore.add_student, one validated insert per call.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    tmp_path: parameter.
+    """'''
+    rows = school.students[:WRITE_OPS]
+
+    def run(db):
+        for sid, name, age, email in rows:
+            db.add_student(name, age, email, sid)
+        db.close()
+    benchmark.extra_info['ops'] = len(rows)
+    benchmark.pedantic(run, setup=lambda: ((_fresh_db(tmp_path),), {}), rounds=3)
+
+def test_db_enroll(benchmark, school, tmp_path):
+    '''    """DBStore.enroll_student_in_course against a populated catalogue.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    tmp_path: parameter.
+    """'''
+    pairs = school.enrollments[:WRITE_OPS]
+
+    def run(db):
+        for sid, cid in pairs:
+            db.enroll_student_in_course(sid, cid)
+        db.close()
+    benchmark.extra_info['ops'] = len(pairs)
+    benchmark.pedantic(run, setup=lambda: ((_fresh_db(tmp_path, school),), {}), rounds=3)
+
+def test_db_register_batch(benchmark, school, tmp_path):
+    '''    """RegistrationEngine.enroll_batch: the same enrollments as test_db_enroll, capacity-checked, 50 per transaction.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    tmp_path: parameter.
+    """'''
+    from registration import RegistrationEngine
+    pairs = school.enrollments[:WRITE_OPS]
+
+    def run(db):
+        engine = RegistrationEngine(db)
+        for i in range(0, len(pairs), 50):
+            engine.enroll_batch(pairs[i:i + 50])
+        db.close()
+    benchmark.extra_info['ops'] = len(pairs)
+    benchmark.pedantic(run, setup=lambda: ((_fresh_db(tmp_path, school),), {}), rounds=3)
+
+def test_datastore_add_enroll(benchmark, school):
+    '''    """DataStore.add_student followed by enroll_student_in_course, in memory.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    """'''
+    from Data_Managment import DataStore
+    rows = school.students[:WRITE_OPS]
+    pairs = [(sid, cid) for sid, cid in school.enrollments if sid <= rows[-1][0]]
+
+    def run():
+        ds = DataStore()
+        for cid, name in school.courses:
+            ds.add_course(cid, name)
+        for sid, name, age, email in rows:
+            ds.add_student(name, age, email, sid)
+        for sid, cid in pairs:
+            ds.enroll_student_in_course(sid, cid)
+        return ds
+    benchmark.extra_info['ops'] = len(rows) + len(pairs)
+    benchmark(run)
+
+def test_db_list_students(benchmark, school_db):
+    '''    """DBStore.list_students over the whole table, cold cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['ops'] = len(benchmark.pedantic(school_db.list_students, setup=lambda: _cold(school_db), rounds=COLD_ROUNDS))
+
+def test_db_list_instructors(benchmark, school_db):
+    '''    """DBStore.list_instructors over the whole table, cold cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['ops'] = len(benchmark.pedantic(school_db.list_instructors, setup=lambda: _cold(school_db), rounds=COLD_ROUNDS))
+
+def test_db_list_courses(benchmark, school_db):
+    '''    """DBStore.list_courses over the whole table, cold cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['ops'] = len(benchmark.pedantic(school_db.list_courses, setup=lambda: _cold(school_db), rounds=COLD_ROUNDS))
+
+def test_db_list_students_cached(benchmark, school_db):
+    '''    """DBStore.list_students answered from the read cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    school_db.list_students()
+    benchmark.extra_info['ops'] = len(benchmark(school_db.list_students))
+
+def test_db_page_students(benchmark, school_db):
+    '''    """Walk the students table in keyset pages of 100, cold cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+
+    def run():
+        n = 0
+        page = school_db.list_students(limit=100)
+        while page:
+            n += len(page)
+            page = school_db.list_students(after_id=page[-1].student_id, limit=100)
+        return n
+    benchmark.extra_info['ops'] = benchmark.pedantic(run, setup=lambda: _cold(school_db), rounds=COLD_ROUNDS)
+
+def test_db_page_students_by_name(benchmark, school_db):
+    '''    """Walk the students table in name order, keyset pages of 100 seeking the (name, id) index, cold cache.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+
+    def run():
+        n = 0
+        page = school_db.list_students(limit=100, order_by='name')
+        while page:
+            n += len(page)
+            page = school_db.list_students(after_id=page[-1].student_id, limit=100, order_by='name')
+        return n
+    benchmark.extra_info['ops'] = benchmark.pedantic(run, setup=lambda: _cold(school_db), rounds=COLD_ROUNDS)
+
+def test_db_iter_students(benchmark, school_db):
+    '''    """Stream the students table through fetchmany.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['ops'] = benchmark(lambda: sum((1 for _ in school_db.iter_students())))
+
+def test_db_iter_students_tuples(benchmark, school_db):
+    '''    """Stream the students table as plain tuples (row_factory='tuple').
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    from db_store import DBStore
+    db = DBStore(school_db.db_path, row_factory='tuple')
+    try:
+        benchmark.extra_info['ops'] = benchmark(lambda: sum((1 for _ in db.iter_students())))
+    finally:
+        db.close()
+
+def test_db_to_dict(benchmark, school_db):
+    '''    """DBStore.to_dict, the full export structure in memory.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    out = benchmark(school_db.to_dict)
+    benchmark.extra_info['ops'] = sum((len(v) for v in out.values()))
+
+def test_db_dump_json(benchmark, school_db, tmp_path):
+    '''    """DBStore.dump_json to a file.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    tmp_path: parameter.
+    """'''
+    benchmark(school_db.dump_json, str(tmp_path / 'dump.json'))
+
+def test_db_export_csv(benchmark, school_db, tmp_path):
+    '''    """DBStore.export_csv, three CSV files.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    tmp_path: parameter.
+    """'''
+    folder = tmp_path / 'csv'
+    folder.mkdir(exist_ok=True)
+    benchmark(school_db.export_csv, str(folder))
+
+def test_datastore_save_all(benchmark, school, json_store):
+    '''    """DataStore.save_all of the full school.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    json_store: parameter.
+    """'''
+    ds = school.to_datastore()
+    with chdir(json_store):
+        benchmark(ds.save_all)
+
+def test_datastore_load_all(benchmark, json_store):
+    '''    """DataStore.load_all of the full school.
+
+Parameters:
+    benchmark: parameter.
+    json_store: parameter.
+    """'''
+    from Data_Managment import DataStore
+    with chdir(json_store):
+        ds = benchmark(DataStore.load_all)
+    benchmark.extra_info['ops'] = len(ds.students) + len(ds.instructors) + len(ds.courses)
+
+def _student_rows(db, ft):
+    '''    """The Students-tab search path: build display rows and keep those matching ft.
+
+Parameters:
+    db: parameter.
+    ft: lower-case search text.
+    """'''
+    out = []
+    for s in db.list_students():
+        courses = ', '.join(db.student_courses(s.student_id)) if s.course_count else 'None'
+        row = (s.student_id, s.name, str(s.age), s.email, courses, str(s.course_count))
+        if not ft or any((ft in str(x).lower() for x in row)):
+            out.append(row)
+    return out
+
+def _course_rows(db, ft):
+    '''    """The Courses-tab search path.
+
+Parameters:
+    db: parameter.
+    ft: lower-case search text.
+    """'''
+    out = []
+    for c in db.list_courses():
+        students = ', '.join(db.course_students(c.course_id)) if c.enrolled_count else 'None'
+        row = (c.course_id, c.course_name, c.instructor_id or 'None', students, str(c.enrolled_count))
+        if not ft or any((ft in str(x).lower() for x in row)):
+            out.append(row)
+    return out
+
+def test_search_students(benchmark, school_db):
+    '''    """Latency of one Students-tab search keystroke.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['matches'] = len(benchmark(_student_rows, school_db, SEARCH_TERM))
+
+def test_search_courses(benchmark, school_db):
+    '''    """Latency of one Courses-tab search keystroke.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    benchmark.extra_info['matches'] = len(benchmark(_course_rows, school_db, 'physics'))
+
+def test_datastore_search(benchmark, school):
+    '''    """DataStore.search on the trigram index; the index size is recorded alongside the timing.
+
+Parameters:
+    benchmark: parameter.
+    school: parameter.
+    """'''
+    ds = school.to_datastore()
+    benchmark.extra_info['matches'] = len(benchmark(ds.search, 'students', SEARCH_TERM))
+    benchmark.extra_info['index_bytes'] = ds.search_index_memory()['students']['total_bytes']
+
+def test_db_filter_students_without_courses(benchmark, school_db):
+    '''    """Students with no registrations, as one NOT EXISTS anti-join.
+
+Parameters:
+    benchmark: parameter.
+    school_db: parameter.
+    """'''
+    from db_filter import Filter
+    benchmark.extra_info['matches'] = len(benchmark(school_db.list_students, where=Filter(no_courses=True)))
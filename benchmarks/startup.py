@@ -0,0 +1,125 @@
+'''"""
+Startup Benchmark — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Import time of each GUI module, measured in a fresh interpreter
+- Time until the window shell exists and until every table has been streamed in, lazy vs eager
+- python -m benchmarks.startup --db school.db --out startup.json
+"""'''
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+UI_MODULES = ('main_tk', 'main_tk_SQL_Version', 'main_Qt', 'main_qt_SQL_Version')
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _probe(module: str, lazy: bool) -> Dict[str, Any]:
+    '''    """Open one front-end in this process and time it (run inside a child interpreter).
+
+Parameters:
+    module: UI module name.
+    lazy: pass lazy_start to the window.
+    """'''
+    t0 = time.perf_counter()
+    mod = __import__(module)
+    t_import = time.perf_counter() - t0
+    if module.startswith('main_tk'):
+        import tkinter as tk
+        try:
+            win = mod.App(lazy_start=lazy)
+        except tk.TclError as e:
+            return {'skipped': str(e)}
+        t_shell = time.perf_counter() - t0
+        loader = win.loader if hasattr(win, 'loader') else win._loader
+        win.update()
+        while loader.busy():
+            win.update()
+        t_loaded = time.perf_counter() - t0
+        win.on_close()
+    else:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(['startup'])
+        win = mod.MainWindow(lazy_start=lazy)
+        win.show()
+        app.processEvents()
+        t_shell = time.perf_counter() - t0
+        while win._loader.busy():
+            app.processEvents()
+        t_loaded = time.perf_counter() - t0
+        win.close()
+    return {'import_s': round(t_import, 4), 'shell_s': round(t_shell, 4), 'loaded_s': round(t_loaded, 4)}
+
+def _run_child(args: List[str], db: str) -> Dict[str, Any]:
+    '''    """Run this module in a fresh interpreter and parse its JSON line.
+
+Parameters:
+    args: extra command-line arguments.
+    db: SQLite database path (the child runs in its directory).
+    """'''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = _ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    cwd = os.path.dirname(os.path.abspath(db))
+    proc = subprocess.run([sys.executable, '-m', 'benchmarks.startup'] + args, cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {'error': (proc.stderr.strip().splitlines() or ['exit %d' % proc.returncode])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def run(db: str, repeat: int=3) -> Dict[str, Any]:
+    '''    """Measure every front-end, lazy and eager, best of repeat cold starts.
+
+The GUI modules open DBStore() on the default path, so db must be named
+school.db; its directory becomes the child's working directory.
+
+Parameters:
+    db: path to a school.db to open.
+    repeat: cold starts per configuration.
+    """'''
+    results: Dict[str, Any] = {'db': os.path.abspath(db), 'python': sys.version.split()[0], 'modules': {}}
+    for module in UI_MODULES:
+        entry: Dict[str, Any] = {}
+        for mode in ('lazy', 'eager'):
+            runs = [_run_child(['--probe', module, '--mode', mode], db) for _ in range(repeat)]
+            ok = [r for r in runs if 'loaded_s' in r]
+            if not ok:
+                entry[mode] = runs[0]
+                continue
+            entry[mode] = {k: min((r[k] for r in ok)) for k in ('import_s', 'shell_s', 'loaded_s')}
+        results['modules'][module] = entry
+    return results
+
+def main(argv: Optional[List[str]]=None) -> int:
+    '''    """Main.
+
+Parameters:
+    argv: parameter.
+    """'''
+    p = argparse.ArgumentParser(prog='python -m benchmarks.startup', description='Measure GUI import and startup time.')
+    p.add_argument('--db', default='school.db', help='school.db to open (default: ./school.db)')
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--out', help='write the JSON results here')
+    p.add_argument('--probe', choices=UI_MODULES, help=argparse.SUPPRESS)
+    p.add_argument('--mode', choices=('lazy', 'eager'), default='lazy', help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+    if args.probe:
+        print(json.dumps(_probe(args.probe, args.mode == 'lazy')))
+        return 0
+    results = run(args.db, args.repeat)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
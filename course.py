@@ -16,6 +16,7 @@ Contents:
 from __future__ import annotations
 from typing import Optional, List, TYPE_CHECKING
 from person import ValidationError
+from validators import require_text
 if TYPE_CHECKING:
     from instructor import Instructor
     from Student import Student
@@ -30,14 +31,26 @@ Parameters:
     course_id: parameter.
     course_name: parameter.
     """'''
-        if not isinstance(course_id, str) or not course_id.strip():
-            raise ValidationError('Course ID is empty]')
-        if not isinstance(course_name, str) or not course_name.strip():
-            raise ValidationError("Course doesn't have a name.")
-        self.course_id: str = course_id.strip()
-        self.course_name: str = course_name.strip()
+        self.course_id: str = require_text(course_id, 'Course ID is empty]')
+        self.course_name: str = require_text(course_name, "Course doesn't have a name.")
+        self.instructor: Optional['Instructor'] = None
         self.enrolled_students: List['Student'] = []
 
+    @classmethod
+    def from_trusted(cls, course_id: str, course_name: str) -> 'Course':
+        '''    """Build a course from already-validated data without re-checking its fields.
+
+Parameters:
+    course_id: parameter.
+    course_name: parameter.
+    """'''
+        obj = cls.__new__(cls)
+        obj.course_id = course_id
+        obj.course_name = course_name
+        obj.instructor = None
+        obj.enrolled_students = []
+        return obj
+
     def setinstructor(self, instructor: 'Instructor'):
         '''    """Setinstructor.
 
@@ -95,6 +108,10 @@ Parameters:
         if self.instructor:
             iid = self.instructor.instructor_id
         else:
-            None
+            iid = None
         sids = [s.student_id for s in self.enrolled_students]
-        return f'Course(course_id={self.course_id!r}, course_name={self.course_name!r}, instructor_id={iid!r}, enrolled_student_ids={sids!r})'
\ No newline at end of file
+        return f'Course(course_id={self.course_id!r}, course_name={self.course_name!r}, instructor_id={iid!r}, enrolled_student_ids={sids!r})'
+    set_instructor = setinstructor
+    clear_instructor = clearinstructor
+    add_student = addstudent
+    drop_student = dropstudent
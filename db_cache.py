@@ -0,0 +1,83 @@
+'''"""
+Read Cache — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- LRUCache: size-bounded read-through cache whose entries are tagged with the tables they read
+- Invalidation is O(1): each table has a generation counter and entries remember the generations they saw
+- DBStore bumps generations on its own writes and on PRAGMA data_version changes from other processes
+"""'''
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+DEFAULT_CACHE_SIZE = 4096
+TABLES = ('students', 'instructors', 'courses', 'registrations')
+
+class LRUCache:
+    """Least-recently-used cache keyed by call signature and tagged by source table."""
+
+    def __init__(self, maxsize: int=DEFAULT_CACHE_SIZE):
+        '''    """  init  .
+
+Parameters:
+    maxsize: maximum number of entries; 0 disables caching.
+    """'''
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._gen: Dict[str, int] = {t: 0 for t in TABLES}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: Hashable, tables: Tuple[str, ...], load: Callable[[], Any]) -> Any:
+        '''    """Return the cached value for key, calling load() on a miss or after its tables changed.
+
+Parameters:
+    key: parameter.
+    tables: tables the value was read from.
+    load: parameter.
+    """'''
+        if self.maxsize <= 0:
+            return load()
+        stamp = tuple((self._gen[t] for t in tables))
+        hit = self._data.get(key)
+        if hit is not None and hit[0] == stamp:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return hit[1]
+        self.misses += 1
+        value = load()
+        self._data[key] = (stamp, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        '''    """Mark every entry that read any of tables as stale.
+
+Parameters:
+    tables: parameter.
+    """'''
+        for t in tables:
+            self._gen[t] += 1
+
+    def clear(self) -> None:
+        '''"""Drop every entry.
+
+"""'''
+        self._data.clear()
+        self.invalidate(TABLES)
+
+    def info(self) -> Dict[str, int]:
+        '''"""Hit/miss counters and current size.
+
+"""'''
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._data), 'maxsize': self.maxsize}
@@ -0,0 +1,79 @@
+'''"""
+Structured Filters — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Filter: multi-criteria filter (age range, course, instructor, no courses/students, course size)
+- compile_filter: turns a Filter into a parameterized WHERE clause over the DBStore list statements
+- Every criterion is a fixed SQL fragment; user values are only ever bound as parameters
+- Relations compile to IN subqueries over the registrations and courses indexes; emptiness and size use the trigger-maintained count columns
+"""'''
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from typing import Optional, Set, Tuple
+from person import ValidationError
+FILTER_FIELDS = {'students': ('min_age', 'max_age', 'course_id', 'instructor_id', 'no_courses'), 'instructors': ('min_age', 'max_age', 'course_id', 'no_courses'), 'courses': ('instructor_id', 'no_students', 'min_size', 'max_size')}
+_CRITERIA = {('students', 'min_age'): ('s.age >= ?{}', ()), ('students', 'max_age'): ('s.age <= ?{}', ()), ('students', 'course_id'): ('s.student_id IN (SELECT r.student_id FROM registrations r WHERE r.course_id = ?{})', ('registrations',)), ('students', 'instructor_id'): ('s.student_id IN (SELECT r.student_id FROM courses x JOIN registrations r ON r.course_id = x.course_id WHERE x.instructor_id = ?{})', ('registrations', 'courses')), ('students', 'no_courses'): ('s.course_count = 0', ()), ('instructors', 'min_age'): ('i.age >= ?{}', ()), ('instructors', 'max_age'): ('i.age <= ?{}', ()), ('instructors', 'course_id'): ('i.instructor_id IN (SELECT x.instructor_id FROM courses x WHERE x.course_id = ?{})', ('courses',)), ('instructors', 'no_courses'): ('i.course_count = 0', ()), ('courses', 'instructor_id'): ('c.instructor_id = ?{}', ()), ('courses', 'no_students'): ('c.enrolled_count = 0', ()), ('courses', 'min_size'): ('c.enrolled_count >= ?{}', ()), ('courses', 'max_size'): ('c.enrolled_count <= ?{}', ())}
+
+def _unset(value: object) -> bool:
+    '''    """True for the values that leave a criterion out: None, False and ''. None and False are tested by identity, so a 0 bound (which equals False) stays set.
+
+Parameters:
+    value: parameter.
+    """'''
+    return value is None or value is False or value == ''
+
+@dataclass(frozen=True)
+class Filter:
+    """Criteria combined with AND; None (or False) leaves a criterion out.
+
+Which criteria apply depends on the table (see FILTER_FIELDS): course_id means
+"enrolled in" for students and "teaches" for instructors, instructor_id means
+"in a course taught by" for students and "taught by" for courses, and the size
+bounds count a course's enrolled students.
+"""
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    course_id: Optional[str] = None
+    instructor_id: Optional[str] = None
+    no_courses: bool = False
+    no_students: bool = False
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+
+    def active(self) -> Tuple[str, ...]:
+        '''"""Names of the criteria that are set; a zero bound is set, only None, False and '' are not.
+
+"""'''
+        return tuple((f.name for f in fields(self) if not _unset(getattr(self, f.name))))
+
+def compile_filter(table: str, where: Filter, first_param: int=1) -> Tuple[str, Tuple[object, ...], Set[str]]:
+    '''    """Compile where into a WHERE clause for the aliased list statement of table.
+
+Parameters:
+    table: 'students', 'instructors' or 'courses'.
+    where: parameter.
+    first_param: number of the first ?NNN placeholder, so the clause can share a statement with other numbered parameters.
+    """'''
+    if table not in FILTER_FIELDS:
+        raise ValidationError(f"Unknown table '{table}'.")
+    clauses, params, reads = ([], [], {table})
+    for name in where.active():
+        if name not in FILTER_FIELDS[table]:
+            raise ValidationError(f"Filter '{name}' does not apply to {table}.")
+        value = getattr(where, name)
+        sql, tables = _CRITERIA[table, name]
+        if '?{}' in sql:
+            if name.startswith(('min_', 'max_')) and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+                raise ValidationError(f"Filter '{name}' must be a non-negative integer.")
+            sql = sql.format(first_param + len(params))
+            params.append(value)
+        clauses.append(sql)
+        reads.update(tables)
+    return (' AND '.join(clauses) or '1', tuple(params), reads)
@@ -0,0 +1,373 @@
+'''"""
+Query Profiler — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Profiler: per-statement counts, latency histograms, rows returned and EXPLAIN QUERY PLAN for slow statements
+- ProfilingConnection: drop-in stand-in for sqlite3.Connection that reports to a Profiler
+- LoggingSink / JSONLinesSink: pluggable receivers for slow-statement events
+- DBStore swaps the proxy in only while profiling is enabled, so the disabled path is the raw connection
+"""'''
+from __future__ import annotations
+import json
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+_WS = re.compile('\\s+')
+Sink = Callable[[Dict[str, Any]], None]
+
+def normalize_sql(sql: str) -> str:
+    '''    """Collapse whitespace so one statement always maps to one stats entry.
+
+Parameters:
+    sql: parameter.
+    """'''
+    return _WS.sub(' ', sql).strip()
+
+@dataclass
+class StatementStats:
+    """Accumulated timings for one normalized SQL statement."""
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    errors: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    plan: Optional[List[str]] = None
+
+    def add(self, ms: float, rows: int) -> None:
+        '''    """Record one completed execution.
+
+Parameters:
+    ms: wall time including row fetching.
+    rows: rows returned (SELECT) or affected (DML).
+    """'''
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += max(rows, 0)
+        for n, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.histogram[n] += 1
+                return
+        self.histogram[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''"""JSON-serializable form, histogram keyed by bucket upper bound.
+
+"""'''
+        hist = {f'<={b:g}ms': c for b, c in zip(BUCKETS_MS, self.histogram) if c}
+        if self.histogram[-1]:
+            hist[f'>{BUCKETS_MS[-1]:g}ms'] = self.histogram[-1]
+        return {'sql': self.sql, 'count': self.count, 'total_ms': round(self.total_ms, 3), 'mean_ms': round(self.total_ms / self.count, 4) if self.count else 0.0, 'max_ms': round(self.max_ms, 3), 'rows': self.rows, 'errors': self.errors, 'histogram': hist, 'plan': self.plan}
+
+class LoggingSink:
+    """Sends slow-statement events to a logger."""
+
+    def __init__(self, logger: Optional[logging.Logger]=None, level: int=logging.WARNING):
+        '''    """  init  .
+
+Parameters:
+    logger: defaults to the 'school.db' logger.
+    level: parameter.
+    """'''
+        self.logger = logger or logging.getLogger('school.db')
+        self.level = level
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        '''    """Log one event.
+
+Parameters:
+    event: parameter.
+    """'''
+        self.logger.log(self.level, 'slow query %.2f ms (%d rows): %s', event['ms'], event['rows'], event['sql'])
+        for line in event.get('plan') or ():
+            self.logger.log(self.level, '  plan: %s', line)
+
+class JSONLinesSink:
+    """Appends each slow-statement event as one JSON line to a file."""
+
+    def __init__(self, path: str):
+        '''    """  init  .
+
+Parameters:
+    path: parameter.
+    """'''
+        self.path = path
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        '''    """Append one event.
+
+Parameters:
+    event: parameter.
+    """'''
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event) + '\n')
+
+class Profiler:
+    """Collects statement statistics and emits slow-statement events to sinks."""
+
+    def __init__(self, raw: sqlite3.Connection, slow_ms: float=50.0, explain: bool=True, sinks: Iterable[Sink]=()):
+        '''    """  init  .
+
+Parameters:
+    raw: the unwrapped connection, used for EXPLAIN QUERY PLAN.
+    slow_ms: statements at or above this wall time are reported to the sinks.
+    explain: capture the query plan the first time a SELECT is slow.
+    sinks: callables receiving slow-statement events.
+    """'''
+        self.raw = raw
+        self.slow_ms = slow_ms
+        self.explain = explain
+        self.sinks: List[Sink] = list(sinks)
+        self.statements: Dict[str, StatementStats] = {}
+        self.started = time.time()
+
+    def entry(self, sql: str) -> StatementStats:
+        '''    """Stats entry for sql, created on first use.
+
+Parameters:
+    sql: parameter.
+    """'''
+        st = self.statements.get(sql)
+        if st is None:
+            st = self.statements[sql] = StatementStats(normalize_sql(sql))
+        return st
+
+    def finish(self, sql: str, params: Any, ms: float, rows: int) -> None:
+        '''    """Record a completed statement and report it if slow.
+
+Parameters:
+    sql: statement as executed.
+    params: bound parameters (used for EXPLAIN; never sent to sinks).
+    ms: wall time.
+    rows: rows returned or affected.
+    """'''
+        st = self.entry(sql)
+        st.add(ms, rows)
+        if ms < self.slow_ms:
+            return
+        if self.explain and st.plan is None and st.sql.split(' ', 1)[0].upper() in ('SELECT', 'WITH'):
+            st.plan = self._plan(sql, params)
+        event = {'ts': time.time(), 'sql': st.sql, 'ms': round(ms, 3), 'rows': rows, 'plan': st.plan}
+        for sink in self.sinks:
+            sink(event)
+
+    def _plan(self, sql: str, params: Any) -> List[str]:
+        '''    """EXPLAIN QUERY PLAN detail lines for sql.
+
+Parameters:
+    sql: parameter.
+    params: parameter.
+    """'''
+        try:
+            return [row[-1] for row in self.raw.execute('EXPLAIN QUERY PLAN ' + sql, params if params is not None else ())]
+        except sqlite3.Error as e:
+            return [f'unavailable: {e}']
+
+    def snapshot(self) -> Dict[str, Any]:
+        '''"""Statistics for every statement, slowest total first.
+
+"""'''
+        rows = sorted(self.statements.values(), key=lambda s: s.total_ms, reverse=True)
+        return {'enabled': True, 'since': self.started, 'queries': sum((s.count for s in rows)), 'total_ms': round(sum((s.total_ms for s in rows)), 3), 'slow_ms': self.slow_ms, 'statements': [s.to_dict() for s in rows]}
+
+    def reset(self) -> None:
+        '''"""Forget all collected statistics.
+
+"""'''
+        self.statements.clear()
+        self.started = time.time()
+
+    def dump_json(self, path: str) -> None:
+        '''    """Write snapshot() to a JSON file.
+
+Parameters:
+    path: parameter.
+    """'''
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+class _ProfiledCursor:
+    """Cursor wrapper that times row fetching and reports once the statement is done."""
+
+    def __init__(self, profiler: Profiler, cur: sqlite3.Cursor, sql: str, params: Any, ms: float):
+        '''    """  init  .
+
+Parameters:
+    profiler: parameter.
+    cur: parameter.
+    sql: parameter.
+    params: parameter.
+    ms: time spent in execute().
+    """'''
+        self._profiler = profiler
+        self._cur = cur
+        self._sql = sql
+        self._params = params
+        self._ms = ms
+        self._rows = 0
+        self._open = True
+
+    def _done(self) -> None:
+        '''""" done.
+
+"""'''
+        if self._open:
+            self._open = False
+            self._profiler.finish(self._sql, self._params, self._ms, self._rows)
+
+    def fetchone(self):
+        '''"""Fetchone.
+
+"""'''
+        t0 = time.perf_counter()
+        row = self._cur.fetchone()
+        self._ms += (time.perf_counter() - t0) * 1000.0
+        if row is None:
+            self._done()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size: Optional[int]=None):
+        '''    """Fetchmany.
+
+Parameters:
+    size: parameter.
+    """'''
+        size = self._cur.arraysize if size is None else size
+        t0 = time.perf_counter()
+        rows = self._cur.fetchmany(size)
+        self._ms += (time.perf_counter() - t0) * 1000.0
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._done()
+        return rows
+
+    def fetchall(self):
+        '''"""Fetchall.
+
+"""'''
+        t0 = time.perf_counter()
+        rows = self._cur.fetchall()
+        self._ms += (time.perf_counter() - t0) * 1000.0
+        self._rows += len(rows)
+        self._done()
+        return rows
+
+    def __iter__(self):
+        '''"""  iter  .
+
+"""'''
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        '''"""Close.
+
+"""'''
+        self._done()
+        self._cur.close()
+
+    def __del__(self):
+        '''"""Report statements whose rows were never fully consumed.
+
+"""'''
+        try:
+            self._done()
+        except Exception:
+            pass
+
+    def __getattr__(self, name: str):
+        '''    """Delegate rowcount, description, lastrowid, ... to the real cursor.
+
+Parameters:
+    name: parameter.
+    """'''
+        return getattr(self._cur, name)
+
+class ProfilingConnection:
+    """sqlite3.Connection stand-in that reports execute/executemany timings to a Profiler."""
+
+    def __init__(self, raw: sqlite3.Connection, profiler: Profiler):
+        '''    """  init  .
+
+Parameters:
+    raw: parameter.
+    profiler: parameter.
+    """'''
+        self.raw = raw
+        self.profiler = profiler
+
+    def execute(self, sql: str, params: Any=()):
+        '''    """Execute and time one statement.
+
+Parameters:
+    sql: parameter.
+    params: parameter.
+    """'''
+        t0 = time.perf_counter()
+        try:
+            cur = self.raw.execute(sql, params)
+        except sqlite3.Error:
+            self.profiler.entry(sql).errors += 1
+            raise
+        ms = (time.perf_counter() - t0) * 1000.0
+        if cur.description is None:
+            self.profiler.finish(sql, params, ms, cur.rowcount)
+            return cur
+        return _ProfiledCursor(self.profiler, cur, sql, params, ms)
+
+    def executemany(self, sql: str, seq: Iterable[Any]):
+        '''    """Execute and time a batched statement; rows counts rows affected.
+
+Parameters:
+    sql: parameter.
+    seq: parameter.
+    """'''
+        t0 = time.perf_counter()
+        try:
+            cur = self.raw.executemany(sql, seq)
+        except sqlite3.Error:
+            self.profiler.entry(sql).errors += 1
+            raise
+        self.profiler.finish(sql, None, (time.perf_counter() - t0) * 1000.0, cur.rowcount)
+        return cur
+
+    def __enter__(self):
+        '''"""  enter  .
+
+"""'''
+        self.raw.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        '''    """  exit  .
+
+Parameters:
+    exc: parameter.
+    """'''
+        return self.raw.__exit__(*exc)
+
+    def __getattr__(self, name: str):
+        '''    """Delegate commit, cursor, backup, close, ... to the real connection.
+
+Parameters:
+    name: parameter.
+    """'''
+        return getattr(self.raw, name)
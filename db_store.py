@@ -14,59 +14,186 @@ Contents:
 - Notes on usage and important behaviors
 """'''
 from __future__ import annotations
-import sqlite3, shutil, re, json
+import sqlite3, csv, json, time
+from collections import namedtuple
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
 from person import ValidationError
+from validators import check_age, check_capacity, check_email, require_text
+from db_profiler import Profiler, ProfilingConnection, Sink
+from db_cache import DEFAULT_CACHE_SIZE, TABLES, LRUCache
+from db_filter import Filter, compile_filter
+from text_search import SearchKeys
 DB_PATH = 'school.db'
+EXPORT_KEYS = {'students': ('student_id', 'name', 'age', 'email', 'courses'), 'instructors': ('instructor_id', 'name', 'age', 'email', 'courses'), 'courses': ('course_id', 'course_name', 'instructor_id', 'students')}
+_EXPORT_SQL = {'students': 'SELECT s.student_id, s.name, s.age, s.email, (SELECT json_group_array(course_id) FROM (SELECT r.course_id FROM registrations r WHERE r.student_id=s.student_id ORDER BY r.course_id)) FROM students s ORDER BY s.student_id', 'instructors': 'SELECT i.instructor_id, i.name, i.age, i.email, (SELECT json_group_array(course_id) FROM (SELECT c.course_id FROM courses c WHERE c.instructor_id=i.instructor_id ORDER BY c.course_id)) FROM instructors i ORDER BY i.instructor_id', 'courses': 'SELECT c.course_id, c.course_name, c.instructor_id, (SELECT json_group_array(student_id) FROM (SELECT r.student_id FROM registrations r WHERE r.course_id=c.course_id ORDER BY r.student_id)) FROM courses c ORDER BY c.course_id'}
+_SCHEMA = ('\n        CREATE TABLE IF NOT EXISTS students(\n            student_id TEXT PRIMARY KEY,\n            name TEXT NOT NULL,\n            age INTEGER NOT NULL CHECK(age >= 0),\n            email TEXT NOT NULL,\n            course_count INTEGER NOT NULL DEFAULT 0\n        )', '\n        CREATE TABLE IF NOT EXISTS instructors(\n            instructor_id TEXT PRIMARY KEY,\n            name TEXT NOT NULL,\n            age INTEGER NOT NULL CHECK(age >= 0),\n            email TEXT NOT NULL,\n            course_count INTEGER NOT NULL DEFAULT 0\n        )', '\n        CREATE TABLE IF NOT EXISTS courses(\n            course_id TEXT PRIMARY KEY,\n            course_name TEXT NOT NULL,\n            instructor_id TEXT,\n            enrolled_count INTEGER NOT NULL DEFAULT 0,\n            capacity INTEGER CHECK(capacity IS NULL OR capacity >= 0),\n            FOREIGN KEY(instructor_id) REFERENCES instructors(instructor_id)\n              ON UPDATE CASCADE ON DELETE SET NULL\n        )', '\n        CREATE TABLE IF NOT EXISTS registrations(\n            student_id TEXT NOT NULL,\n            course_id  TEXT NOT NULL,\n            PRIMARY KEY(student_id, course_id),\n            FOREIGN KEY(student_id) REFERENCES students(student_id)\n              ON UPDATE CASCADE ON DELETE CASCADE,\n            FOREIGN KEY(course_id)  REFERENCES courses(course_id)\n              ON UPDATE CASCADE ON DELETE CASCADE\n        )', 'CREATE INDEX IF NOT EXISTS idx_registrations_course ON registrations(course_id, student_id)', 'CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses(instructor_id)', 'CREATE INDEX IF NOT EXISTS idx_students_name ON students(name COLLATE NOCASE, student_id)', 'CREATE INDEX IF NOT EXISTS idx_students_age ON students(age, student_id)', 'CREATE INDEX IF NOT EXISTS idx_students_email ON students(email COLLATE NOCASE, student_id)', 'CREATE INDEX IF NOT EXISTS idx_instructors_name ON instructors(name COLLATE NOCASE, instructor_id)', 'CREATE INDEX IF NOT EXISTS idx_instructors_age ON instructors(age, instructor_id)', 'CREATE INDEX IF NOT EXISTS idx_instructors_email ON instructors(email COLLATE NOCASE, instructor_id)', 'CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(course_name COLLATE NOCASE, course_id)', "CREATE INDEX IF NOT EXISTS idx_courses_instructor_sort ON courses(IFNULL(instructor_id, ''), course_id)")
+_COUNT_COLUMNS = (('students', 'course_count', 'INTEGER NOT NULL DEFAULT 0', 'UPDATE students SET course_count=(SELECT COUNT(*) FROM registrations r WHERE r.student_id=students.student_id)'), ('instructors', 'course_count', 'INTEGER NOT NULL DEFAULT 0', 'UPDATE instructors SET course_count=(SELECT COUNT(*) FROM courses c WHERE c.instructor_id=instructors.instructor_id)'), ('courses', 'enrolled_count', 'INTEGER NOT NULL DEFAULT 0', 'UPDATE courses SET enrolled_count=(SELECT COUNT(*) FROM registrations r WHERE r.course_id=courses.course_id)'), ('courses', 'capacity', 'INTEGER CHECK(capacity IS NULL OR capacity >= 0)', None))
+COURSE_FULL = 'course_full'
+_COUNT_TRIGGERS = {'trg_registrations_capacity': "CREATE TRIGGER IF NOT EXISTS trg_registrations_capacity BEFORE INSERT ON registrations WHEN (SELECT capacity IS NOT NULL AND enrolled_count >= capacity FROM courses WHERE course_id=NEW.course_id) AND NOT EXISTS(SELECT 1 FROM registrations WHERE student_id=NEW.student_id AND course_id=NEW.course_id) BEGIN SELECT RAISE(ABORT, '" + COURSE_FULL + "'); END", 'trg_registrations_insert': 'CREATE TRIGGER IF NOT EXISTS trg_registrations_insert AFTER INSERT ON registrations BEGIN UPDATE students SET course_count=course_count+1 WHERE student_id=NEW.student_id; UPDATE courses SET enrolled_count=enrolled_count+1 WHERE course_id=NEW.course_id; END', 'trg_registrations_delete': 'CREATE TRIGGER IF NOT EXISTS trg_registrations_delete AFTER DELETE ON registrations BEGIN UPDATE students SET course_count=course_count-1 WHERE student_id=OLD.student_id; UPDATE courses SET enrolled_count=enrolled_count-1 WHERE course_id=OLD.course_id; END', 'trg_registrations_move_student': 'CREATE TRIGGER IF NOT EXISTS trg_registrations_move_student AFTER UPDATE OF student_id ON registrations WHEN OLD.student_id IS NOT NEW.student_id AND EXISTS(SELECT 1 FROM students WHERE student_id=OLD.student_id) BEGIN UPDATE students SET course_count=course_count-1 WHERE student_id=OLD.student_id; UPDATE students SET course_count=course_count+1 WHERE student_id=NEW.student_id; END', 'trg_registrations_move_course': 'CREATE TRIGGER IF NOT EXISTS trg_registrations_move_course AFTER UPDATE OF course_id ON registrations WHEN OLD.course_id IS NOT NEW.course_id AND EXISTS(SELECT 1 FROM courses WHERE course_id=OLD.course_id) BEGIN UPDATE courses SET enrolled_count=enrolled_count-1 WHERE course_id=OLD.course_id; UPDATE courses SET enrolled_count=enrolled_count+1 WHERE course_id=NEW.course_id; END', 'trg_courses_insert': 'CREATE TRIGGER IF NOT EXISTS trg_courses_insert AFTER INSERT ON courses WHEN NEW.instructor_id IS NOT NULL BEGIN UPDATE instructors SET course_count=course_count+1 WHERE instructor_id=NEW.instructor_id; END', 'trg_courses_delete': 'CREATE TRIGGER IF NOT EXISTS trg_courses_delete AFTER DELETE ON courses WHEN OLD.instructor_id IS NOT NULL BEGIN UPDATE instructors SET course_count=course_count-1 WHERE instructor_id=OLD.instructor_id; END', 'trg_courses_reassign': 'CREATE TRIGGER IF NOT EXISTS trg_courses_reassign AFTER UPDATE OF instructor_id ON courses WHEN OLD.instructor_id IS NOT NEW.instructor_id AND (OLD.instructor_id IS NULL OR EXISTS(SELECT 1 FROM instructors WHERE instructor_id=OLD.instructor_id)) BEGIN UPDATE instructors SET course_count=course_count-1 WHERE instructor_id=OLD.instructor_id; UPDATE instructors SET course_count=course_count+1 WHERE instructor_id=NEW.instructor_id; END'}
+_COUNT_INDEXES = ('CREATE INDEX IF NOT EXISTS idx_students_course_count ON students(course_count, student_id)', 'CREATE INDEX IF NOT EXISTS idx_instructors_course_count ON instructors(course_count, instructor_id)', 'CREATE INDEX IF NOT EXISTS idx_courses_enrolled_count ON courses(enrolled_count, course_id)')
+STATEMENT_CACHE_SIZE = 256
+CACHE_CHECK_INTERVAL = 0.25
+FETCH_BATCH = 500
+ROW_FACTORIES = ('dataclass', 'namedtuple', 'tuple')
+_SQL = {'student_insert': 'INSERT INTO students(student_id,name,age,email) VALUES(?,?,?,?)', 'student_update': 'UPDATE students SET name=?, age=?, email=? WHERE student_id=?', 'student_delete': 'DELETE FROM students WHERE student_id=?', 'instructor_insert': 'INSERT INTO instructors(instructor_id,name,age,email) VALUES(?,?,?,?)', 'instructor_update': 'UPDATE instructors SET name=?, age=?, email=? WHERE instructor_id=?', 'instructor_delete': 'DELETE FROM instructors WHERE instructor_id=?', 'course_insert': 'INSERT INTO courses(course_id,course_name,capacity) VALUES(?,?,?)', 'course_capacity': 'UPDATE courses SET capacity=?1 WHERE course_id=?2 AND (?1 IS NULL OR enrolled_count <= ?1)', 'course_enrolled': 'SELECT enrolled_count FROM courses WHERE course_id=?', 'course_rename': 'UPDATE courses SET course_name=? WHERE course_id=?', 'course_delete': 'DELETE FROM courses WHERE course_id=?', 'course_unassign': 'UPDATE courses SET instructor_id=NULL WHERE course_id=?', 'registration_delete': 'DELETE FROM registrations WHERE student_id=? AND course_id=?', 'course_students': 'SELECT r.student_id FROM registrations r WHERE r.course_id=? ORDER BY r.student_id', 'student_courses': 'SELECT r.course_id FROM registrations r WHERE r.student_id=? ORDER BY r.course_id', 'instructor_courses': 'SELECT c.course_id FROM courses c WHERE c.instructor_id=? ORDER BY c.course_id', 'students_upsert': 'INSERT INTO students(student_id,name,age,email) VALUES(?,?,?,?) ON CONFLICT(student_id) DO UPDATE SET name=excluded.name, age=excluded.age, email=excluded.email', 'instructors_upsert': 'INSERT INTO instructors(instructor_id,name,age,email) VALUES(?,?,?,?) ON CONFLICT(instructor_id) DO UPDATE SET name=excluded.name, age=excluded.age, email=excluded.email', 'courses_upsert': 'INSERT INTO courses(course_id,course_name) VALUES(?,?) ON CONFLICT(course_id) DO UPDATE SET course_name=excluded.course_name', 'assign_if_exists': 'UPDATE courses SET instructor_id=?1 WHERE course_id=?2 AND EXISTS(SELECT 1 FROM instructors WHERE instructor_id=?1)', 'enroll_if_exists': 'INSERT OR IGNORE INTO registrations(student_id,course_id) SELECT ?1, ?2 WHERE EXISTS(SELECT 1 FROM students WHERE student_id=?1) AND EXISTS(SELECT 1 FROM courses WHERE course_id=?2 AND (capacity IS NULL OR enrolled_count < capacity))', 'assign': 'UPDATE courses SET instructor_id=?1 WHERE course_id=?2', 'enroll': 'INSERT INTO registrations(student_id,course_id) VALUES(?1,?2)', 'enroll_many': 'INSERT OR IGNORE INTO registrations(student_id,course_id) SELECT DISTINCT j.value, ?2 FROM json_each(?1) j', 'unknown_students': 'SELECT j.value FROM json_each(?1) j WHERE NOT EXISTS(SELECT 1 FROM students s WHERE s.student_id=j.value)', 'course_exists': 'SELECT EXISTS(SELECT 1 FROM courses WHERE course_id=?)', 'assign_check': 'SELECT EXISTS(SELECT 1 FROM instructors WHERE instructor_id=?1), EXISTS(SELECT 1 FROM courses WHERE course_id=?2)', 'enroll_check': 'SELECT EXISTS(SELECT 1 FROM students WHERE student_id=?1), EXISTS(SELECT 1 FROM courses WHERE course_id=?2)', 'count_students': 'SELECT COUNT(*) FROM students', 'count_instructors': 'SELECT COUNT(*) FROM instructors', 'count_courses': 'SELECT COUNT(*) FROM courses', 'count_registrations': 'SELECT COUNT(*) FROM registrations', 'student_id_prefix': 'SELECT student_id FROM students WHERE student_id >= ?1 AND student_id < ?2 ORDER BY student_id LIMIT ?3', 'instructor_id_prefix': 'SELECT instructor_id FROM instructors WHERE instructor_id >= ?1 AND instructor_id < ?2 ORDER BY instructor_id LIMIT ?3', 'course_id_prefix': 'SELECT course_id FROM courses WHERE course_id >= ?1 AND course_id < ?2 ORDER BY course_id LIMIT ?3', 'student_search_keys': "SELECT s.student_id, s.name, s.age, s.email, (SELECT group_concat(r.course_id, ' ') FROM registrations r WHERE r.student_id=s.student_id) FROM students s", 'instructor_search_keys': "SELECT i.instructor_id, i.name, i.age, i.email, (SELECT group_concat(c.course_id, ' ') FROM courses c WHERE c.instructor_id=i.instructor_id) FROM instructors i", 'course_search_keys': "SELECT c.course_id, c.course_name, c.instructor_id, (SELECT group_concat(r.student_id, ' ') FROM registrations r WHERE r.course_id=c.course_id) FROM courses c", 'claim_seat': 'INSERT INTO registrations(student_id,course_id) SELECT ?1, ?2 WHERE EXISTS(SELECT 1 FROM courses WHERE course_id=?2 AND (capacity IS NULL OR enrolled_count < capacity)) AND EXISTS(SELECT 1 FROM students WHERE student_id=?1) AND NOT EXISTS(SELECT 1 FROM registrations WHERE student_id=?1 AND course_id=?2)', 'enroll_refusal': 'SELECT EXISTS(SELECT 1 FROM students WHERE student_id=?1), (SELECT capacity IS NOT NULL AND enrolled_count >= capacity FROM courses WHERE course_id=?2), EXISTS(SELECT 1 FROM registrations WHERE student_id=?1 AND course_id=?2)', 'course_seats': 'SELECT capacity, enrolled_count FROM courses WHERE course_id=?', 'overbooked_courses': 'SELECT course_id FROM courses WHERE capacity IS NOT NULL AND enrolled_count > capacity ORDER BY course_id', 'drifted_courses': 'SELECT c.course_id FROM courses c WHERE c.enrolled_count <> (SELECT COUNT(*) FROM registrations r WHERE r.course_id=c.course_id) ORDER BY c.course_id', 'analytics_students': 'SELECT student_id, age FROM students ORDER BY student_id', 'analytics_instructors': 'SELECT instructor_id FROM instructors ORDER BY instructor_id', 'analytics_courses': 'SELECT course_id, instructor_id FROM courses ORDER BY course_id', 'analytics_registrations': 'SELECT course_id, student_id FROM registrations', 'trigger_names': "SELECT name FROM sqlite_master WHERE type='trigger'", 'page_size': 'PRAGMA page_size', 'data_version': 'PRAGMA data_version', 'page_count': 'PRAGMA page_count', 'freelist_count': 'PRAGMA freelist_count', 'vacuum': 'VACUUM', 'optimize': 'PRAGMA optimize', 'savepoint': 'SAVEPOINT relation_write', 'savepoint_rollback': 'ROLLBACK TO relation_write', 'savepoint_release': 'RELEASE relation_write'}
+_SEARCH_KEYS = {'students': ('student_search_keys', ('students', 'registrations')), 'instructors': ('instructor_search_keys', ('instructors', 'courses')), 'courses': ('course_search_keys', ('courses', 'registrations'))}
+SORT_KEYS = {'students': ('id', 'name', 'age', 'email', 'courses'), 'instructors': ('id', 'name', 'age', 'email', 'courses'), 'courses': ('id', 'name', 'instructor', 'students')}
+_SORT_SOURCES = {'students': ('student', 'students s', 's.student_id', 's.student_id,s.name,s.age,s.email,s.course_count'), 'instructors': ('instructor', 'instructors i', 'i.instructor_id', 'i.instructor_id,i.name,i.age,i.email,i.course_count'), 'courses': ('course', 'courses c', 'c.course_id', 'c.course_id,c.course_name,c.instructor_id,c.enrolled_count,c.capacity')}
+_SORT_EXPR = {'students': {'id': 's.student_id', 'name': 's.name COLLATE NOCASE', 'age': 's.age', 'email': 's.email COLLATE NOCASE', 'courses': 's.course_count'}, 'instructors': {'id': 'i.instructor_id', 'name': 'i.name COLLATE NOCASE', 'age': 'i.age', 'email': 'i.email COLLATE NOCASE', 'courses': 'i.course_count'}, 'courses': {'id': 'c.course_id', 'name': 'c.course_name COLLATE NOCASE', 'instructor': "IFNULL(c.instructor_id, '')", 'students': 'c.enrolled_count'}}
+_LIST_READS = {'students': ('students', 'registrations'), 'instructors': ('instructors', 'courses'), 'courses': ('courses', 'registrations')}
+
+def _sort_parts(table: str, key: str, descending: bool) -> Tuple[str, str, str]:
+    '''    """SELECT head, ORDER BY terms and next-page condition for one whitelisted sort order.
+
+Rows are ordered by the key with the ID as tie-breaker, matching the
+(key, id) indexes in _SCHEMA, so SQLite walks an index instead of sorting.
+The next page starts after the (key, id) of the row whose ID is ?1; the
+redundant key >= anchor term lets SQLite seek the index to the page start.
 
-@dataclass
+Parameters:
+    table: parameter.
+    key: one of SORT_KEYS[table].
+    descending: parameter.
+    """'''
+    _, source, pk, columns = _SORT_SOURCES[table]
+    expr = _SORT_EXPR[table][key]
+    d, op = (' DESC', '<') if descending else ('', '>')
+    select = f'SELECT {columns} FROM {source}'
+    if key == 'id':
+        return (select, f'{pk}{d}', f'{pk} {op} ?1')
+    anchor = f'(SELECT {expr} FROM {source} WHERE {pk}=?1)'
+    return (select, f'{expr}{d}, {pk}{d}', f'{expr} {op}= {anchor} AND ({expr} {op} {anchor} OR {pk} {op} ?1)')
+
+def _sort_statements(table: str, key: str, descending: bool) -> Tuple[str, str, str]:
+    '''    """Full-list, first-page and next-page statements for one whitelisted sort order.
+
+Parameters:
+    table: parameter.
+    key: one of SORT_KEYS[table].
+    descending: parameter.
+    """'''
+    select, order, after = _sort_parts(table, key, descending)
+    return (f'{select} ORDER BY {order}', f'{select} ORDER BY {order} LIMIT ?2', f'{select} WHERE {after} ORDER BY {order} LIMIT ?2')
+_SORT_SQL: Dict[Tuple[str, str, bool], Tuple[str, str, str]] = {}
+for _table, _keys in SORT_KEYS.items():
+    for _key in _keys:
+        for _desc in (False, True):
+            _names = tuple((f"{_SORT_SOURCES[_table][0]}_{part}_{_key}_{('desc' if _desc else 'asc')}" for part in ('sorted', 'first', 'after')))
+            _SQL.update(zip(_names, _sort_statements(_table, _key, _desc)))
+            _SORT_SQL[_table, _key, _desc] = _names
+_ID_PREFIX_SQL = {'students': 'student_id_prefix', 'instructors': 'instructor_id_prefix', 'courses': 'course_id_prefix'}
+_CSV_HEADERS = {'students': ['student_id', 'name', 'age', 'email', 'registered_course_ids'], 'instructors': ['instructor_id', 'name', 'age', 'email', 'assigned_course_ids'], 'courses': ['course_id', 'course_name', 'instructor_id', 'enrolled_student_ids']}
+
+@dataclass(slots=True)
 class StudentRow:
-    """Typed record representing one row in the students table."""
+    """Typed record representing one row in the students table; course_count is maintained by triggers."""
     student_id: str
     name: str
     age: int
     email: str
+    course_count: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class InstructorRow:
-    """Typed record representing one row in the instructors table."""
+    """Typed record representing one row in the instructors table; course_count is maintained by triggers."""
     instructor_id: str
     name: str
     age: int
     email: str
+    course_count: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class CourseRow:
-    """Typed record representing one row in the courses table."""
+    """Typed record representing one row in the courses table; enrolled_count is maintained by triggers, capacity None means unlimited."""
     course_id: str
     course_name: str
     instructor_id: Optional[str]
+    enrolled_count: int = 0
+    capacity: Optional[int] = None
+StudentTuple = namedtuple('StudentTuple', StudentRow.__slots__, defaults=(0,))
+InstructorTuple = namedtuple('InstructorTuple', InstructorRow.__slots__, defaults=(0,))
+CourseTuple = namedtuple('CourseTuple', CourseRow.__slots__, defaults=(0, None))
+_ROW_TYPES = {'dataclass': (StudentRow, InstructorRow, CourseRow), 'namedtuple': (StudentTuple, InstructorTuple, CourseTuple)}
+
+def _row_makers(row_factory: str) -> Dict[str, Callable[[tuple], Any]]:
+    '''    """Per-table callables turning one result tuple into the configured record type.
+
+Parameters:
+    row_factory: one of ROW_FACTORIES.
+    """'''
+    if row_factory not in ROW_FACTORIES:
+        raise ValueError(f'row_factory must be one of {ROW_FACTORIES}, not {row_factory!r}')
+    if row_factory == 'tuple':
+        return dict.fromkeys(('students', 'instructors', 'courses'), tuple)
+    types = _ROW_TYPES[row_factory]
+    if row_factory == 'namedtuple':
+        makers = [t._make for t in types]
+    else:
+        makers = [lambda r, t=t: t(*r) for t in types]
+    return dict(zip(('students', 'instructors', 'courses'), makers))
 
 class DBStore:
     """SQLite-backed repository providing CRUD and relation-management utilities for students, instructors, and courses."""
 
-    def __init__(self, db_path: str=DB_PATH):
+    def __init__(self, db_path: str=DB_PATH, cache_size: int=DEFAULT_CACHE_SIZE, row_factory: str='dataclass'):
         '''    """  init  .
 
 Parameters:
     db_path: parameter.
+    cache_size: entries kept by the read cache in front of list_* and the relation lookups; 0 disables it.
+    row_factory: record type returned by list_*, iter_* and add_*: 'dataclass' (StudentRow, ...),
+        'namedtuple' (StudentTuple, ...; same attribute names, cheaper to build) or 'tuple'
+        (plain result tuples in column order, no attribute access).
     """'''
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
+        self.row_factory = row_factory
+        self._row = _row_makers(row_factory)
+        self.conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         self.conn.execute('PRAGMA foreign_keys = ON')
         self._init_schema()
+        self.profiler: Optional[Profiler] = None
+        self._cache = LRUCache(cache_size)
+        self._data_version = self.conn.execute(_SQL['data_version']).fetchone()[0]
+        self._version_checked = time.monotonic()
+        self._external_change = False
+        self._listeners: List[Callable[[Tuple[str, ...]], None]] = []
 
     def _init_schema(self):
         '''""" init schema.
 
 """'''
         cur = self.conn.cursor()
-        cur.execute('\n        CREATE TABLE IF NOT EXISTS students(\n            student_id TEXT PRIMARY KEY,\n            name TEXT NOT NULL,\n            age INTEGER NOT NULL CHECK(age >= 0),\n            email TEXT NOT NULL\n        )')
-        cur.execute('\n        CREATE TABLE IF NOT EXISTS instructors(\n            instructor_id TEXT PRIMARY KEY,\n            name TEXT NOT NULL,\n            age INTEGER NOT NULL CHECK(age >= 0),\n            email TEXT NOT NULL\n        )')
-        cur.execute('\n        CREATE TABLE IF NOT EXISTS courses(\n            course_id TEXT PRIMARY KEY,\n            course_name TEXT NOT NULL,\n            instructor_id TEXT,\n            FOREIGN KEY(instructor_id) REFERENCES instructors(instructor_id)\n              ON UPDATE CASCADE ON DELETE SET NULL\n        )')
-        cur.execute('\n        CREATE TABLE IF NOT EXISTS registrations(\n            student_id TEXT NOT NULL,\n            course_id  TEXT NOT NULL,\n            PRIMARY KEY(student_id, course_id),\n            FOREIGN KEY(student_id) REFERENCES students(student_id)\n              ON UPDATE CASCADE ON DELETE CASCADE,\n            FOREIGN KEY(course_id)  REFERENCES courses(course_id)\n              ON UPDATE CASCADE ON DELETE CASCADE\n        )')
+        for ddl in _SCHEMA:
+            cur.execute(ddl)
         self.conn.commit()
+        self._init_counts()
+
+    def _init_counts(self):
+        '''"""Install the materialized count columns, their indexes and the triggers maintaining them.
+
+Files created before the counts (or course capacity) existed get the columns added
+and filled from registrations/courses once, in the same IMMEDIATE transaction that
+installs the triggers, so no write can slip in between the backfill and the first
+trigger. The capacity trigger refuses any registration beyond a course's capacity.
+"""'''
+        if set(_COUNT_TRIGGERS) <= {row[0] for row in self.conn.execute(_SQL['trigger_names'])}:
+            return
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            for table, column, decl, backfill in _COUNT_COLUMNS:
+                if column not in {row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')}:
+                    self.conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {decl}')
+            for ddl in _COUNT_INDEXES + tuple(_COUNT_TRIGGERS.values()):
+                self.conn.execute(ddl)
+            for table, column, decl, backfill in _COUNT_COLUMNS:
+                if backfill:
+                    self.conn.execute(backfill)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
 
     def _check_email(self, email: str):
         '''    """ check email.
@@ -74,8 +201,7 @@ Parameters:
 Parameters:
     email: parameter.
     """'''
-        if not isinstance(email, str) or not re.match('^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$', email):
-            raise ValidationError(f'Invalid email format: {email}')
+        check_email(email)
 
     def add_student(self, name: str, age: int, email: str, student_id: str) -> StudentRow:
         '''    """Add a new student to the store or current view.
@@ -86,15 +212,13 @@ Parameters:
     email: parameter.
     student_id: parameter.
     """'''
-        if not student_id.strip():
-            raise ValidationError('Student ID cannot be empty.')
-        if not isinstance(age, int) or age < 0:
-            raise ValidationError('Age must be a non-negative integer.')
+        require_text(student_id, 'Student ID cannot be empty.')
+        check_age(age)
         self._check_email(email)
         try:
-            self.conn.execute('INSERT INTO students(student_id,name,age,email) VALUES(?,?,?,?)', (student_id, name, age, email))
-            self.conn.commit()
-            return StudentRow(student_id, name, age, email)
+            self.conn.execute(_SQL['student_insert'], (student_id, name, age, email))
+            self._commit('students')
+            return self._row['students']((student_id, name, age, email, 0))
         except sqlite3.IntegrityError:
             raise ValidationError(f"Student ID '{student_id}' already exists.")
 
@@ -104,13 +228,12 @@ Parameters:
 Parameters:
     student_id: parameter.
     """'''
-        if not isinstance(age, int) or age < 0:
-            raise ValidationError('Age must be a non-negative integer.')
+        check_age(age)
         self._check_email(email)
-        cur = self.conn.execute('UPDATE students SET name=?, age=?, email=? WHERE student_id=?', (name, age, email, student_id))
+        cur = self.conn.execute(_SQL['student_update'], (name, age, email, student_id))
         if cur.rowcount == 0:
             raise ValidationError(f"Unknown student_id '{student_id}'.")
-        self.conn.commit()
+        self._commit('students')
 
     def delete_student(self, student_id: str) -> None:
         '''    """Remove a student from the store or current view.
@@ -118,15 +241,35 @@ Parameters:
 Parameters:
     student_id: parameter.
     """'''
-        self.conn.execute('DELETE FROM students WHERE student_id=?', (student_id,))
-        self.conn.commit()
+        self.conn.execute(_SQL['student_delete'], (student_id,))
+        self._commit('students', 'registrations')
 
-    def list_students(self) -> List[StudentRow]:
-        '''"""List all students.
+    def list_students(self, after_id: Optional[str]=None, limit: Optional[int]=None, order_by: str='id', descending: bool=False, where: Optional[Filter]=None) -> List[StudentRow]:
+        '''    """List students, sorted in SQLite and optionally one keyset page at a time.
 
-"""'''
-        cur = self.conn.execute('SELECT student_id,name,age,email FROM students ORDER BY student_id')
-        return [StudentRow(*row) for row in cur.fetchall()]
+Pass the last ID of the previous page as after_id to get the next one; pages
+stay stable while rows are inserted or deleted elsewhere in the table.
+
+Parameters:
+    after_id: only students that sort after the one with this ID.
+    limit: maximum rows returned; all remaining rows when omitted.
+    order_by: one of SORT_KEYS['students']; ties are broken by ID.
+    descending: parameter.
+    where: optional Filter, compiled into the same SQL statement.
+    """'''
+        return self._list('students', after_id, limit, order_by, descending, where)
+
+    def iter_students(self, batch_size: int=FETCH_BATCH, order_by: str='id', descending: bool=False) -> Iterator[StudentRow]:
+        '''    """Stream every student without materializing the table.
+
+Parameters:
+    batch_size: rows fetched from SQLite per fetchmany() call.
+    order_by: one of SORT_KEYS['students'].
+    descending: parameter.
+    """'''
+        make = self._row['students']
+        for batch in self._batches(_SQL[self._sort_sql('students', order_by, descending)[0]], (), batch_size):
+            yield from map(make, batch)
 
     def add_instructor(self, name: str, age: int, email: str, instructor_id: str) -> InstructorRow:
         '''    """Add a new instructor to the store or current view.
@@ -137,15 +280,13 @@ Parameters:
     email: parameter.
     instructor_id: parameter.
     """'''
-        if not instructor_id.strip():
-            raise ValidationError('Instructor ID cannot be empty.')
-        if not isinstance(age, int) or age < 0:
-            raise ValidationError('Age must be a non-negative integer.')
+        require_text(instructor_id, 'Instructor ID cannot be empty.')
+        check_age(age)
         self._check_email(email)
         try:
-            self.conn.execute('INSERT INTO instructors(instructor_id,name,age,email) VALUES(?,?,?,?)', (instructor_id, name, age, email))
-            self.conn.commit()
-            return InstructorRow(instructor_id, name, age, email)
+            self.conn.execute(_SQL['instructor_insert'], (instructor_id, name, age, email))
+            self._commit('instructors')
+            return self._row['instructors']((instructor_id, name, age, email, 0))
         except sqlite3.IntegrityError:
             raise ValidationError(f"Instructor ID '{instructor_id}' already exists.")
 
@@ -155,13 +296,12 @@ Parameters:
 Parameters:
     instructor_id: parameter.
     """'''
-        if not isinstance(age, int) or age < 0:
-            raise ValidationError('Age must be a non-negative integer.')
+        check_age(age)
         self._check_email(email)
-        cur = self.conn.execute('UPDATE instructors SET name=?, age=?, email=? WHERE instructor_id=?', (name, age, email, instructor_id))
+        cur = self.conn.execute(_SQL['instructor_update'], (name, age, email, instructor_id))
         if cur.rowcount == 0:
             raise ValidationError(f"Unknown instructor_id '{instructor_id}'.")
-        self.conn.commit()
+        self._commit('instructors')
 
     def delete_instructor(self, instructor_id: str) -> None:
         '''    """Remove an instructor from the store or current view.
@@ -169,31 +309,51 @@ Parameters:
 Parameters:
     instructor_id: parameter.
     """'''
-        self.conn.execute('DELETE FROM instructors WHERE instructor_id=?', (instructor_id,))
-        self.conn.commit()
+        self.conn.execute(_SQL['instructor_delete'], (instructor_id,))
+        self._commit('instructors', 'courses')
 
-    def list_instructors(self) -> List[InstructorRow]:
-        '''"""List all instructors.
+    def list_instructors(self, after_id: Optional[str]=None, limit: Optional[int]=None, order_by: str='id', descending: bool=False, where: Optional[Filter]=None) -> List[InstructorRow]:
+        '''    """List instructors, sorted in SQLite and optionally one keyset page at a time.
 
-"""'''
-        cur = self.conn.execute('SELECT instructor_id,name,age,email FROM instructors ORDER BY instructor_id')
-        return [InstructorRow(*row) for row in cur.fetchall()]
+Pass the last ID of the previous page as after_id to get the next one; pages
+stay stable while rows are inserted or deleted elsewhere in the table.
 
-    def add_course(self, course_id: str, course_name: str) -> CourseRow:
+Parameters:
+    after_id: only instructors that sort after the one with this ID.
+    limit: maximum rows returned; all remaining rows when omitted.
+    order_by: one of SORT_KEYS['instructors']; ties are broken by ID.
+    descending: parameter.
+    where: optional Filter, compiled into the same SQL statement.
+    """'''
+        return self._list('instructors', after_id, limit, order_by, descending, where)
+
+    def iter_instructors(self, batch_size: int=FETCH_BATCH, order_by: str='id', descending: bool=False) -> Iterator[InstructorRow]:
+        '''    """Stream every instructor without materializing the table.
+
+Parameters:
+    batch_size: rows fetched from SQLite per fetchmany() call.
+    order_by: one of SORT_KEYS['instructors'].
+    descending: parameter.
+    """'''
+        make = self._row['instructors']
+        for batch in self._batches(_SQL[self._sort_sql('instructors', order_by, descending)[0]], (), batch_size):
+            yield from map(make, batch)
+
+    def add_course(self, course_id: str, course_name: str, capacity: Optional[int]=None) -> CourseRow:
         '''    """Create a course record.
 
 Parameters:
     course_id: parameter.
     course_name: parameter.
+    capacity: maximum number of enrolled students; None for unlimited.
     """'''
-        if not course_id.strip():
-            raise ValidationError('Course ID cannot be empty.')
-        if not course_name.strip():
-            raise ValidationError('Course name cannot be empty.')
+        require_text(course_id, 'Course ID cannot be empty.')
+        require_text(course_name, 'Course name cannot be empty.')
+        check_capacity(capacity)
         try:
-            self.conn.execute('INSERT INTO courses(course_id,course_name) VALUES(?,?)', (course_id, course_name))
-            self.conn.commit()
-            return CourseRow(course_id, course_name, None)
+            self.conn.execute(_SQL['course_insert'], (course_id, course_name, capacity))
+            self._commit('courses')
+            return self._row['courses']((course_id, course_name, None, 0, capacity))
         except sqlite3.IntegrityError:
             raise ValidationError(f"Course ID '{course_id}' already exists.")
 
@@ -204,12 +364,31 @@ Parameters:
     course_id: parameter.
     course_name: parameter.
     """'''
-        if not course_name.strip():
-            raise ValidationError('Course name cannot be empty.')
-        cur = self.conn.execute('UPDATE courses SET course_name=? WHERE course_id=?', (course_name, course_id))
+        require_text(course_name, 'Course name cannot be empty.')
+        cur = self.conn.execute(_SQL['course_rename'], (course_name, course_id))
         if cur.rowcount == 0:
             raise ValidationError(f"Unknown course_id '{course_id}'.")
-        self.conn.commit()
+        self._commit('courses')
+
+    def set_course_capacity(self, course_id: str, capacity: Optional[int]) -> None:
+        '''    """Change how many students a course can hold.
+
+One conditional UPDATE: a capacity below the current enrollment is refused
+rather than leaving the course overbooked.
+
+Parameters:
+    course_id: parameter.
+    capacity: maximum number of enrolled students; None for unlimited.
+    """'''
+        check_capacity(capacity)
+        with self._savepoint():
+            cur = self.conn.execute(_SQL['course_capacity'], (capacity, course_id))
+            if cur.rowcount == 0:
+                row = self.conn.execute(_SQL['course_enrolled'], (course_id,)).fetchone()
+                if row is None:
+                    raise ValidationError(f"Unknown course_id '{course_id}'.")
+                raise ValidationError(f"Capacity {capacity} is below the {row[0]} already enrolled in '{course_id}'.")
+        self._commit('courses')
 
     def delete_course(self, course_id: str) -> None:
         '''    """Delete a course record.
@@ -217,29 +396,53 @@ Parameters:
 Parameters:
     course_id: parameter.
     """'''
-        self.conn.execute('DELETE FROM courses WHERE course_id=?', (course_id,))
-        self.conn.commit()
+        self.conn.execute(_SQL['course_delete'], (course_id,))
+        self._commit('courses', 'registrations')
 
-    def list_courses(self) -> List[CourseRow]:
-        '''"""List all courses.
+    def list_courses(self, after_id: Optional[str]=None, limit: Optional[int]=None, order_by: str='id', descending: bool=False, where: Optional[Filter]=None) -> List[CourseRow]:
+        '''    """List courses, sorted in SQLite and optionally one keyset page at a time.
 
-"""'''
-        cur = self.conn.execute('SELECT course_id,course_name,instructor_id FROM courses ORDER BY course_id')
-        return [CourseRow(*row) for row in cur.fetchall()]
+Pass the last ID of the previous page as after_id to get the next one; pages
+stay stable while rows are inserted or deleted elsewhere in the table.
+
+Parameters:
+    after_id: only courses that sort after the one with this ID.
+    limit: maximum rows returned; all remaining rows when omitted.
+    order_by: one of SORT_KEYS['courses']; ties are broken by ID.
+    descending: parameter.
+    where: optional Filter, compiled into the same SQL statement.
+    """'''
+        return self._list('courses', after_id, limit, order_by, descending, where)
+
+    def iter_courses(self, batch_size: int=FETCH_BATCH, order_by: str='id', descending: bool=False) -> Iterator[CourseRow]:
+        '''    """Stream every course without materializing the table.
+
+Parameters:
+    batch_size: rows fetched from SQLite per fetchmany() call.
+    order_by: one of SORT_KEYS['courses'].
+    descending: parameter.
+    """'''
+        make = self._row['courses']
+        for batch in self._batches(_SQL[self._sort_sql('courses', order_by, descending)[0]], (), batch_size):
+            yield from map(make, batch)
 
     def assign_instructor_to_course(self, instructor_id: str, course_id: str) -> None:
         '''    """Assign an instructor to a course.
 
+One UPDATE; the courses.instructor_id foreign key rejects unknown instructors.
+
 Parameters:
     instructor_id: parameter.
     course_id: parameter.
     """'''
-        if not self._exists('instructors', 'instructor_id', instructor_id):
-            raise ValidationError(f"Unknown instructor_id '{instructor_id}'.")
-        if not self._exists('courses', 'course_id', course_id):
-            raise ValidationError(f"Unknown course_id '{course_id}'.")
-        self.conn.execute('UPDATE courses SET instructor_id=? WHERE course_id=?', (instructor_id, course_id))
-        self.conn.commit()
+        with self._savepoint():
+            try:
+                cur = self.conn.execute(_SQL['assign'], (instructor_id, course_id))
+            except sqlite3.IntegrityError as e:
+                self._integrity_error(e, 'assign_check', 'instructor_id', instructor_id, course_id)
+            if cur.rowcount == 0:
+                self._raise_unknown('assign_check', 'instructor_id', instructor_id, course_id)
+        self._commit('courses')
 
     def unassign_instructor_from_course(self, course_id: str) -> None:
         '''    """Unassign the instructor from a course.
@@ -247,25 +450,52 @@ Parameters:
 Parameters:
     course_id: parameter.
     """'''
-        self.conn.execute('UPDATE courses SET instructor_id=NULL WHERE course_id=?', (course_id,))
-        self.conn.commit()
+        self.conn.execute(_SQL['course_unassign'], (course_id,))
+        self._commit('courses')
 
     def enroll_student_in_course(self, student_id: str, course_id: str) -> None:
         '''    """Register a student into a course.
 
+One INSERT; the registrations primary key and foreign keys do the checking.
+
 Parameters:
     student_id: parameter.
     course_id: parameter.
     """'''
-        if not self._exists('students', 'student_id', student_id):
-            raise ValidationError(f"Unknown student_id '{student_id}'.")
-        if not self._exists('courses', 'course_id', course_id):
+        with self._savepoint():
+            try:
+                self.conn.execute(_SQL['enroll'], (student_id, course_id))
+            except sqlite3.IntegrityError as e:
+                self._integrity_error(e, 'enroll_check', 'student_id', student_id, course_id, f"Student '{student_id}' already enrolled in '{course_id}'.")
+        self._commit('registrations')
+
+    def enroll_many(self, student_ids: Iterable[str], course_id: str) -> int:
+        '''    """Enroll a whole class in one statement; all-or-nothing on unknown IDs and on capacity.
+
+Students already in the course are skipped. Returns the number of new registrations.
+An unknown course is refused even when student_ids is empty.
+
+Parameters:
+    student_ids: parameter.
+    course_id: parameter.
+    """'''
+        if not self.conn.execute(_SQL['course_exists'], (course_id,)).fetchone()[0]:
             raise ValidationError(f"Unknown course_id '{course_id}'.")
+        ids = json.dumps(list(student_ids))
         try:
-            self.conn.execute('INSERT INTO registrations(student_id,course_id) VALUES(?,?)', (student_id, course_id))
-            self.conn.commit()
-        except sqlite3.IntegrityError:
-            raise ValidationError(f"Student '{student_id}' already enrolled in '{course_id}'.")
+            with self._savepoint():
+                cur = self.conn.execute(_SQL['enroll_many'], (ids, course_id))
+        except sqlite3.IntegrityError as e:
+            if COURSE_FULL in str(e):
+                raise ValidationError(f"Course '{course_id}' has fewer free seats than new students.") from None
+            if 'FOREIGN KEY' not in str(e):
+                raise ValidationError(str(e))
+            bad = [row[0] for row in self.conn.execute(_SQL['unknown_students'], (ids,))]
+            if len(bad) == 1:
+                raise ValidationError(f"Unknown student_id '{bad[0]}'.")
+            raise ValidationError('Unknown student_ids: ' + ', '.join((f"'{b}'" for b in bad)) + '.')
+        self._commit('registrations')
+        return cur.rowcount
 
     def drop_student_from_course(self, student_id: str, course_id: str) -> None:
         '''    """Unenroll a student from a course.
@@ -274,10 +504,10 @@ Parameters:
     student_id: parameter.
     course_id: parameter.
     """'''
-        cur = self.conn.execute('DELETE FROM registrations WHERE student_id=? AND course_id=?', (student_id, course_id))
+        cur = self.conn.execute(_SQL['registration_delete'], (student_id, course_id))
         if cur.rowcount == 0:
             raise ValidationError(f"Student '{student_id}' is not enrolled in '{course_id}'.")
-        self.conn.commit()
+        self._commit('registrations')
 
     def course_students(self, course_id: str) -> List[str]:
         '''    """Return student IDs for a given course.
@@ -285,8 +515,7 @@ Parameters:
 Parameters:
     course_id: parameter.
     """'''
-        cur = self.conn.execute('SELECT r.student_id FROM registrations r WHERE r.course_id=? ORDER BY r.student_id', (course_id,))
-        return [row[0] for row in cur.fetchall()]
+        return self._cached('course_students', (course_id,), ('registrations',))
 
     def student_courses(self, student_id: str) -> List[str]:
         '''    """Return course IDs for a given student.
@@ -294,44 +523,460 @@ Parameters:
 Parameters:
     student_id: parameter.
     """'''
-        cur = self.conn.execute('SELECT r.course_id FROM registrations r WHERE r.student_id=? ORDER BY r.course_id', (student_id,))
-        return [row[0] for row in cur.fetchall()]
+        return self._cached('student_courses', (student_id,), ('registrations',))
+
+    def instructor_courses(self, instructor_id: str) -> List[str]:
+        '''    """Return course IDs taught by a given instructor.
+
+Parameters:
+    instructor_id: parameter.
+    """'''
+        return self._cached('instructor_courses', (instructor_id,), ('courses',))
+
+    def search_ids(self, table: str, prefix: str='', limit: int=50) -> List[str]:
+        '''    """IDs starting with prefix, in ID order, for type-ahead pickers.
+
+Runs as a primary-key range scan, so cost depends on limit, not table size.
+
+Parameters:
+    table: 'students', 'instructors' or 'courses'.
+    prefix: case-sensitive ID prefix; '' lists from the start.
+    limit: parameter.
+    """'''
+        if table not in _ID_PREFIX_SQL:
+            raise ValidationError(f"Unknown table '{table}'.")
+        return self._cached(_ID_PREFIX_SQL[table], (prefix, prefix + '\U0010ffff', limit), (table,))
+
+    def search_keys(self, table: str) -> SearchKeys:
+        '''    """Normalized search keys for every row of table, rebuilt only after the table or its relations change.
+
+Parameters:
+    table: 'students', 'instructors' or 'courses'.
+    """'''
+        name, tables = _SEARCH_KEYS[table]
+        self._check_data_version()
+        return self._cache.get_or_load(('search_keys', table), tables, lambda: SearchKeys(self.conn.execute(_SQL[name])))
+
+    def match_ids(self, table: str, query: str, token_prefix: bool=False) -> Set[str]:
+        '''    """IDs of the rows whose fields (or related IDs) contain query, accent- and case-insensitively.
+
+Parameters:
+    table: 'students', 'instructors' or 'courses'.
+    query: parameter.
+    token_prefix: match query words against word starts instead of as one substring.
+    """'''
+        return self.search_keys(table).match(query, token_prefix)
+
+    @contextmanager
+    def _savepoint(self) -> Iterator[None]:
+        '''"""Run a relation write under a SAVEPOINT so a refusal undoes only that write.
+
+Work the caller has not committed yet stays pending. When no transaction was
+open, releasing the savepoint ends the one it started, so a refused write
+never leaves the connection holding the database write lock.
+"""'''
+        self.conn.execute(_SQL['savepoint'])
+        try:
+            yield
+        except BaseException:
+            self.conn.execute(_SQL['savepoint_rollback'])
+            raise
+        finally:
+            self.conn.execute(_SQL['savepoint_release'])
+
+    def _commit(self, *tables: str) -> None:
+        '''    """Commit and invalidate cached reads of the tables the write touched.
+
+Parameters:
+    tables: parameter.
+    """'''
+        self.conn.commit()
+        self.notify_changed(*tables)
+
+    def notify_changed(self, *tables: str) -> None:
+        '''    """Invalidate cached reads of tables and tell subscribers they changed.
+
+Every write method calls this after its commit; code that commits its own
+statements on conn (such as RegistrationEngine) calls it the same way.
+
+Parameters:
+    tables: parameter.
+    """'''
+        self._cache.invalidate(tables)
+        for listener in list(self._listeners):
+            listener(tables)
+
+    def subscribe(self, listener: Callable[[Tuple[str, ...]], None]) -> Callable[[], None]:
+        '''    """Call listener(tables) after every committed write through this store.
+
+Commits by other connections or processes are reported with every table once
+poll_changes() notices them. Returns a function that unsubscribes.
+
+Parameters:
+    listener: receives the tuple of table names the write touched.
+    """'''
+        self._listeners.append(listener)
+
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return unsubscribe
+
+    def poll_changes(self) -> bool:
+        '''"""Check PRAGMA data_version now and notify subscribers if another connection committed.
+
+Cheap enough to call from a file watcher or timer; returns True when something changed.
+"""'''
+        self._check_data_version(force=True)
+        if not self._external_change:
+            return False
+        self._external_change = False
+        for listener in list(self._listeners):
+            listener(TABLES)
+        return True
+
+    def _sort_sql(self, table: str, order_by: str, descending: bool) -> Tuple[str, str, str]:
+        '''    """Registry keys for a sort order, rejecting keys outside the whitelist.
+
+Parameters:
+    table: parameter.
+    order_by: parameter.
+    descending: parameter.
+    """'''
+        if order_by not in SORT_KEYS.get(table, ()):
+            raise ValidationError(f"Cannot sort {table} by '{order_by}'.")
+        return _SORT_SQL[table, order_by, bool(descending)]
+
+    def _list(self, table: str, after_id: Optional[str], limit: Optional[int], order_by: str, descending: bool, where: Optional[Filter]=None) -> list:
+        '''    """Shared body of list_students/list_instructors/list_courses.
 
-    def _exists(self, table: str, col: str, value: str) -> bool:
-        '''    """ exists.
+A filter is compiled into the same statement as the sort order and keyset
+condition, with its values bound from ?3 on after after_id (?1) and limit (?2).
 
 Parameters:
     table: parameter.
-    col: parameter.
-    value: parameter.
+    after_id: parameter.
+    limit: parameter.
+    order_by: parameter.
+    descending: parameter.
+    where: optional Filter; None or an empty Filter lists every row.
+    """'''
+        full, first, after = self._sort_sql(table, order_by, descending)
+        reads = _LIST_READS[table]
+        params = (after_id, -1 if limit is None else limit)
+        if where is not None and where.active():
+            cond, values, filter_reads = compile_filter(table, where, first_param=3)
+            select, order, after_cond = _sort_parts(table, order_by, descending)
+            if after_id is not None:
+                cond = f'({cond}) AND {after_cond}'
+            sql = f'{select} WHERE {cond} ORDER BY {order} LIMIT ?2'
+            return self._query(('filter', sql, params + values), sql, params + values, tuple(filter_reads.union(reads)), self._row[table])
+        if after_id is None and limit is None:
+            return self._cached(full, (), reads, self._row[table])
+        return self._cached(first if after_id is None else after, params, reads, self._row[table])
+
+    def _cached(self, name: str, params: Tuple, tables: Tuple[str, ...], row: Optional[Callable[[tuple], Any]]=None) -> list:
+        '''    """Run registry statement name through the read cache.
+
+Returns a fresh list each call so callers may modify it.
+
+Parameters:
+    name: registry key.
+    params: parameter.
+    tables: tables the statement reads.
+    row: maker applied to each row (see _row_makers); single-column results are returned as scalars when omitted.
     """'''
-        cur = self.conn.execute(f'SELECT 1 FROM {table} WHERE {col}=? LIMIT 1', (value,))
-        return cur.fetchone() is not None
+        return self._query((name, params), _SQL[name], params, tables, row)
+
+    def _query(self, key: Hashable, sql: str, params: Tuple, tables: Tuple[str, ...], row: Optional[Callable[[tuple], Any]]=None) -> list:
+        '''    """Run sql through the read cache under key (used directly for statements composed at run time).
+
+Parameters:
+    key: cache key.
+    sql: parameter.
+    params: parameter.
+    tables: tables the statement reads.
+    row: parameter.
+    """'''
+        self._check_data_version()
+
+        def load():
+            rows = self.conn.execute(sql, params).fetchall()
+            return list(map(row, rows)) if row is not None else [r[0] for r in rows]
+        return list(self._cache.get_or_load(key, tables, load))
+
+    def _batches(self, sql: str, params: Tuple, batch_size: int=FETCH_BATCH) -> Iterator[List[tuple]]:
+        '''    """Yield result rows of sql in fetchmany() batches of at most batch_size.
+
+Parameters:
+    sql: parameter.
+    params: parameter.
+    batch_size: parameter.
+    """'''
+        cur = self.conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+    def _check_data_version(self, force: bool=False) -> None:
+        '''    """Drop the cache when another connection has committed (checked at most every CACHE_CHECK_INTERVAL s).
+
+Parameters:
+    force: check regardless of the interval.
+    """'''
+        now = time.monotonic()
+        if not force and now - self._version_checked < CACHE_CHECK_INTERVAL:
+            return
+        self._version_checked = now
+        version = self.conn.execute(_SQL['data_version']).fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._external_change = True
+            self._cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        '''"""Read-cache hit/miss counters and size.
+
+"""'''
+        return self._cache.info()
+
+    def invalidate_cache(self) -> None:
+        '''"""Forget every cached read.
+
+"""'''
+        self._cache.clear()
+
+    def _integrity_error(self, e: sqlite3.IntegrityError, check: str, label: str, ref_id: str, course_id: str, duplicate: str='') -> None:
+        '''    """Turn a constraint failure from a relation write into a ValidationError.
+
+Parameters:
+    e: the error raised by SQLite.
+    check: registry key of the two-EXISTS lookup used to name the missing reference.
+    label: parameter.
+    ref_id: parameter.
+    course_id: parameter.
+    duplicate: message for a primary-key (UNIQUE) conflict.
+    """'''
+        msg = str(e)
+        if COURSE_FULL in msg:
+            raise ValidationError(f"Course '{course_id}' is full.") from None
+        if duplicate and 'UNIQUE' in msg:
+            raise ValidationError(duplicate) from None
+        if 'FOREIGN KEY' in msg:
+            self._raise_unknown(check, label, ref_id, course_id)
+        raise ValidationError(msg) from None
+
+    def _raise_unknown(self, check: str, label: str, ref_id: str, course_id: str) -> None:
+        '''    """Name the missing reference behind a failed relation write; only runs on the failure path.
+
+Parameters:
+    check: registry key of the two-EXISTS lookup for (ref_id, course_id).
+    label: column name used in the message for ref_id.
+    ref_id: student or instructor id.
+    course_id: parameter.
+    """'''
+        ref_ok, course_ok = self.conn.execute(_SQL[check], (ref_id, course_id)).fetchone()
+        if not ref_ok:
+            raise ValidationError(f"Unknown {label} '{ref_id}'.")
+        if not course_ok:
+            raise ValidationError(f"Unknown course_id '{course_id}'.")
+
+    def bulk_upsert_students(self, rows: Iterable[Tuple[str, str, int, str]]) -> int:
+        '''    """Insert or update many pre-validated students in one transaction.
+
+Parameters:
+    rows: (student_id, name, age, email) tuples, e.g. from validators.validate_batch.
+    """'''
+        with self.conn:
+            cur = self.conn.executemany(_SQL['students_upsert'], rows)
+        self.notify_changed('students')
+        return cur.rowcount
+
+    def bulk_upsert_instructors(self, rows: Iterable[Tuple[str, str, int, str]]) -> int:
+        '''    """Insert or update many pre-validated instructors in one transaction.
+
+Parameters:
+    rows: (instructor_id, name, age, email) tuples.
+    """'''
+        with self.conn:
+            cur = self.conn.executemany(_SQL['instructors_upsert'], rows)
+        self.notify_changed('instructors')
+        return cur.rowcount
+
+    def bulk_upsert_courses(self, rows: Iterable[Tuple[str, str]]) -> int:
+        '''    """Insert or rename many pre-validated courses in one transaction.
+
+Parameters:
+    rows: (course_id, course_name) tuples.
+    """'''
+        with self.conn:
+            cur = self.conn.executemany(_SQL['courses_upsert'], rows)
+        self.notify_changed('courses')
+        return cur.rowcount
+
+    def bulk_assign(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        '''    """Assign instructors to courses in one transaction, skipping unknown IDs.
+
+Parameters:
+    pairs: (instructor_id, course_id) tuples.
+    """'''
+        with self.conn:
+            cur = self.conn.executemany(_SQL['assign_if_exists'], pairs)
+        self.notify_changed('courses')
+        return cur.rowcount
+
+    def bulk_enroll(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        '''    """Enroll many students in one transaction, skipping unknown IDs, full courses and existing registrations.
+
+Parameters:
+    pairs: (student_id, course_id) tuples.
+    """'''
+        with self.conn:
+            cur = self.conn.executemany(_SQL['enroll_if_exists'], pairs)
+        self.notify_changed('registrations')
+        return cur.rowcount
+
+    def bulk_set_capacity(self, pairs: Iterable[Tuple[str, Optional[int]]]) -> int:
+        '''    """Set many course capacities in one transaction, skipping unknown IDs and capacities below the current enrollment.
+
+Parameters:
+    pairs: (course_id, capacity) tuples; capacity None for unlimited.
+    """'''
+        pairs = [(check_capacity(capacity), course_id) for course_id, capacity in pairs]
+        with self.conn:
+            cur = self.conn.executemany(_SQL['course_capacity'], pairs)
+        self.notify_changed('courses')
+        return cur.rowcount
+
+    def iter_export(self, section: str) -> Iterator[Dict[str, object]]:
+        '''    """Stream one to_dict() section row by row, relations included, in a single query.
+
+Parameters:
+    section: 'students', 'instructors' or 'courses'.
+    """'''
+        keys = EXPORT_KEYS[section]
+        for batch in self._batches(_EXPORT_SQL[section], ()):
+            for row in batch:
+                rec = dict(zip(keys, row))
+                rec[keys[-1]] = json.loads(row[-1])
+                yield rec
 
     def to_dict(self):
         '''"""To dict.
 
 """'''
-        return {'students': [{'student_id': s.student_id, 'name': s.name, 'age': s.age, 'email': s.email, 'courses': self.student_courses(s.student_id)} for s in self.list_students()], 'instructors': [{'instructor_id': i.instructor_id, 'name': i.name, 'age': i.age, 'email': i.email, 'courses': [c.course_id for c in self.list_courses() if c.instructor_id == i.instructor_id]} for i in self.list_instructors()], 'courses': [{'course_id': c.course_id, 'course_name': c.course_name, 'instructor_id': c.instructor_id, 'students': self.course_students(c.course_id)} for c in self.list_courses()]}
+        return {section: list(self.iter_export(section)) for section in EXPORT_KEYS}
 
     def dump_json(self, path: str) -> None:
         '''    """Dump json.
 
+Streams each record to the file instead of materializing to_dict(); the
+output is identical to json.dump(self.to_dict(), f, indent=2).
+
 Parameters:
     path: parameter.
     """'''
-        data = self.to_dict()
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write('{')
+            for n, section in enumerate(EXPORT_KEYS):
+                f.write((',' if n else '') + f'\n  "{section}": [')
+                sep = '\n    '
+                for rec in self.iter_export(section):
+                    f.write(sep + json.dumps(rec, ensure_ascii=False, indent=2).replace('\n', '\n    '))
+                    sep = ',\n    '
+                f.write(']' if sep == '\n    ' else '\n  ]')
+            f.write('\n}')
+
+    def export_csv(self, folder: str) -> None:
+        '''    """Write students.csv, instructors.csv and courses.csv by streaming one query per file.
+
+Parameters:
+    folder: destination directory.
+    """'''
+        for section, header in _CSV_HEADERS.items():
+            with open(f'{folder}/{section}.csv', 'w', newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(header)
+                for rec in self.iter_export(section):
+                    vals = list(rec.values())
+                    w.writerow([v if v is not None else '' for v in vals[:-1]] + [';'.join(vals[-1])])
+
+    def counts(self) -> Dict[str, int]:
+        '''"""Row count per table.
+
+"""'''
+        return {t: self.conn.execute(_SQL['count_' + t]).fetchone()[0] for t in ('students', 'instructors', 'courses', 'registrations')}
+
+    def storage_info(self) -> Dict[str, int]:
+        '''"""Page-level storage figures for the database file.
+
+"""'''
+        page_size = self.conn.execute(_SQL['page_size']).fetchone()[0]
+        page_count = self.conn.execute(_SQL['page_count']).fetchone()[0]
+        free = self.conn.execute(_SQL['freelist_count']).fetchone()[0]
+        return {'page_size': page_size, 'page_count': page_count, 'freelist_count': free, 'size_bytes': page_size * page_count}
+
+    def vacuum(self) -> None:
+        '''"""Rebuild the database file and refresh planner statistics.
+
+"""'''
+        self.conn.commit()
+        self.conn.execute(_SQL['vacuum'])
+        self.conn.execute(_SQL['optimize'])
 
     def backup_db(self, dest_path: str) -> None:
-        '''    """Create a file copy of the SQLite database.
+        '''    """Create a consistent copy of the SQLite database using the online backup API.
 
 Parameters:
     dest_path: parameter.
     """'''
         self.conn.commit()
-        shutil.copyfile(self.db_path, dest_path)
+        dest = sqlite3.connect(dest_path)
+        try:
+            self.conn.backup(dest)
+        finally:
+            dest.close()
+
+    def enable_profiling(self, slow_ms: float=50.0, explain: bool=True, sinks: Iterable[Sink]=()) -> Profiler:
+        '''    """Route every statement through a timing proxy until disable_profiling().
+
+While disabled self.conn is the plain sqlite3 connection, so there is no
+per-call cost. Calling this again keeps the collected statistics and only
+updates the settings.
+
+Parameters:
+    slow_ms: statements at or above this wall time go to the sinks.
+    explain: capture EXPLAIN QUERY PLAN the first time a SELECT is slow.
+    sinks: callables receiving slow-statement events, e.g. db_profiler.LoggingSink().
+    """'''
+        if self.profiler is None:
+            self.profiler = Profiler(self.conn, slow_ms, explain, sinks)
+            self.conn = ProfilingConnection(self.conn, self.profiler)
+        else:
+            self.profiler.slow_ms = slow_ms
+            self.profiler.explain = explain
+            self.profiler.sinks = list(sinks)
+        return self.profiler
+
+    def disable_profiling(self) -> Optional[Profiler]:
+        '''"""Restore the raw connection and return the profiler with its final statistics.
+
+"""'''
+        prof = self.profiler
+        if prof is not None:
+            self.conn = prof.raw
+            self.profiler = None
+        return prof
+
+    def stats(self) -> Dict[str, object]:
+        '''"""Per-statement counts, latency histograms, rows and captured plans (slowest first).
+
+"""'''
+        if self.profiler is None:
+            return {'enabled': False, 'queries': 0, 'total_ms': 0.0, 'statements': []}
+        return self.profiler.snapshot()
 
     def close(self):
         '''"""Close.
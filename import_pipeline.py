@@ -0,0 +1,236 @@
+'''"""
+Parallel Import Pipeline — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- parse_shard: read and validate one JSON or CSV shard (runs inside worker processes)
+- run_import: fan shards out to a ProcessPoolExecutor and funnel accepted rows to one DBStore writer
+- ImportReport: throughput, accepted/rejected counts and the first rejected rows
+"""'''
+from __future__ import annotations
+import csv, json, os, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from db_store import DBStore, DB_PATH
+from validators import validate_batch
+MAX_REPORTED_REJECTS = 1000
+_LIST_KEYS = {'student': ('courses', 'registered_course_ids'), 'instructor': ('courses', 'assigned_course_ids'), 'course': ('students', 'enrolled_student_ids')}
+_SECTION_KINDS = (('students', 'student'), ('instructors', 'instructor'), ('courses', 'course'))
+
+@dataclass
+class ShardResult:
+    """Validated content of one shard, ready for the single writer."""
+    path: str
+    students: List[Tuple[str, str, int, str]] = field(default_factory=list)
+    instructors: List[Tuple[str, str, int, str]] = field(default_factory=list)
+    courses: List[Tuple[str, str]] = field(default_factory=list)
+    assignments: List[Tuple[str, str]] = field(default_factory=list)
+    enrollments: List[Tuple[str, str]] = field(default_factory=list)
+    rows_read: int = 0
+    rejects: List[Dict[str, Any]] = field(default_factory=list)
+    rejected: int = 0
+    error: Optional[str] = None
+
+@dataclass
+class ImportReport:
+    """Summary of one run_import call."""
+    files: int = 0
+    rows_read: int = 0
+    rows_written: int = 0
+    rejected: int = 0
+    relations_applied: int = 0
+    relations_skipped: int = 0
+    elapsed: float = 0.0
+    rejects: List[Dict[str, Any]] = field(default_factory=list)
+    failed_files: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def rows_per_sec(self) -> float:
+        '''"""Rows read per second of wall time.
+
+"""'''
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''"""JSON-serializable form of the report.
+
+"""'''
+        return {'files': self.files, 'rows_read': self.rows_read, 'rows_written': self.rows_written, 'rejected': self.rejected, 'relations_applied': self.relations_applied, 'relations_skipped': self.relations_skipped, 'elapsed_s': round(self.elapsed, 4), 'rows_per_sec': round(self.rows_per_sec, 1), 'failed_files': self.failed_files, 'rejects': self.rejects}
+
+def _id_list(value: Any) -> List[str]:
+    '''    """Normalize a relation column (JSON list or ';'-separated CSV cell) to IDs.
+
+Parameters:
+    value: parameter.
+    """'''
+    if isinstance(value, str):
+        value = value.split(';')
+    if not isinstance(value, list):
+        return []
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+def _csv_kind(header: Sequence[str]) -> Optional[str]:
+    '''    """Infer the record kind of a CSV shard from its header row.
+
+Parameters:
+    header: parameter.
+    """'''
+    cols = set(header)
+    for kind in ('student', 'instructor', 'course'):
+        if f'{kind}_id' in cols and (kind == 'course' or 'email' in cols):
+            return kind
+    return None
+
+def _read_sections(path: str) -> Dict[str, List[Any]]:
+    '''    """Load a shard into {'students': [...], 'instructors': [...], 'courses': [...]}.
+
+Accepts DBStore.dump_json files, DataStore.save_all files (a bare list)
+and the CSV files written by the Export CSV buttons.
+
+Parameters:
+    path: parameter.
+    """'''
+    sections: Dict[str, List[Any]] = {'students': [], 'instructors': [], 'courses': []}
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            kind = _csv_kind(reader.fieldnames or [])
+            if kind is None:
+                raise ValueError('Unrecognized CSV header.')
+            sections[kind + 's'] = list(reader)
+        return sections
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for key, _kind in _SECTION_KINDS:
+            sections[key] = data.get(key, []) or []
+    elif isinstance(data, list) and data and isinstance(data[0], dict):
+        for key, kind in _SECTION_KINDS:
+            if f'{kind}_id' in data[0] and (kind == 'course' or 'email' in data[0]):
+                sections[key] = data
+                break
+    return sections
+
+def parse_shard(path: str) -> ShardResult:
+    '''    """Parse and validate one shard; safe to run in a worker process.
+
+Parameters:
+    path: JSON or CSV file.
+    """'''
+    res = ShardResult(path)
+    try:
+        sections = _read_sections(path)
+    except (OSError, ValueError) as e:
+        res.error = str(e)
+        return res
+    for key, kind in _SECTION_KINDS:
+        records = sections[key]
+        res.rows_read += len(records)
+        report = validate_batch(records, kind)
+        bad = report.rejected_rows()
+        res.rejected += len(bad)
+        for e in report.errors[:MAX_REPORTED_REJECTS - len(res.rejects)]:
+            res.rejects.append({'file': path, 'kind': kind, 'row': e.row, 'field': e.field, 'code': e.code})
+        id_field = f'{kind}_id'
+        for n, r in enumerate(records):
+            if n in bad:
+                continue
+            rid = r[id_field].strip()
+            related = []
+            for k in _LIST_KEYS[kind]:
+                related.extend(_id_list(r.get(k)))
+            if kind == 'student':
+                res.students.append((rid, r['name'].strip(), int(r['age']), r['email']))
+                res.enrollments.extend(((rid, cid) for cid in related))
+            elif kind == 'instructor':
+                res.instructors.append((rid, r['name'].strip(), int(r['age']), r['email']))
+                res.assignments.extend(((rid, cid) for cid in related))
+            else:
+                res.courses.append((rid, r['course_name'].strip()))
+                ins = r.get('instructor_id')
+                if isinstance(ins, str) and ins.strip():
+                    res.assignments.append((ins.strip(), rid))
+                res.enrollments.extend(((sid, rid) for sid in related))
+    return res
+
+def _shard_paths(paths: Iterable[str]) -> List[str]:
+    '''    """Expand directories into their *.json / *.csv files.
+
+Parameters:
+    paths: parameter.
+    """'''
+    out: List[str] = []
+    for p in paths:
+        pp = Path(p)
+        if pp.is_dir():
+            out.extend(sorted((str(f) for f in pp.iterdir() if f.suffix.lower() in ('.json', '.csv'))))
+        else:
+            out.append(str(pp))
+    return out
+
+def run_import(paths: Iterable[str], db: Optional[DBStore]=None, *, db_path: str=DB_PATH, workers: Optional[int]=None) -> ImportReport:
+    '''    """Import many shards: parse/validate in parallel, write through one DBStore.
+
+Entities are written as each shard finishes; assignments and enrollments are
+buffered and applied after every shard is in, so references may cross shards.
+
+Parameters:
+    paths: shard files or directories containing them.
+    db: open DBStore to write to (opened from db_path when omitted).
+    db_path: parameter.
+    workers: worker processes (defaults to os.cpu_count(); 0 or 1 parses inline).
+    """'''
+    start = time.perf_counter()
+    files = _shard_paths(paths)
+    report = ImportReport(files=len(files))
+    own_db = db is None
+    if own_db:
+        db = DBStore(db_path)
+    assignments: List[Tuple[str, str]] = []
+    enrollments: List[Tuple[str, str]] = []
+
+    def consume(res: ShardResult) -> None:
+        '''    """Write one shard's entities and keep its relations for later.
+
+Parameters:
+    res: parameter.
+    """'''
+        if res.error:
+            report.failed_files[res.path] = res.error
+            return
+        report.rows_read += res.rows_read
+        report.rejected += res.rejected
+        report.rejects.extend(res.rejects[:MAX_REPORTED_REJECTS - len(report.rejects)])
+        db.bulk_upsert_students(res.students)
+        db.bulk_upsert_instructors(res.instructors)
+        db.bulk_upsert_courses(res.courses)
+        report.rows_written += len(res.students) + len(res.instructors) + len(res.courses)
+        assignments.extend(res.assignments)
+        enrollments.extend(res.enrollments)
+    try:
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1 or len(files) <= 1:
+            for path in files:
+                consume(parse_shard(path))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+                for fut in as_completed([pool.submit(parse_shard, path) for path in files]):
+                    consume(fut.result())
+        assignments = list(dict.fromkeys(assignments))
+        enrollments = list(dict.fromkeys(enrollments))
+        applied = db.bulk_assign(assignments) + db.bulk_enroll(enrollments)
+        report.relations_applied = applied
+        report.relations_skipped = len(assignments) + len(enrollments) - applied
+    finally:
+        if own_db:
+            db.close()
+    report.elapsed = time.perf_counter() - start
+    return report
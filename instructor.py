@@ -15,6 +15,7 @@ Contents:
 """'''
 from typing import List
 from person import Person, ValidationError
+from validators import require_text
 from course import Course
 
 class Instructor(Person):
@@ -30,11 +31,24 @@ Parameters:
     instructor_id: parameter.
     """'''
         super().__init__(name, age, email)
-        if not isinstance(instructor_id, str) or not instructor_id.strip():
-            raise ValidationError("Instructor ID can't be empty.")
-        self.instructor_id = instructor_id.strip()
+        self.instructor_id = require_text(instructor_id, "Instructor ID can't be empty.")
         self.assigned_courses: List[Course] = []
 
+    @classmethod
+    def from_trusted(cls, name: str, age: int, email: str, instructor_id: str) -> 'Instructor':
+        '''    """Build a instructor from already-validated data (e.g. rows written by DataStore.save_all).
+
+Parameters:
+    name: parameter.
+    age: parameter.
+    email: parameter.
+    instructor_id: parameter.
+    """'''
+        obj = super().from_trusted(name, age, email)
+        obj.instructor_id = instructor_id
+        obj.assigned_courses = []
+        return obj
+
     def assign_course(self, course: Course):
         '''    """Assign course.
 
@@ -14,20 +14,25 @@ Contents:
 - Notes on usage and important behaviors
 """'''
 import sys
-import csv
 import json
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog, QGroupBox, QSpinBox, QCheckBox, QToolBar
 from db_store import DBStore
 from person import ValidationError
+from validators import validate_batch
+from ui_support import ANY_BOUND, AUTO_REFRESH_MS, AdaptiveScheduler, DirtyViews, PagedLoader, RefreshMetrics, SortOrder, VIEW_TABLES, bound_value, capacity_text, keyset_rows, parse_capacity, seats_text, view_filter
+from qt_support import DBWatcher, IdPicker, TableRows
 
 class MainWindow(QMainWindow):
     """Top-level PyQt window organizing tabs and toolbars for managing students, instructors, courses, and relations."""
 
-    def __init__(self):
-        '''"""  init  .
+    def __init__(self, lazy_start: bool=True, diagnostics: bool=False):
+        '''    """  init  .
 
-"""'''
+Parameters:
+    lazy_start: show the window first, then build the Relations tab on first visit and stream table rows in pages.
+    diagnostics: start with the refresh-timing status bar visible.
+    """'''
         super().__init__()
         self.setWindowTitle('School Management System (SQLite, PyQt5)')
         self.resize(1120, 720)
@@ -37,15 +42,76 @@ class MainWindow(QMainWindow):
         self.sel_course_id = None
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
+        self._metrics = RefreshMetrics(AUTO_REFRESH_MS)
+        self._metrics.listener = self._show_metrics
+        self._sort = SortOrder()
+        self._filters = dict.fromkeys(VIEW_TABLES)
         self._build_toolbar()
         self._build_students_tab()
         self._build_instructors_tab()
         self._build_courses_tab()
+        self._lazy_start = lazy_start
+        self._loader = PagedLoader(lambda fn: QtCore.QTimer.singleShot(0, fn), metrics=self._metrics)
+        self._views = DirtyViews({'students': self._refresh_students, 'instructors': self._refresh_instructors, 'courses': self._refresh_courses}, self._visible_view)
+        self._relations_built = False
+        self.page_relations = QWidget()
+        self.tabs.addTab(self.page_relations, 'Relations')
+        if not lazy_start:
+            self._ensure_relations_tab()
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self._scheduler = AdaptiveScheduler(lambda ms, fn: QtCore.QTimer.singleShot(ms, fn), lambda: self.db.poll_changes(), busy=self._refresh_busy, active=self._window_active, metrics=self._metrics)
+        self._scheduler.listener = self._show_interval
+        self._show_interval(self._scheduler)
+        self._pending_tables = set()
+        self.db.subscribe(self._on_db_change)
+        self._watcher = DBWatcher(self.db.db_path, lambda: self.db.poll_changes(), self)
+        self.chk_diag.setChecked(diagnostics)
+        self._toggle_diagnostics(diagnostics)
+        if lazy_start:
+            QtCore.QTimer.singleShot(0, self.refresh_all)
+        else:
+            self.refresh_all()
+
+    def _ensure_relations_tab(self):
+        '''"""Build the Relations tab once, the first time it is needed.
+
+"""'''
+        if self._relations_built:
+            return
+        self._relations_built = True
         self._build_relations_tab()
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(2000)
-        self.timer.timeout.connect(self.refresh_all)
-        self.refresh_all()
+
+    def _on_tab_changed(self, index: int):
+        '''    """Build the Relations tab on its first visit and catch up a stale table tab.
+
+Parameters:
+    index: parameter.
+    """'''
+        if self.tabs.widget(index) is self.page_relations and (not self._relations_built):
+            self._ensure_relations_tab()
+            self._fill_relation_dd()
+        self._views.show(self._visible_view())
+
+    def _visible_view(self):
+        '''"""Name of the table tab on screen, or None for the Relations tab.
+
+"""'''
+        return {self.page_students: 'students', self.page_instructors: 'instructors', self.page_courses: 'courses'}.get(self.tabs.currentWidget())
+
+    def _sort_by(self, view: str, column: int):
+        '''    """Sort a table view by the clicked column (click again to reverse); the ordering runs in SQL.
+
+Parameters:
+    view: parameter.
+    column: parameter.
+    """'''
+        column, descending = self._sort.click(view, column)
+        table, rows, refresh = {'students': (self.tbl_students, self.rows_students, self._refresh_students), 'instructors': (self.tbl_instructors, self.rows_instructors, self._refresh_instructors), 'courses': (self.tbl_courses, self.rows_courses, self._refresh_courses)}[view]
+        table.horizontalHeader().setSortIndicator(column, QtCore.Qt.DescendingOrder if descending else QtCore.Qt.AscendingOrder)
+        rows.clear()
+        q = (self.txt_search.text() or '').strip().lower() if self.cmb_scope.currentText().lower() == view else ''
+        refresh(q)
+        self._views.clean(view)
 
     def _build_toolbar(self):
         '''"""Construct the application toolbar.
@@ -71,6 +137,9 @@ class MainWindow(QMainWindow):
         self.txt_search.setFixedWidth(280)
         self.txt_search.textChanged.connect(self._apply_search)
         tb.addWidget(self.txt_search)
+        self.chk_prefix = QCheckBox('Word starts')
+        self.chk_prefix.toggled.connect(self._apply_search)
+        tb.addWidget(self.chk_prefix)
         tb.addWidget(QLabel(' in '))
         self.cmb_scope = QComboBox()
         self.cmb_scope.addItems(['Students', 'Instructors', 'Courses'])
@@ -83,6 +152,46 @@ class MainWindow(QMainWindow):
         self.chk_auto = QCheckBox('Auto-Refresh')
         self.chk_auto.toggled.connect(self._toggle_auto_refresh)
         tb.addWidget(self.chk_auto)
+        self.chk_diag = QCheckBox('Diagnostics')
+        self.chk_diag.toggled.connect(self._toggle_diagnostics)
+        tb.addWidget(self.chk_diag)
+        self.addToolBarBreak()
+        fb = QToolBar('Filter')
+        self.addToolBar(fb)
+        fb.addWidget(QLabel('  Filter: age '))
+        self.spn_f_min_age = QSpinBox()
+        self.spn_f_max_age = QSpinBox()
+        for spn in (self.spn_f_min_age, self.spn_f_max_age):
+            spn.setRange(ANY_BOUND, 150)
+            spn.setSpecialValueText('any')
+            spn.setValue(ANY_BOUND)
+        fb.addWidget(self.spn_f_min_age)
+        fb.addWidget(QLabel(' to '))
+        fb.addWidget(self.spn_f_max_age)
+        fb.addWidget(QLabel('  course '))
+        self.txt_f_course = QLineEdit()
+        self.txt_f_course.setPlaceholderText('Course ID')
+        self.txt_f_course.setFixedWidth(100)
+        fb.addWidget(self.txt_f_course)
+        fb.addWidget(QLabel('  instructor '))
+        self.txt_f_instructor = QLineEdit()
+        self.txt_f_instructor.setPlaceholderText('Instructor ID')
+        self.txt_f_instructor.setFixedWidth(100)
+        fb.addWidget(self.txt_f_instructor)
+        self.chk_f_empty = QCheckBox('No courses / students')
+        fb.addWidget(self.chk_f_empty)
+        fb.addWidget(QLabel('  size ≥ '))
+        self.spn_f_min_size = QSpinBox()
+        self.spn_f_min_size.setRange(ANY_BOUND, 100000)
+        self.spn_f_min_size.setSpecialValueText('any')
+        self.spn_f_min_size.setValue(ANY_BOUND)
+        fb.addWidget(self.spn_f_min_size)
+        btn_filter = QPushButton('Apply Filter')
+        btn_filter.clicked.connect(self._apply_filter)
+        fb.addWidget(btn_filter)
+        btn_unfilter = QPushButton('Clear Filter')
+        btn_unfilter.clicked.connect(self._clear_filter)
+        fb.addWidget(btn_unfilter)
 
     def _backup(self):
         '''""" backup.
@@ -105,25 +214,7 @@ class MainWindow(QMainWindow):
         if not folder:
             return
         try:
-            with open(f'{folder}/students.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['student_id', 'name', 'age', 'email', 'registered_course_ids'])
-                for s in self.db.list_students():
-                    course_ids = self.db.student_courses(s.student_id)
-                    w.writerow([s.student_id, s.name, s.age, s.email, ';'.join(course_ids)])
-            with open(f'{folder}/instructors.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['instructor_id', 'name', 'age', 'email', 'assigned_course_ids'])
-                courses = self.db.list_courses()
-                for i in self.db.list_instructors():
-                    assigned = [c.course_id for c in courses if c.instructor_id == i.instructor_id]
-                    w.writerow([i.instructor_id, i.name, i.age, i.email, ';'.join(assigned)])
-            with open(f'{folder}/courses.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['course_id', 'course_name', 'instructor_id', 'enrolled_student_ids'])
-                for c in self.db.list_courses():
-                    s_ids = self.db.course_students(c.course_id)
-                    w.writerow([c.course_id, c.course_name, c.instructor_id or '', ';'.join(s_ids)])
+            self.db.export_csv(folder)
             QMessageBox.information(self, 'Exported', f'CSV files saved to:\n{folder}')
         except Exception as e:
             QMessageBox.critical(self, 'Export error', str(e))
@@ -151,7 +242,12 @@ class MainWindow(QMainWindow):
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            for s in data.get('students', []):
+            reports = {key: validate_batch(data.get(key, []), kind) for key, kind in (('students', 'student'), ('instructors', 'instructor'), ('courses', 'course'))}
+            skip = {key: r.rejected_rows() for key, r in reports.items()}
+            rejected = sum((len(rows) for rows in skip.values()))
+            for n, s in enumerate(data.get('students', [])):
+                if n in skip['students']:
+                    continue
                 sid = (s.get('student_id') or '').strip()
                 name = s.get('name', '')
                 age = int(s.get('age', 0))
@@ -160,7 +256,9 @@ class MainWindow(QMainWindow):
                     self.db.add_student(name, age, email, sid)
                 except ValidationError:
                     self.db.update_student(sid, name=name, age=age, email=email)
-            for i in data.get('instructors', []):
+            for n, i in enumerate(data.get('instructors', [])):
+                if n in skip['instructors']:
+                    continue
                 iid = (i.get('instructor_id') or '').strip()
                 name = i.get('name', '')
                 age = int(i.get('age', 0))
@@ -169,7 +267,9 @@ class MainWindow(QMainWindow):
                     self.db.add_instructor(name, age, email, iid)
                 except ValidationError:
                     self.db.update_instructor(iid, name=name, age=age, email=email)
-            for c in data.get('courses', []):
+            for n, c in enumerate(data.get('courses', [])):
+                if n in skip['courses']:
+                    continue
                 cid = (c.get('course_id') or '').strip()
                 cname = c.get('course_name', '')
                 instr = c.get('instructor_id', None)
@@ -182,7 +282,9 @@ class MainWindow(QMainWindow):
                         self.db.assign_instructor_to_course(instr, cid)
                     except ValidationError:
                         pass
-            for c in data.get('courses', []):
+            for n, c in enumerate(data.get('courses', [])):
+                if n in skip['courses']:
+                    continue
                 cid = (c.get('course_id') or '').strip()
                 for sid in c.get('students', []):
                     try:
@@ -190,7 +292,10 @@ class MainWindow(QMainWindow):
                     except ValidationError:
                         pass
             self.refresh_all()
-            QMessageBox.information(self, 'Loaded', f'Data loaded from JSON:\n{path}')
+            msg = f'Data loaded from JSON:\n{path}'
+            if rejected:
+                msg += f'\n{rejected} invalid row(s) skipped.'
+            QMessageBox.information(self, 'Loaded', msg)
         except Exception as e:
             QMessageBox.critical(self, 'Load JSON error', str(e))
 
@@ -199,10 +304,12 @@ class MainWindow(QMainWindow):
 
 """'''
         try:
+            self._loader.cancel_all()
             self.db.close()
         except:
             pass
         self.db = DBStore()
+        self.db.subscribe(self._on_db_change)
         self.refresh_all()
         QMessageBox.information(self, 'Reloaded', 'Re-opened database.')
 
@@ -213,10 +320,29 @@ Parameters:
     checked: parameter.
     """'''
         if checked:
-            self.refresh_all()
-            self.timer.start()
+            self._scheduler.start()
         else:
-            self.timer.stop()
+            self._scheduler.stop()
+
+    def _refresh_busy(self) -> bool:
+        '''"""True while a refresh is queued or still streaming rows.
+
+"""'''
+        return bool(self._pending_tables) or self._loader.busy()
+
+    def _window_active(self) -> bool:
+        '''"""False while the window is hidden, minimized or in the background.
+
+"""'''
+        return self.isVisible() and (not self.isMinimized()) and self.isActiveWindow()
+
+    def _show_interval(self, scheduler: AdaptiveScheduler):
+        '''    """Show the current auto-refresh interval on its checkbox.
+
+Parameters:
+    scheduler: parameter.
+    """'''
+        self.chk_auto.setText(f'Auto-Refresh ({scheduler.label()})')
 
     def _build_students_tab(self):
         '''""" build students tab.
@@ -254,13 +380,20 @@ Parameters:
             h.addWidget(b)
         vgb.addLayout(h)
         v.addWidget(gb)
-        self.tbl_students = QTableWidget(0, 5)
-        self.tbl_students.setHorizontalHeaderLabels(['ID', 'Name', 'Age', 'Email', 'Courses'])
+        self.tbl_students = QTableWidget(0, 6)
+        self.tbl_students.setHorizontalHeaderLabels(['ID', 'Name', 'Age', 'Email', 'Courses', 'Count'])
+        header = self.tbl_students.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, QtCore.Qt.AscendingOrder)
+        header.sectionClicked.connect(lambda col: self._sort_by('students', col))
         self.tbl_students.horizontalHeader().setStretchLastSection(True)
         self.tbl_students.setSelectionBehavior(QTableWidget.SelectRows)
         self.tbl_students.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tbl_students.itemSelectionChanged.connect(self._on_student_select)
         v.addWidget(self.tbl_students)
+        self.rows_students = TableRows(self.tbl_students)
+        self.page_students = page
         self.tabs.addTab(page, 'Students')
 
     def _add_student(self):
@@ -271,7 +404,6 @@ Parameters:
             self.db.add_student(self.s_name.text(), int(self.s_age.value()), self.s_email.text(), self.s_id.text())
             QMessageBox.information(self, 'Success', 'Student added')
             self._clear_student_form()
-            self.refresh_all()
         except (ValidationError, ValueError) as e:
             QMessageBox.critical(self, 'Add error', str(e))
 
@@ -285,7 +417,6 @@ Parameters:
         try:
             self.db.update_student(self.sel_student_id, name=self.s_name.text(), age=int(self.s_age.value()), email=self.s_email.text())
             QMessageBox.information(self, 'Updated', 'Student updated')
-            self.refresh_all()
         except (ValidationError, ValueError) as e:
             QMessageBox.critical(self, 'Update error', str(e))
 
@@ -300,7 +431,6 @@ Parameters:
             return
         self.db.delete_student(self.sel_student_id)
         self._clear_student_form()
-        self.refresh_all()
 
     def _clear_student_form(self):
         '''""" clear student form.
@@ -336,19 +466,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        ft = (filter_text or '').lower()
-        data = []
-        for s in self.db.list_students():
-            courses = ', '.join(self.db.student_courses(s.student_id)) or 'None'
-            row = (s.student_id, s.name, str(s.age), s.email, courses)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                data.append(row)
-        self.tbl_students.setRowCount(0)
-        for row in data:
-            r = self.tbl_students.rowCount()
-            self.tbl_students.insertRow(r)
-            for c, val in enumerate(row):
-                self.tbl_students.setItem(r, c, QTableWidgetItem(val))
+        hits = self.db.match_ids('students', filter_text, self.chk_prefix.isChecked()) if filter_text else None
+        self.rows_students.begin()
+
+        def rows():
+            for s in keyset_rows(self.db.list_students, 'student_id', where=self._filters['students'], **self._sort.kwargs('students')):
+                if hits is not None and s.student_id not in hits:
+                    continue
+                courses = ', '.join(self.db.student_courses(s.student_id)) if s.course_count else 'None'
+                row = (s.student_id, s.name, str(s.age), s.email, courses, str(s.course_count))
+                yield row
+        self._loader.start('students', rows(), self.rows_students.feed, self.rows_students.end)
 
     def _build_instructors_tab(self):
         '''""" build instructors tab.
@@ -386,13 +514,20 @@ Parameters:
             h.addWidget(b)
         vgb.addLayout(h)
         v.addWidget(gb)
-        self.tbl_instructors = QTableWidget(0, 5)
-        self.tbl_instructors.setHorizontalHeaderLabels(['ID', 'Name', 'Age', 'Email', 'Courses'])
+        self.tbl_instructors = QTableWidget(0, 6)
+        self.tbl_instructors.setHorizontalHeaderLabels(['ID', 'Name', 'Age', 'Email', 'Courses', 'Count'])
+        header = self.tbl_instructors.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, QtCore.Qt.AscendingOrder)
+        header.sectionClicked.connect(lambda col: self._sort_by('instructors', col))
         self.tbl_instructors.horizontalHeader().setStretchLastSection(True)
         self.tbl_instructors.setSelectionBehavior(QTableWidget.SelectRows)
         self.tbl_instructors.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tbl_instructors.itemSelectionChanged.connect(self._on_instructor_select)
         v.addWidget(self.tbl_instructors)
+        self.rows_instructors = TableRows(self.tbl_instructors)
+        self.page_instructors = page
         self.tabs.addTab(page, 'Instructors')
 
     def _add_instructor(self):
@@ -403,7 +538,6 @@ Parameters:
             self.db.add_instructor(self.i_name.text(), int(self.i_age.value()), self.i_email.text(), self.i_id.text())
             QMessageBox.information(self, 'Success', 'Instructor added')
             self._clear_instructor_form()
-            self.refresh_all()
         except (ValidationError, ValueError) as e:
             QMessageBox.critical(self, 'Add error', str(e))
 
@@ -417,7 +551,6 @@ Parameters:
         try:
             self.db.update_instructor(self.sel_instructor_id, name=self.i_name.text(), age=int(self.i_age.value()), email=self.i_email.text())
             QMessageBox.information(self, 'Updated', 'Instructor updated')
-            self.refresh_all()
         except (ValidationError, ValueError) as e:
             QMessageBox.critical(self, 'Update error', str(e))
 
@@ -432,7 +565,6 @@ Parameters:
             return
         self.db.delete_instructor(self.sel_instructor_id)
         self._clear_instructor_form()
-        self.refresh_all()
 
     def _clear_instructor_form(self):
         '''""" clear instructor form.
@@ -468,20 +600,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        ft = (filter_text or '').lower()
-        data = []
-        all_courses = self.db.list_courses()
-        for i in self.db.list_instructors():
-            course_ids = [c.course_id for c in all_courses if c.instructor_id == i.instructor_id]
-            row = (i.instructor_id, i.name, str(i.age), i.email, ', '.join(course_ids) or 'None')
-            if not ft or any((ft in str(x).lower() for x in row)):
-                data.append(row)
-        self.tbl_instructors.setRowCount(0)
-        for row in data:
-            r = self.tbl_instructors.rowCount()
-            self.tbl_instructors.insertRow(r)
-            for c, val in enumerate(row):
-                self.tbl_instructors.setItem(r, c, QTableWidgetItem(val))
+        hits = self.db.match_ids('instructors', filter_text, self.chk_prefix.isChecked()) if filter_text else None
+        self.rows_instructors.begin()
+
+        def rows():
+            for i in keyset_rows(self.db.list_instructors, 'instructor_id', where=self._filters['instructors'], **self._sort.kwargs('instructors')):
+                if hits is not None and i.instructor_id not in hits:
+                    continue
+                courses = ', '.join(self.db.instructor_courses(i.instructor_id)) if i.course_count else 'None'
+                row = (i.instructor_id, i.name, str(i.age), i.email, courses, str(i.course_count))
+                yield row
+        self._loader.start('instructors', rows(), self.rows_instructors.feed, self.rows_instructors.end)
 
     def _build_courses_tab(self):
         '''""" build courses tab.
@@ -495,30 +624,43 @@ Parameters:
         vgb.addLayout(grid)
         self.c_id = QLineEdit()
         self.c_name = QLineEdit()
+        self.c_capacity = QLineEdit()
+        self.c_capacity.setPlaceholderText('unlimited')
         grid.addWidget(QLabel('Course ID'), 0, 0)
         grid.addWidget(self.c_id, 0, 1)
         grid.addWidget(QLabel('Course Name'), 0, 2)
         grid.addWidget(self.c_name, 0, 3)
+        grid.addWidget(QLabel('Capacity'), 0, 4)
+        grid.addWidget(self.c_capacity, 0, 5)
         h = QHBoxLayout()
         btn_add = QPushButton('Add')
         btn_add.clicked.connect(self._add_course)
         btn_upd = QPushButton('Update Name')
         btn_upd.clicked.connect(self._update_course)
+        btn_cap = QPushButton('Set Capacity')
+        btn_cap.clicked.connect(self._set_course_capacity)
         btn_del = QPushButton('Delete')
         btn_del.clicked.connect(self._delete_course)
         btn_clr = QPushButton('Clear Form')
         btn_clr.clicked.connect(self._clear_course_form)
-        for b in (btn_add, btn_upd, btn_del, btn_clr):
+        for b in (btn_add, btn_upd, btn_cap, btn_del, btn_clr):
             h.addWidget(b)
         vgb.addLayout(h)
         v.addWidget(gb)
-        self.tbl_courses = QTableWidget(0, 4)
-        self.tbl_courses.setHorizontalHeaderLabels(['ID', 'Name', 'Instructor', 'Students'])
+        self.tbl_courses = QTableWidget(0, 5)
+        self.tbl_courses.setHorizontalHeaderLabels(['ID', 'Name', 'Instructor', 'Students', 'Seats'])
+        header = self.tbl_courses.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, QtCore.Qt.AscendingOrder)
+        header.sectionClicked.connect(lambda col: self._sort_by('courses', col))
         self.tbl_courses.horizontalHeader().setStretchLastSection(True)
         self.tbl_courses.setSelectionBehavior(QTableWidget.SelectRows)
         self.tbl_courses.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tbl_courses.itemSelectionChanged.connect(self._on_course_select)
         v.addWidget(self.tbl_courses)
+        self.rows_courses = TableRows(self.tbl_courses)
+        self.page_courses = page
         self.tabs.addTab(page, 'Courses')
 
     def _add_course(self):
@@ -526,10 +668,9 @@ Parameters:
 
 """'''
         try:
-            self.db.add_course(self.c_id.text(), self.c_name.text())
+            self.db.add_course(self.c_id.text(), self.c_name.text(), parse_capacity(self.c_capacity.text()))
             QMessageBox.information(self, 'Success', 'Course added')
             self._clear_course_form()
-            self.refresh_all()
         except ValidationError as e:
             QMessageBox.critical(self, 'Add error', str(e))
 
@@ -543,7 +684,19 @@ Parameters:
         try:
             self.db.update_course_name(self.sel_course_id, self.c_name.text())
             QMessageBox.information(self, 'Updated', 'Course renamed')
-            self.refresh_all()
+        except ValidationError as e:
+            QMessageBox.critical(self, 'Update error', str(e))
+
+    def _set_course_capacity(self):
+        '''""" set course capacity.
+
+"""'''
+        if not self.sel_course_id:
+            QMessageBox.critical(self, 'No selection', 'Select a course')
+            return
+        try:
+            self.db.set_course_capacity(self.sel_course_id, parse_capacity(self.c_capacity.text()))
+            QMessageBox.information(self, 'Updated', 'Course capacity set')
         except ValidationError as e:
             QMessageBox.critical(self, 'Update error', str(e))
 
@@ -558,7 +711,6 @@ Parameters:
             return
         self.db.delete_course(self.sel_course_id)
         self._clear_course_form()
-        self.refresh_all()
 
     def _clear_course_form(self):
         '''""" clear course form.
@@ -567,6 +719,7 @@ Parameters:
         self.sel_course_id = None
         self.c_id.clear()
         self.c_name.clear()
+        self.c_capacity.clear()
 
     def _on_course_select(self):
         '''""" on course select.
@@ -581,6 +734,7 @@ Parameters:
         self.sel_course_id = cid
         self.c_id.setText(cid)
         self.c_name.setText(name)
+        self.c_capacity.setText(capacity_text(self.tbl_courses.item(r, 4).text()))
 
     def _refresh_courses(self, filter_text: str=''):
         '''    """ refresh courses.
@@ -588,31 +742,29 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        ft = (filter_text or '').lower()
-        data = []
-        for c in self.db.list_courses():
-            ins = c.instructor_id or 'None'
-            students = ', '.join(self.db.course_students(c.course_id)) or 'None'
-            row = (c.course_id, c.course_name, ins, students)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                data.append(row)
-        self.tbl_courses.setRowCount(0)
-        for row in data:
-            r = self.tbl_courses.rowCount()
-            self.tbl_courses.insertRow(r)
-            for c, val in enumerate(row):
-                self.tbl_courses.setItem(r, c, QTableWidgetItem(val))
+        hits = self.db.match_ids('courses', filter_text, self.chk_prefix.isChecked()) if filter_text else None
+        self.rows_courses.begin()
+
+        def rows():
+            for c in keyset_rows(self.db.list_courses, 'course_id', where=self._filters['courses'], **self._sort.kwargs('courses')):
+                if hits is not None and c.course_id not in hits:
+                    continue
+                ins = c.instructor_id or 'None'
+                students = ', '.join(self.db.course_students(c.course_id)) if c.enrolled_count else 'None'
+                row = (c.course_id, c.course_name, ins, students, seats_text(c.enrolled_count, c.capacity))
+                yield row
+        self._loader.start('courses', rows(), self.rows_courses.feed, self.rows_courses.end)
 
     def _build_relations_tab(self):
         '''""" build relations tab.
 
 """'''
-        page = QWidget()
+        page = self.page_relations
         v = QVBoxLayout(page)
         gb_enroll = QGroupBox('Enroll Student in Course')
         ge = QtWidgets.QGridLayout(gb_enroll)
-        self.cmb_student = QComboBox()
-        self.cmb_course_enroll = QComboBox()
+        self.cmb_student = IdPicker(self._id_search('students'))
+        self.cmb_course_enroll = IdPicker(self._id_search('courses'))
         ge.addWidget(QLabel('Student ID'), 0, 0)
         ge.addWidget(self.cmb_student, 0, 1)
         ge.addWidget(QLabel('Course ID'), 0, 2)
@@ -623,8 +775,8 @@ Parameters:
         v.addWidget(gb_enroll)
         gb_assign = QGroupBox('Assign Instructor to Course')
         ga = QtWidgets.QGridLayout(gb_assign)
-        self.cmb_instructor = QComboBox()
-        self.cmb_course_assign = QComboBox()
+        self.cmb_instructor = IdPicker(self._id_search('instructors'))
+        self.cmb_course_assign = IdPicker(self._id_search('courses'))
         ga.addWidget(QLabel('Instructor ID'), 0, 0)
         ga.addWidget(self.cmb_instructor, 0, 1)
         ga.addWidget(QLabel('Course ID'), 0, 2)
@@ -635,9 +787,9 @@ Parameters:
         v.addWidget(gb_assign)
         gb_drop = QGroupBox('Drop / Unassign')
         gd = QtWidgets.QGridLayout(gb_drop)
-        self.cmb_student_drop = QComboBox()
-        self.cmb_course_drop = QComboBox()
-        self.cmb_course_unassign = QComboBox()
+        self.cmb_student_drop = IdPicker(self._id_search('students'))
+        self.cmb_course_drop = IdPicker(self._id_search('courses'))
+        self.cmb_course_unassign = IdPicker(self._id_search('courses'))
         gd.addWidget(QLabel('Drop Student ID'), 0, 0)
         gd.addWidget(self.cmb_student_drop, 0, 1)
         gd.addWidget(QLabel('From Course ID'), 0, 2)
@@ -651,25 +803,23 @@ Parameters:
         btn_unassign.clicked.connect(self._unassign_instructor)
         gd.addWidget(btn_unassign, 1, 2)
         v.addWidget(gb_drop)
-        self.tabs.addTab(page, 'Relations')
+
+    def _id_search(self, table: str):
+        '''    """Prefix search callable for an IdPicker, resolved against the current store at call time.
+
+Parameters:
+    table: parameter.
+    """'''
+        return lambda prefix, limit: self.db.search_ids(table, prefix, limit)
 
     def _fill_relation_dd(self):
         '''""" fill relation dd.
 
 """'''
-        self.cmb_student.clear()
-        self.cmb_student_drop.clear()
-        self.cmb_instructor.clear()
-        self.cmb_course_enroll.clear()
-        self.cmb_course_assign.clear()
-        self.cmb_course_drop.clear()
-        self.cmb_course_unassign.clear()
-        self.cmb_student.addItems([s.student_id for s in self.db.list_students()])
-        self.cmb_student_drop.addItems([s.student_id for s in self.db.list_students()])
-        self.cmb_instructor.addItems([i.instructor_id for i in self.db.list_instructors()])
-        cids = [c.course_id for c in self.db.list_courses()]
-        for cmb in (self.cmb_course_enroll, self.cmb_course_assign, self.cmb_course_drop, self.cmb_course_unassign):
-            cmb.addItems(cids)
+        if not self._relations_built:
+            return
+        for picker in (self.cmb_student, self.cmb_student_drop, self.cmb_instructor, self.cmb_course_enroll, self.cmb_course_assign, self.cmb_course_drop, self.cmb_course_unassign):
+            picker.refresh()
 
     def _enroll_student(self):
         '''""" enroll student.
@@ -683,7 +833,6 @@ Parameters:
         try:
             self.db.enroll_student_in_course(sid, cid)
             QMessageBox.information(self, 'Enrolled', f'{sid} → {cid}')
-            self.refresh_all()
         except ValidationError as e:
             QMessageBox.critical(self, 'Enroll error', str(e))
 
@@ -699,7 +848,6 @@ Parameters:
         try:
             self.db.assign_instructor_to_course(iid, cid)
             QMessageBox.information(self, 'Assigned', f'{iid} → {cid}')
-            self.refresh_all()
         except ValidationError as e:
             QMessageBox.critical(self, 'Assign error', str(e))
 
@@ -715,7 +863,6 @@ Parameters:
         try:
             self.db.drop_student_from_course(sid, cid)
             QMessageBox.information(self, 'Dropped', f'{sid} ✕ {cid}')
-            self.refresh_all()
         except ValidationError as e:
             QMessageBox.critical(self, 'Drop error', str(e))
 
@@ -730,7 +877,6 @@ Parameters:
         try:
             self.db.unassign_instructor_from_course(cid)
             QMessageBox.information(self, 'Unassigned', f'Cleared instructor for {cid}')
-            self.refresh_all()
         except ValidationError as e:
             QMessageBox.critical(self, 'Unassign error', str(e))
 
@@ -746,6 +892,7 @@ Parameters:
             self._refresh_instructors(q)
         else:
             self._refresh_courses(q)
+        self._views.clean(scope.lower())
 
     def _clear_search(self):
         '''""" clear search.
@@ -754,14 +901,81 @@ Parameters:
         self.txt_search.clear()
         self._apply_search()
 
+    def _apply_filter(self):
+        '''"""Filter the view chosen in the search scope by the filter bar; the criteria run as one SQL query.
+
+"""'''
+        view = self.cmb_scope.currentText().lower()
+        values = {'min_age': bound_value(self.spn_f_min_age.value()), 'max_age': bound_value(self.spn_f_max_age.value()), 'course_id': self.txt_f_course.text(), 'instructor_id': self.txt_f_instructor.text(), 'empty': self.chk_f_empty.isChecked(), 'min_size': bound_value(self.spn_f_min_size.value())}
+        self._filters[view] = view_filter(view, values)
+        self._apply_search()
+
+    def _clear_filter(self):
+        '''""" clear filter.
+
+"""'''
+        for spn in (self.spn_f_min_age, self.spn_f_max_age, self.spn_f_min_size):
+            spn.setValue(ANY_BOUND)
+        self.txt_f_course.clear()
+        self.txt_f_instructor.clear()
+        self.chk_f_empty.setChecked(False)
+        self._filters[self.cmb_scope.currentText().lower()] = None
+        self._apply_search()
+
     def refresh_all(self):
         '''"""Refresh all.
 
+Every tab is marked stale; only the visible one is rebuilt now.
+"""'''
+        self._invalidate()
+
+    def _invalidate(self, *tables):
+        '''    """Rebuild the visible tab if it shows any of tables and mark the other affected tabs stale.
+
+Parameters:
+    tables: tables a write touched; none means all.
+    """'''
+        self._metrics.begin_tick()
+        self._views.invalidate(*tables)
+        with self._metrics.measure('relations'):
+            self._fill_relation_dd()
+
+    def _on_db_change(self, tables):
+        '''    """Store subscriber: collect the changed tables and refresh once the current event is done.
+
+Parameters:
+    tables: tables a committed write touched.
+    """'''
+        if not self._pending_tables:
+            QtCore.QTimer.singleShot(0, self._flush_changes)
+        self._pending_tables.update(tables)
+
+    def _flush_changes(self):
+        '''"""Invalidate every table reported since the last flush.
+
 """'''
-        self._refresh_students()
-        self._refresh_instructors()
-        self._refresh_courses()
-        self._fill_relation_dd()
+        tables, self._pending_tables = (self._pending_tables, set())
+        if tables:
+            self._invalidate(*tables)
+
+    def _toggle_diagnostics(self, checked: bool):
+        '''    """Show or hide the refresh-timing status bar.
+
+Parameters:
+    checked: parameter.
+    """'''
+        self.statusBar().setVisible(checked)
+        if checked:
+            self._show_metrics(self._metrics)
+
+    def _show_metrics(self, metrics: RefreshMetrics):
+        '''    """Put the latest refresh timings in the status bar.
+
+Parameters:
+    metrics: parameter.
+    """'''
+        if self.chk_diag.isChecked():
+            self.statusBar().showMessage(metrics.summary())
 
     def closeEvent(self, event: QtGui.QCloseEvent):
         '''    """Closeevent.
@@ -770,8 +984,9 @@ Parameters:
     event: parameter.
     """'''
         try:
-            if self.timer.isActive():
-                self.timer.stop()
+            self._scheduler.stop()
+            self._watcher.stop()
+            self._loader.cancel_all()
             self.db.close()
         finally:
             event.accept()
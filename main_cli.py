@@ -0,0 +1,184 @@
+'''"""
+Command-Line Interface — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- Headless entry point for cron jobs: python -m main_cli <command> [options]
+- Subcommands: import, export-json, export-csv, backup, stats, vacuum
+- Never imports tkinter or PyQt5; uses the bulk/streaming DBStore paths
+"""'''
+import argparse
+import json
+import sys
+from typing import List, Optional
+from db_store import DBStore, DB_PATH
+from db_profiler import LoggingSink
+
+def _open_db(args: argparse.Namespace) -> DBStore:
+    '''    """Open the --db store, with profiling switched on when --profile was given.
+
+Parameters:
+    args: parameter.
+    """'''
+    db = DBStore(args.db)
+    if args.profile:
+        db.enable_profiling(slow_ms=args.slow_ms, sinks=[LoggingSink()])
+    return db
+
+def _close_db(db: DBStore, args: argparse.Namespace) -> None:
+    '''    """Write the --profile statistics, then close the store.
+
+Parameters:
+    db: parameter.
+    args: parameter.
+    """'''
+    try:
+        if db.profiler is not None:
+            db.profiler.dump_json(args.profile)
+    finally:
+        db.close()
+
+def _cmd_import(args: argparse.Namespace) -> int:
+    '''    """Import JSON/CSV shards through the parallel pipeline.
+
+Parameters:
+    args: parameter.
+    """'''
+    from import_pipeline import run_import
+    db = _open_db(args)
+    try:
+        report = run_import(args.paths, db, workers=args.workers)
+    finally:
+        _close_db(db, args)
+    data = report.to_dict()
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    data.pop('rejects')
+    print(json.dumps(data, indent=2))
+    if report.failed_files or (args.fail_on_reject and report.rejected):
+        return 1
+    return 0
+
+def _cmd_export_json(args: argparse.Namespace) -> int:
+    '''    """Stream the database to a JSON file.
+
+Parameters:
+    args: parameter.
+    """'''
+    db = _open_db(args)
+    try:
+        db.dump_json(args.path)
+    finally:
+        _close_db(db, args)
+    return 0
+
+def _cmd_export_csv(args: argparse.Namespace) -> int:
+    '''    """Stream the database to students/instructors/courses CSV files.
+
+Parameters:
+    args: parameter.
+    """'''
+    db = _open_db(args)
+    try:
+        db.export_csv(args.folder)
+    finally:
+        _close_db(db, args)
+    return 0
+
+def _cmd_backup(args: argparse.Namespace) -> int:
+    '''    """Write an online backup of the database.
+
+Parameters:
+    args: parameter.
+    """'''
+    db = _open_db(args)
+    try:
+        db.backup_db(args.dest)
+    finally:
+        _close_db(db, args)
+    return 0
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    '''    """Print row counts (and storage figures for the SQLite store) as JSON.
+
+Parameters:
+    args: parameter.
+    """'''
+    if args.json_store:
+        from Data_Managment import DataStore
+        ds = DataStore.load_all()
+        out = {'students': len(ds.students), 'instructors': len(ds.instructors), 'courses': len(ds.courses), 'registrations': sum((len(c.enrolled_students) for c in ds.courses.values()))}
+    else:
+        db = _open_db(args)
+        try:
+            out = db.counts()
+            out.update(db.storage_info())
+        finally:
+            _close_db(db, args)
+    print(json.dumps(out, indent=2))
+    return 0
+
+def _cmd_vacuum(args: argparse.Namespace) -> int:
+    '''    """Compact the database file and refresh planner statistics.
+
+Parameters:
+    args: parameter.
+    """'''
+    db = _open_db(args)
+    try:
+        before = db.storage_info()['size_bytes']
+        db.vacuum()
+        after = db.storage_info()['size_bytes']
+    finally:
+        _close_db(db, args)
+    print(json.dumps({'size_before': before, 'size_after': after}))
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    '''"""Build the argument parser for all subcommands.
+
+"""'''
+    p = argparse.ArgumentParser(prog='python -m main_cli', description='Headless bulk operations for the School Management System.')
+    p.add_argument('--db', default=DB_PATH, help=f'SQLite database path (default: {DB_PATH})')
+    p.add_argument('--profile', metavar='PATH', help='time every SQL statement and write DBStore.stats() JSON here')
+    p.add_argument('--slow-ms', type=float, default=50.0, help='with --profile, log statements slower than this (and their query plan)')
+    sub = p.add_subparsers(dest='command', required=True)
+    sp = sub.add_parser('import', help='import JSON/CSV shards in parallel')
+    sp.add_argument('paths', nargs='+', help='shard files or directories')
+    sp.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    sp.add_argument('--report', help='write the full JSON report, including rejected rows, here')
+    sp.add_argument('--fail-on-reject', action='store_true', help='exit 1 when any row was rejected')
+    sp.set_defaults(func=_cmd_import)
+    sp = sub.add_parser('export-json', help='stream the database to a JSON file')
+    sp.add_argument('path')
+    sp.set_defaults(func=_cmd_export_json)
+    sp = sub.add_parser('export-csv', help='write students/instructors/courses CSV files')
+    sp.add_argument('folder')
+    sp.set_defaults(func=_cmd_export_csv)
+    sp = sub.add_parser('backup', help='online backup of the database')
+    sp.add_argument('dest')
+    sp.set_defaults(func=_cmd_backup)
+    sp = sub.add_parser('stats', help='print row counts and storage figures')
+    sp.add_argument('--json-store', action='store_true', help='report on the JSON DataStore files in the current directory instead')
+    sp.set_defaults(func=_cmd_stats)
+    sp = sub.add_parser('vacuum', help='compact the database and run PRAGMA optimize')
+    sp.set_defaults(func=_cmd_vacuum)
+    return p
+
+def main(argv: Optional[List[str]]=None) -> int:
+    '''    """Main.
+
+Parameters:
+    argv: parameter.
+    """'''
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+if __name__ == '__main__':
+    sys.exit(main())
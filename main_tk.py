@@ -15,17 +15,23 @@ Contents:
 """'''
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv, json
+import json
 from db_store import DBStore as DataStore
 from person import ValidationError
+from validators import validate_batch
+from ui_support import AUTO_REFRESH_MS, DirtyViews, PagedLoader, RefreshMetrics, SortOrder, VIEW_TABLES, bound_value, capacity_text, keyset_rows, parse_capacity, seats_text, view_filter
+from tk_support import DBWatcher, IdPicker, TreeRows
 
 class App(tk.Tk):
     """Top-level Tkinter GUI application that provides tabs for Students, Instructors, Courses, and Relations."""
 
-    def __init__(self):
-        '''"""  init  .
+    def __init__(self, lazy_start: bool=True, diagnostics: bool=False):
+        '''    """  init  .
 
-"""'''
+Parameters:
+    lazy_start: paint the window first, then build the Relations tab on first visit and stream table rows in pages.
+    diagnostics: start with the refresh-timing status bar visible.
+    """'''
         super().__init__()
         self.title('School Management System')
         self.geometry('1100x680')
@@ -33,9 +39,25 @@ class App(tk.Tk):
         self.sel_student_id = None
         self.sel_instructor_id = None
         self.sel_course_id = None
+        self.metrics = RefreshMetrics(AUTO_REFRESH_MS)
+        self.sort = SortOrder()
+        self.filters = dict.fromkeys(VIEW_TABLES)
+        self.var_diagnostics = tk.BooleanVar(value=diagnostics)
         self.build_toolbar()
+        self.loader = PagedLoader(lambda fn: self.after(1, fn), metrics=self.metrics)
+        self.lazy_start = lazy_start
+        self.views = DirtyViews({'students': self.refresh_students, 'instructors': self.refresh_instructors, 'courses': self.refresh_courses}, self.visible_view)
         self.build_tabs()
-        self.refresh_all()
+        self.lbl_status = ttk.Label(self, anchor='w', padding=(6, 2), relief=tk.SUNKEN)
+        self.metrics.listener = self.show_metrics
+        self.toggle_diagnostics()
+        if lazy_start:
+            self.after_idle(self.refresh_all)
+        else:
+            self.refresh_all()
+        self.pending_tables = set()
+        self.ds.subscribe(self.on_db_change)
+        self.watcher = DBWatcher(self, self.ds.db_path, lambda: self.ds.poll_changes())
         self.protocol('WM_DELETE_WINDOW', self.on_close)
 
     def build_toolbar(self):
@@ -53,10 +75,35 @@ class App(tk.Tk):
         ent = ttk.Entry(bar, textvariable=self.var_search, width=32)
         ent.pack(side=tk.LEFT, padx=4)
         ent.bind('<KeyRelease>', lambda e: self.apply_search())
+        self.var_prefix = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bar, text='Word starts', variable=self.var_prefix, command=self.apply_search).pack(side=tk.LEFT, padx=4)
         ttk.Label(bar, text=' in ').pack(side=tk.LEFT)
         self.var_search_scope = tk.StringVar(value='Students')
         ttk.Combobox(bar, textvariable=self.var_search_scope, values=['Students', 'Instructors', 'Courses'], width=12, state='readonly').pack(side=tk.LEFT, padx=4)
         ttk.Button(bar, text='Clear', command=self.clear_search).pack(side=tk.LEFT, padx=4)
+        ttk.Checkbutton(bar, text='Diagnostics', variable=self.var_diagnostics, command=self.toggle_diagnostics).pack(side=tk.RIGHT, padx=6)
+        fbar = ttk.Frame(self, padding=(6, 0, 6, 6))
+        fbar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(fbar, text='Filter: age').pack(side=tk.LEFT, padx=(0, 4))
+        self.var_f_min_age = tk.StringVar()
+        self.var_f_max_age = tk.StringVar()
+        ttk.Spinbox(fbar, from_=0, to=150, textvariable=self.var_f_min_age, width=5).pack(side=tk.LEFT)
+        ttk.Label(fbar, text=' to ').pack(side=tk.LEFT)
+        ttk.Spinbox(fbar, from_=0, to=150, textvariable=self.var_f_max_age, width=5).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='  course').pack(side=tk.LEFT, padx=(8, 4))
+        self.var_f_course = tk.StringVar()
+        ttk.Entry(fbar, textvariable=self.var_f_course, width=12).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='  instructor').pack(side=tk.LEFT, padx=(8, 4))
+        self.var_f_instructor = tk.StringVar()
+        ttk.Entry(fbar, textvariable=self.var_f_instructor, width=12).pack(side=tk.LEFT)
+        self.var_f_empty = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fbar, text='No courses / students', variable=self.var_f_empty).pack(side=tk.LEFT, padx=8)
+        ttk.Label(fbar, text='size ≥').pack(side=tk.LEFT, padx=(0, 4))
+        self.var_f_min_size = tk.StringVar()
+        ttk.Spinbox(fbar, from_=0, to=100000, textvariable=self.var_f_min_size, width=7).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='(blank = any)').pack(side=tk.LEFT, padx=4)
+        ttk.Button(fbar, text='Apply Filter', command=self.apply_filter).pack(side=tk.LEFT, padx=4)
+        ttk.Button(fbar, text='Clear Filter', command=self.clear_filter).pack(side=tk.LEFT, padx=4)
 
     def build_tabs(self):
         '''"""Construct main tab pages and attach them to the window.
@@ -75,8 +122,53 @@ class App(tk.Tk):
         self.build_students_tab()
         self.build_instructors_tab()
         self.build_courses_tab()
+        self.nb = nb
+        self._relations_built = False
+        if not self.lazy_start:
+            self.ensure_relations_tab()
+        nb.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
+    def ensure_relations_tab(self):
+        '''"""Build the Relations tab once, the first time it is needed.
+
+"""'''
+        if self._relations_built:
+            return
+        self._relations_built = True
         self.build_relations_tab()
 
+    def on_tab_changed(self, event=None):
+        '''    """Build the Relations tab on its first visit and catch up a stale table tab.
+
+Parameters:
+    event: parameter.
+    """'''
+        if self.nb.select() == str(self.tab_relations) and (not self._relations_built):
+            self.ensure_relations_tab()
+            self.fill_relation_dropdowns()
+        self.views.show(self.visible_view())
+
+    def visible_view(self):
+        '''"""Name of the table tab on screen, or None for the Relations tab.
+
+"""'''
+        return {str(self.tab_students): 'students', str(self.tab_instructors): 'instructors', str(self.tab_courses): 'courses'}.get(self.nb.select())
+
+    def sort_by(self, view: str, column: int):
+        '''    """Sort a table view by the clicked column (click again to reverse); the ordering runs in SQL.
+
+Parameters:
+    view: parameter.
+    column: parameter.
+    """'''
+        column, descending = self.sort.click(view, column)
+        tree, rows, refresh = {'students': (self.tree_students, self.rows_students, self.refresh_students), 'instructors': (self.tree_instructors, self.rows_instructors, self.refresh_instructors), 'courses': (self.tree_courses, self.rows_courses, self.refresh_courses)}[view]
+        for i, c in enumerate(tree['columns']):
+            tree.heading(c, text=c.capitalize() + ((' ▼' if descending else ' ▲') if i == column else ''))
+        rows.clear()
+        refresh(self.var_search.get().strip() if self.var_search_scope.get().lower() == view else '')
+        self.views.clean(view)
+
     def build_students_tab(self):
         '''"""Build students tab.
 
@@ -104,12 +196,13 @@ class App(tk.Tk):
         ttk.Button(btns, text='Update', command=self.update_student).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self.delete_student).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self.clear_student_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'age', 'email', 'courses')
+        cols = ('id', 'name', 'age', 'email', 'courses', 'count')
         self.tree_students = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (110, 180, 60, 220, 360)):
-            self.tree_students.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (110, 180, 60, 220, 300, 60)):
+            self.tree_students.heading(c, text=c.capitalize(), command=lambda c=c: self.sort_by('students', cols.index(c)))
             self.tree_students.column(c, width=w, anchor='w')
         self.tree_students.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_students = TreeRows(self.tree_students)
         self.tree_students.bind('<<TreeviewSelect>>', self.on_student_select)
 
     def add_student(self):
@@ -121,7 +214,6 @@ class App(tk.Tk):
             self.ds.add_student(self.s_name.get(), age_val, self.s_email.get(), self.s_id.get())
             messagebox.showinfo('Success', 'Student added.')
             self.clear_student_form()
-            self.refresh_students()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Error adding student', str(e))
 
@@ -137,7 +229,6 @@ class App(tk.Tk):
             age_val = int(self.s_age.get())
             self.ds.update_student(sid, name=self.s_name.get(), age=age_val, email=self.s_email.get())
             messagebox.showinfo('Updated', f'Student {sid} updated.')
-            self.refresh_students()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Update error', str(e))
 
@@ -153,7 +244,6 @@ class App(tk.Tk):
             return
         self.ds.delete_student(sid)
         self.clear_student_form()
-        self.refresh_all()
 
     def clear_student_form(self):
         '''"""Clear student form.
@@ -175,7 +265,7 @@ Parameters:
         if not item:
             return
         vals = self.tree_students.item(item[0], 'values')
-        sid, name, age, email, _courses = vals
+        sid, name, age, email, _courses, _count = vals
         self.sel_student_id = sid
         self.s_id.set(sid)
         self.s_name.set(name)
@@ -188,13 +278,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_students.delete(*self.tree_students.get_children())
-        ft = filter_text.lower()
-        for r in self.ds.list_students():
-            courses = ', '.join(self.ds.student_courses(r.student_id)) or 'None'
-            row = (r.student_id, r.name, r.age, r.email, courses)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_students.insert('', tk.END, values=row)
+        self.rows_students.begin()
+        hits = self.ds.match_ids('students', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for r in keyset_rows(self.ds.list_students, 'student_id', where=self.filters['students'], **self.sort.kwargs('students')):
+                if hits is not None and r.student_id not in hits:
+                    continue
+                courses = ', '.join(self.ds.student_courses(r.student_id)) if r.course_count else 'None'
+                row = (r.student_id, r.name, r.age, r.email, courses, r.course_count)
+                yield row
+        self.loader.start('students', rows(), self.rows_students.feed, self.rows_students.end)
 
     def build_instructors_tab(self):
         '''"""Build instructors tab.
@@ -223,12 +317,13 @@ Parameters:
         ttk.Button(btns, text='Update', command=self.update_instructor).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self.delete_instructor).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self.clear_instructor_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'age', 'email', 'courses')
+        cols = ('id', 'name', 'age', 'email', 'courses', 'count')
         self.tree_instructors = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (120, 180, 60, 220, 360)):
-            self.tree_instructors.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (120, 180, 60, 220, 300, 60)):
+            self.tree_instructors.heading(c, text=c.capitalize(), command=lambda c=c: self.sort_by('instructors', cols.index(c)))
             self.tree_instructors.column(c, width=w, anchor='w')
         self.tree_instructors.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_instructors = TreeRows(self.tree_instructors)
         self.tree_instructors.bind('<<TreeviewSelect>>', self.on_instructor_select)
 
     def add_instructor(self):
@@ -240,7 +335,6 @@ Parameters:
             self.ds.add_instructor(self.i_name.get(), age_val, self.i_email.get(), self.i_id.get())
             messagebox.showinfo('Success', 'Instructor added.')
             self.clear_instructor_form()
-            self.refresh_instructors()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Error adding instructor', str(e))
 
@@ -256,7 +350,6 @@ Parameters:
             age_val = int(self.i_age.get())
             self.ds.update_instructor(iid, name=self.i_name.get(), age=age_val, email=self.i_email.get())
             messagebox.showinfo('Updated', f'Instructor {iid} updated.')
-            self.refresh_instructors()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Update error', str(e))
 
@@ -272,7 +365,6 @@ Parameters:
             return
         self.ds.delete_instructor(iid)
         self.clear_instructor_form()
-        self.refresh_all()
 
     def clear_instructor_form(self):
         '''"""Clear instructor form.
@@ -294,7 +386,7 @@ Parameters:
         if not item:
             return
         vals = self.tree_instructors.item(item[0], 'values')
-        iid, name, age, email, _courses = vals
+        iid, name, age, email, _courses, _count = vals
         self.sel_instructor_id = iid
         self.i_id.set(iid)
         self.i_name.set(name)
@@ -307,12 +399,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_instructors.delete(*self.tree_instructors.get_children())
-        ft = filter_text.lower()
-        for r in self.ds.list_instructors():
-            row = (r.instructor_id, r.name, r.age, r.email, '—')
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_instructors.insert('', tk.END, values=row)
+        self.rows_instructors.begin()
+        hits = self.ds.match_ids('instructors', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for r in keyset_rows(self.ds.list_instructors, 'instructor_id', where=self.filters['instructors'], **self.sort.kwargs('instructors')):
+                if hits is not None and r.instructor_id not in hits:
+                    continue
+                courses = ', '.join(self.ds.instructor_courses(r.instructor_id)) if r.course_count else 'None'
+                row = (r.instructor_id, r.name, r.age, r.email, courses, r.course_count)
+                yield row
+        self.loader.start('instructors', rows(), self.rows_instructors.feed, self.rows_instructors.end)
 
     def build_courses_tab(self):
         '''"""Build courses tab.
@@ -323,24 +420,29 @@ Parameters:
         form.pack(side=tk.TOP, fill=tk.X)
         self.c_id = tk.StringVar()
         self.c_name = tk.StringVar()
+        self.c_capacity = tk.StringVar()
         grid = ttk.Frame(form)
         grid.pack(fill=tk.X)
         ttk.Label(grid, text='Course ID').grid(row=0, column=0, sticky='w', padx=4, pady=4)
         ttk.Entry(grid, textvariable=self.c_id, width=18).grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(grid, text='Course Name').grid(row=0, column=2, sticky='w', padx=4, pady=4)
         ttk.Entry(grid, textvariable=self.c_name, width=30).grid(row=0, column=3, padx=4, pady=4)
+        ttk.Label(grid, text='Capacity').grid(row=0, column=4, sticky='w', padx=4, pady=4)
+        ttk.Entry(grid, textvariable=self.c_capacity, width=8).grid(row=0, column=5, padx=4, pady=4)
         btns = ttk.Frame(form)
         btns.pack(fill=tk.X, pady=6)
         ttk.Button(btns, text='Add', command=self.add_course).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Update Name', command=self.update_course).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btns, text='Set Capacity', command=self.set_course_capacity).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self.delete_course).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self.clear_course_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'instructor', 'students')
+        cols = ('id', 'name', 'instructor', 'students', 'seats')
         self.tree_courses = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (120, 260, 160, 460)):
-            self.tree_courses.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (120, 260, 160, 380, 80)):
+            self.tree_courses.heading(c, text=c.capitalize(), command=lambda c=c: self.sort_by('courses', cols.index(c)))
             self.tree_courses.column(c, width=w, anchor='w')
         self.tree_courses.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_courses = TreeRows(self.tree_courses)
         self.tree_courses.bind('<<TreeviewSelect>>', self.on_course_select)
 
     def add_course(self):
@@ -348,10 +450,9 @@ Parameters:
 
 """'''
         try:
-            self.ds.add_course(self.c_id.get(), self.c_name.get())
+            self.ds.add_course(self.c_id.get(), self.c_name.get(), parse_capacity(self.c_capacity.get()))
             messagebox.showinfo('Success', 'Course added.')
             self.clear_course_form()
-            self.refresh_courses()
         except ValidationError as e:
             messagebox.showerror('Error adding course', str(e))
 
@@ -369,7 +470,20 @@ Parameters:
             return
         self.ds.update_course_name(cid, name)
         messagebox.showinfo('Updated', f'Course {cid} renamed.')
-        self.refresh_all()
+
+    def set_course_capacity(self):
+        '''"""Set the capacity of the selected course; a blank field means unlimited.
+
+"""'''
+        cid = self.sel_course_id
+        if not cid:
+            messagebox.showerror('No selection', 'Select a course from the table.')
+            return
+        try:
+            self.ds.set_course_capacity(cid, parse_capacity(self.c_capacity.get()))
+            messagebox.showinfo('Updated', f'Course {cid} capacity set.')
+        except ValidationError as e:
+            messagebox.showerror('Error setting capacity', str(e))
 
     def delete_course(self):
         '''"""Delete a course record.
@@ -383,7 +497,6 @@ Parameters:
             return
         self.ds.delete_course(cid)
         self.clear_course_form()
-        self.refresh_all()
 
     def clear_course_form(self):
         '''"""Clear course form.
@@ -392,6 +505,7 @@ Parameters:
         self.sel_course_id = None
         self.c_id.set('')
         self.c_name.set('')
+        self.c_capacity.set('')
 
     def on_course_select(self, _):
         '''    """On course select.
@@ -403,10 +517,11 @@ Parameters:
         if not item:
             return
         vals = self.tree_courses.item(item[0], 'values')
-        cid, name, instr, _students = vals
+        cid, name, instr, _students, seats = vals
         self.sel_course_id = cid
         self.c_id.set(cid)
         self.c_name.set(name)
+        self.c_capacity.set(capacity_text(seats))
 
     def refresh_courses(self, filter_text: str=''):
         '''    """Refresh courses.
@@ -414,14 +529,18 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_courses.delete(*self.tree_courses.get_children())
-        ft = filter_text.lower()
-        for r in self.ds.list_courses():
-            ins = r.instructor_id or 'None'
-            students = ', '.join(self.ds.course_students(r.course_id)) or 'None'
-            row = (r.course_id, r.course_name, ins, students)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_courses.insert('', tk.END, values=row)
+        self.rows_courses.begin()
+        hits = self.ds.match_ids('courses', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for r in keyset_rows(self.ds.list_courses, 'course_id', where=self.filters['courses'], **self.sort.kwargs('courses')):
+                if hits is not None and r.course_id not in hits:
+                    continue
+                ins = r.instructor_id or 'None'
+                students = ', '.join(self.ds.course_students(r.course_id)) if r.enrolled_count else 'None'
+                row = (r.course_id, r.course_name, ins, students, seats_text(r.enrolled_count, r.capacity))
+                yield row
+        self.loader.start('courses', rows(), self.rows_courses.feed, self.rows_courses.end)
 
     def build_relations_tab(self):
         '''"""Build relations tab.
@@ -433,10 +552,10 @@ Parameters:
         self.var_student = tk.StringVar()
         self.var_course_for_enroll = tk.StringVar()
         ttk.Label(enroll_box, text='Student ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_student = ttk.Combobox(enroll_box, textvariable=self.var_student, width=20, state='readonly')
+        self.cmb_student = IdPicker(enroll_box, self.id_search('students'), textvariable=self.var_student, width=20)
         self.cmb_student.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(enroll_box, text='Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_enroll = ttk.Combobox(enroll_box, textvariable=self.var_course_for_enroll, width=20, state='readonly')
+        self.cmb_course_enroll = IdPicker(enroll_box, self.id_search('courses'), textvariable=self.var_course_for_enroll, width=20)
         self.cmb_course_enroll.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(enroll_box, text='Enroll', command=self.enroll_student).grid(row=0, column=4, padx=6, pady=4)
         assign_box = ttk.LabelFrame(frm, text='Assign Instructor to Course', padding=10)
@@ -444,10 +563,10 @@ Parameters:
         self.var_instructor = tk.StringVar()
         self.var_course_for_assign = tk.StringVar()
         ttk.Label(assign_box, text='Instructor ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_instructor = ttk.Combobox(assign_box, textvariable=self.var_instructor, width=20, state='readonly')
+        self.cmb_instructor = IdPicker(assign_box, self.id_search('instructors'), textvariable=self.var_instructor, width=20)
         self.cmb_instructor.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(assign_box, text='Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_assign = ttk.Combobox(assign_box, textvariable=self.var_course_for_assign, width=20, state='readonly')
+        self.cmb_course_assign = IdPicker(assign_box, self.id_search('courses'), textvariable=self.var_course_for_assign, width=20)
         self.cmb_course_assign.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(assign_box, text='Assign', command=self.assign_instructor).grid(row=0, column=4, padx=6, pady=4)
         drop_box = ttk.LabelFrame(frm, text='Drop / Unassign', padding=10)
@@ -456,31 +575,33 @@ Parameters:
         self.var_course_drop = tk.StringVar()
         self.var_course_unassign = tk.StringVar()
         ttk.Label(drop_box, text='Drop Student ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_student_drop = ttk.Combobox(drop_box, textvariable=self.var_student_drop, width=20, state='readonly')
+        self.cmb_student_drop = IdPicker(drop_box, self.id_search('students'), textvariable=self.var_student_drop, width=20)
         self.cmb_student_drop.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(drop_box, text='From Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_drop = ttk.Combobox(drop_box, textvariable=self.var_course_drop, width=20, state='readonly')
+        self.cmb_course_drop = IdPicker(drop_box, self.id_search('courses'), textvariable=self.var_course_drop, width=20)
         self.cmb_course_drop.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(drop_box, text='Drop', command=self.drop_student).grid(row=0, column=4, padx=6, pady=4)
         ttk.Label(drop_box, text='Unassign Instructor from Course ID').grid(row=1, column=0, padx=4, pady=8, sticky='w')
-        self.cmb_course_unassign = ttk.Combobox(drop_box, textvariable=self.var_course_unassign, width=20, state='readonly')
+        self.cmb_course_unassign = IdPicker(drop_box, self.id_search('courses'), textvariable=self.var_course_unassign, width=20)
         self.cmb_course_unassign.grid(row=1, column=1, padx=4, pady=8)
         ttk.Button(drop_box, text='Unassign', command=self.unassign_instructor).grid(row=1, column=2, padx=6, pady=8)
 
+    def id_search(self, table: str):
+        '''    """Prefix search callable for an IdPicker, resolved against the current store at call time.
+
+Parameters:
+    table: parameter.
+    """'''
+        return lambda prefix, limit: self.ds.search_ids(table, prefix, limit)
+
     def fill_relation_dropdowns(self):
         '''"""Fill relation dropdowns.
 
 """'''
-        s_ids = sorted([r.student_id for r in self.ds.list_students()])
-        i_ids = sorted([r.instructor_id for r in self.ds.list_instructors()])
-        c_ids = sorted([r.course_id for r in self.ds.list_courses()])
-        self.cmb_student['values'] = s_ids
-        self.cmb_student_drop['values'] = s_ids
-        self.cmb_instructor['values'] = i_ids
-        self.cmb_course_enroll['values'] = c_ids
-        self.cmb_course_assign['values'] = c_ids
-        self.cmb_course_drop['values'] = c_ids
-        self.cmb_course_unassign['values'] = c_ids
+        if not self._relations_built:
+            return
+        for picker in (self.cmb_student, self.cmb_student_drop, self.cmb_instructor, self.cmb_course_enroll, self.cmb_course_assign, self.cmb_course_drop, self.cmb_course_unassign):
+            picker.refresh()
 
     def enroll_student(self):
         '''"""Enroll student.
@@ -494,7 +615,6 @@ Parameters:
         try:
             self.ds.enroll_student_in_course(sid, cid)
             messagebox.showinfo('Enrolled', f'Student {sid} enrolled in {cid}.')
-            self.refresh_all()
         except ValidationError as e:
             messagebox.showerror('Enroll error', str(e))
 
@@ -510,7 +630,6 @@ Parameters:
         try:
             self.ds.assign_instructor_to_course(iid, cid)
             messagebox.showinfo('Assigned', f'Instructor {iid} assigned to {cid}.')
-            self.refresh_all()
         except ValidationError as e:
             messagebox.showerror('Assign error', str(e))
 
@@ -526,7 +645,6 @@ Parameters:
         try:
             self.ds.drop_student_from_course(sid, cid)
             messagebox.showinfo('Dropped', f'Student {sid} dropped from {cid}.')
-            self.refresh_all()
         except ValidationError as e:
             messagebox.showerror('Drop error', str(e))
 
@@ -541,7 +659,6 @@ Parameters:
         try:
             self.ds.unassign_instructor_from_course(cid)
             messagebox.showinfo('Unassigned', f'Instructor cleared for {cid}.')
-            self.refresh_all()
         except ValidationError as e:
             messagebox.showerror('Unassign error', str(e))
 
@@ -557,6 +674,7 @@ Parameters:
             self.refresh_instructors(q)
         else:
             self.refresh_courses(q)
+        self.views.clean(scope.lower())
 
     def clear_search(self):
         '''"""Clear search.
@@ -565,6 +683,28 @@ Parameters:
         self.var_search.set('')
         self.apply_search()
 
+    def apply_filter(self):
+        '''"""Apply filter to the view chosen in the search scope; the criteria run as one SQL query.
+
+Blank age and size boxes (or anything that is not a whole number) mean "any"; 0 is a real bound.
+"""'''
+        view = self.var_search_scope.get().lower()
+        values = {'min_age': bound_value(self.var_f_min_age.get()), 'max_age': bound_value(self.var_f_max_age.get()), 'course_id': self.var_f_course.get(), 'instructor_id': self.var_f_instructor.get(), 'empty': self.var_f_empty.get(), 'min_size': bound_value(self.var_f_min_size.get())}
+        self.filters[view] = view_filter(view, values)
+        self.apply_search()
+
+    def clear_filter(self):
+        '''"""Clear filter.
+
+"""'''
+        for var in (self.var_f_min_age, self.var_f_max_age, self.var_f_min_size):
+            var.set('')
+        self.var_f_course.set('')
+        self.var_f_instructor.set('')
+        self.var_f_empty.set(False)
+        self.filters[self.var_search_scope.get().lower()] = None
+        self.apply_search()
+
     def export_csv(self):
         '''"""Export csv.
 
@@ -573,25 +713,7 @@ Parameters:
         if not folder:
             return
         try:
-            with open(f'{folder}/students.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['student_id', 'name', 'age', 'email', 'registered_course_ids'])
-                for s in self.ds.list_students():
-                    course_ids = self.ds.student_courses(s.student_id)
-                    w.writerow([s.student_id, s.name, s.age, s.email, ';'.join(course_ids)])
-            with open(f'{folder}/instructors.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['instructor_id', 'name', 'age', 'email', 'assigned_course_ids'])
-                courses = self.ds.list_courses()
-                for i in self.ds.list_instructors():
-                    assigned = [c.course_id for c in courses if c.instructor_id == i.instructor_id]
-                    w.writerow([i.instructor_id, i.name, i.age, i.email, ';'.join(assigned)])
-            with open(f'{folder}/courses.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['course_id', 'course_name', 'instructor_id', 'enrolled_student_ids'])
-                for c in self.ds.list_courses():
-                    s_ids = self.ds.course_students(c.course_id)
-                    w.writerow([c.course_id, c.course_name, c.instructor_id or '', ';'.join(s_ids)])
+            self.ds.export_csv(folder)
             messagebox.showinfo('Exported', f'CSV files saved to:\n{folder}')
         except Exception as e:
             messagebox.showerror('Export error', str(e))
@@ -620,7 +742,12 @@ Parameters:
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            for s in data.get('students', []):
+            reports = {key: validate_batch(data.get(key, []), kind) for key, kind in (('students', 'student'), ('instructors', 'instructor'), ('courses', 'course'))}
+            skip = {key: r.rejected_rows() for key, r in reports.items()}
+            rejected = sum((len(rows) for rows in skip.values()))
+            for n, s in enumerate(data.get('students', [])):
+                if n in skip['students']:
+                    continue
                 sid = s.get('student_id', '').strip()
                 name = s.get('name', '')
                 age = int(s.get('age', 0))
@@ -629,7 +756,9 @@ Parameters:
                     self.ds.add_student(name, age, email, sid)
                 except ValidationError:
                     self.ds.update_student(sid, name=name, age=age, email=email)
-            for i in data.get('instructors', []):
+            for n, i in enumerate(data.get('instructors', [])):
+                if n in skip['instructors']:
+                    continue
                 iid = i.get('instructor_id', '').strip()
                 name = i.get('name', '')
                 age = int(i.get('age', 0))
@@ -638,7 +767,9 @@ Parameters:
                     self.ds.add_instructor(name, age, email, iid)
                 except ValidationError:
                     self.ds.update_instructor(iid, name=name, age=age, email=email)
-            for c in data.get('courses', []):
+            for n, c in enumerate(data.get('courses', [])):
+                if n in skip['courses']:
+                    continue
                 cid = c.get('course_id', '').strip()
                 cname = c.get('course_name', '')
                 instr = c.get('instructor_id', None)
@@ -651,7 +782,9 @@ Parameters:
                         self.ds.assign_instructor_to_course(instr, cid)
                     except ValidationError:
                         pass
-            for c in data.get('courses', []):
+            for n, c in enumerate(data.get('courses', [])):
+                if n in skip['courses']:
+                    continue
                 cid = c.get('course_id', '').strip()
                 for sid in c.get('students', []):
                     try:
@@ -659,7 +792,10 @@ Parameters:
                     except ValidationError:
                         pass
             self.refresh_all()
-            messagebox.showinfo('Loaded', f'Data loaded from JSON:\n{path}')
+            msg = f'Data loaded from JSON:\n{path}'
+            if rejected:
+                msg += f'\n{rejected} invalid row(s) skipped.'
+            messagebox.showinfo('Loaded', msg)
         except Exception as e:
             messagebox.showerror('Load JSON error', str(e))
 
@@ -668,27 +804,77 @@ Parameters:
 
 """'''
         try:
+            self.loader.cancel_all()
             self.ds.close()
         except:
             pass
         self.ds = DataStore()
+        self.ds.subscribe(self.on_db_change)
         self.refresh_all()
         messagebox.showinfo('Reloaded', 'Re-opened database.')
 
     def refresh_all(self):
         '''"""Refresh all.
 
+Every tab is marked stale; only the visible one is rebuilt now.
 """'''
-        self.refresh_students()
-        self.refresh_instructors()
-        self.refresh_courses()
-        self.fill_relation_dropdowns()
+        self.invalidate()
+
+    def invalidate(self, *tables):
+        '''    """Rebuild the visible tab if it shows any of tables and mark the other affected tabs stale.
+
+Parameters:
+    tables: tables a write touched; none means all.
+    """'''
+        self.metrics.begin_tick()
+        self.views.invalidate(*tables)
+        with self.metrics.measure('relations'):
+            self.fill_relation_dropdowns()
+
+    def on_db_change(self, tables):
+        '''    """Store subscriber: collect the changed tables and refresh once the current event is done.
+
+Parameters:
+    tables: tables a committed write touched.
+    """'''
+        if not self.pending_tables:
+            self.after_idle(self.flush_changes)
+        self.pending_tables.update(tables)
+
+    def flush_changes(self):
+        '''"""Invalidate every table reported since the last flush.
+
+"""'''
+        tables, self.pending_tables = (self.pending_tables, set())
+        if tables:
+            self.invalidate(*tables)
+
+    def toggle_diagnostics(self):
+        '''"""Show or hide the refresh-timing status bar.
+
+"""'''
+        if self.var_diagnostics.get():
+            self.lbl_status.pack(side=tk.BOTTOM, fill=tk.X, before=self.nb)
+            self.show_metrics(self.metrics)
+        else:
+            self.lbl_status.pack_forget()
+
+    def show_metrics(self, metrics: RefreshMetrics):
+        '''    """Put the latest refresh timings in the status bar.
+
+Parameters:
+    metrics: parameter.
+    """'''
+        if self.var_diagnostics.get():
+            self.lbl_status.configure(text=metrics.summary())
 
     def on_close(self):
         '''"""Gracefully handle application shutdown and resource cleanup.
 
 """'''
         try:
+            self.watcher.stop()
+            self.loader.cancel_all()
             self.ds.close()
         finally:
             self.destroy()
@@ -15,16 +15,20 @@ Contents:
 """'''
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
 from db_store import DBStore, ValidationError
+from ui_support import AUTO_REFRESH_MS, AdaptiveScheduler, DirtyViews, PagedLoader, RefreshMetrics, SortOrder, VIEW_TABLES, bound_value, capacity_text, keyset_rows, parse_capacity, seats_text, view_filter
+from tk_support import DBWatcher, IdPicker, TreeRows
 
 class App(tk.Tk):
     """Top-level Tkinter GUI application that provides tabs for Students, Instructors, Courses, and Relations."""
 
-    def __init__(self):
-        '''"""  init  .
+    def __init__(self, lazy_start: bool=True, diagnostics: bool=False):
+        '''    """  init  .
 
-"""'''
+Parameters:
+    lazy_start: paint the window first, then build the Relations tab on first visit and stream table rows in pages.
+    diagnostics: start with the refresh-timing status bar visible.
+    """'''
         super().__init__()
         self.title('School Management System (SQLite)')
         self.geometry('1100x680')
@@ -33,10 +37,29 @@ class App(tk.Tk):
         self.sel_instructor_id = None
         self.sel_course_id = None
         self._auto_refresh_enabled = tk.BooleanVar(value=False)
-        self._auto_refresh_job = None
+        self._auto_refresh_label = tk.StringVar()
+        self._metrics = RefreshMetrics(AUTO_REFRESH_MS)
+        self._sort = SortOrder()
+        self._filters = dict.fromkeys(VIEW_TABLES)
+        self._diagnostics_enabled = tk.BooleanVar(value=diagnostics)
         self._build_toolbar()
+        self._loader = PagedLoader(lambda fn: self.after(1, fn), metrics=self._metrics)
+        self._scheduler = AdaptiveScheduler(self.after, lambda: self.db.poll_changes(), busy=self._refresh_busy, active=self._window_active, metrics=self._metrics)
+        self._scheduler.listener = self._show_interval
+        self._show_interval(self._scheduler)
+        self._lazy_start = lazy_start
+        self._views = DirtyViews({'students': self._refresh_students, 'instructors': self._refresh_instructors, 'courses': self._refresh_courses}, self._visible_view)
         self._build_tabs()
-        self._refresh_all()
+        self.lbl_status = ttk.Label(self, anchor='w', padding=(6, 2), relief=tk.SUNKEN)
+        self._metrics.listener = self._show_metrics
+        self._toggle_diagnostics()
+        if lazy_start:
+            self.after_idle(self._refresh_all)
+        else:
+            self._refresh_all()
+        self._pending_tables = set()
+        self.db.subscribe(self._on_db_change)
+        self._watcher = DBWatcher(self, self.db.db_path, lambda: self.db.poll_changes())
         self.protocol('WM_DELETE_WINDOW', self.on_close)
 
     def _build_toolbar(self):
@@ -52,11 +75,36 @@ class App(tk.Tk):
         ent = ttk.Entry(bar, textvariable=self.var_search, width=32)
         ent.pack(side=tk.LEFT, padx=4)
         ent.bind('<KeyRelease>', lambda e: self._apply_search())
+        self.var_prefix = tk.BooleanVar(value=False)
+        ttk.Checkbutton(bar, text='Word starts', variable=self.var_prefix, command=self._apply_search).pack(side=tk.LEFT, padx=4)
         ttk.Label(bar, text=' in ').pack(side=tk.LEFT)
         self.var_search_scope = tk.StringVar(value='Students')
         ttk.Combobox(bar, textvariable=self.var_search_scope, values=['Students', 'Instructors', 'Courses'], width=12, state='readonly').pack(side=tk.LEFT, padx=4)
         ttk.Button(bar, text='Clear', command=self._clear_search).pack(side=tk.LEFT, padx=4)
-        ttk.Checkbutton(bar, text='Auto-Refresh', variable=self._auto_refresh_enabled, command=self._toggle_auto_refresh).pack(side=tk.RIGHT, padx=6)
+        ttk.Checkbutton(bar, text='Diagnostics', variable=self._diagnostics_enabled, command=self._toggle_diagnostics).pack(side=tk.RIGHT, padx=6)
+        ttk.Checkbutton(bar, textvariable=self._auto_refresh_label, variable=self._auto_refresh_enabled, command=self._toggle_auto_refresh).pack(side=tk.RIGHT, padx=6)
+        fbar = ttk.Frame(self, padding=(6, 0, 6, 6))
+        fbar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(fbar, text='Filter: age').pack(side=tk.LEFT, padx=(0, 4))
+        self.var_f_min_age = tk.StringVar()
+        self.var_f_max_age = tk.StringVar()
+        ttk.Spinbox(fbar, from_=0, to=150, textvariable=self.var_f_min_age, width=5).pack(side=tk.LEFT)
+        ttk.Label(fbar, text=' to ').pack(side=tk.LEFT)
+        ttk.Spinbox(fbar, from_=0, to=150, textvariable=self.var_f_max_age, width=5).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='  course').pack(side=tk.LEFT, padx=(8, 4))
+        self.var_f_course = tk.StringVar()
+        ttk.Entry(fbar, textvariable=self.var_f_course, width=12).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='  instructor').pack(side=tk.LEFT, padx=(8, 4))
+        self.var_f_instructor = tk.StringVar()
+        ttk.Entry(fbar, textvariable=self.var_f_instructor, width=12).pack(side=tk.LEFT)
+        self.var_f_empty = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fbar, text='No courses / students', variable=self.var_f_empty).pack(side=tk.LEFT, padx=8)
+        ttk.Label(fbar, text='size ≥').pack(side=tk.LEFT, padx=(0, 4))
+        self.var_f_min_size = tk.StringVar()
+        ttk.Spinbox(fbar, from_=0, to=100000, textvariable=self.var_f_min_size, width=7).pack(side=tk.LEFT)
+        ttk.Label(fbar, text='(blank = any)').pack(side=tk.LEFT, padx=4)
+        ttk.Button(fbar, text='Apply Filter', command=self._apply_filter).pack(side=tk.LEFT, padx=4)
+        ttk.Button(fbar, text='Clear Filter', command=self._clear_filter).pack(side=tk.LEFT, padx=4)
 
     def _backup(self):
         '''""" backup.
@@ -79,25 +127,7 @@ class App(tk.Tk):
         if not folder:
             return
         try:
-            with open(f'{folder}/students.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['student_id', 'name', 'age', 'email', 'registered_course_ids'])
-                for s in self.db.list_students():
-                    course_ids = self.db.student_courses(s.student_id)
-                    w.writerow([s.student_id, s.name, s.age, s.email, ';'.join(course_ids)])
-            with open(f'{folder}/instructors.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['instructor_id', 'name', 'age', 'email', 'assigned_course_ids'])
-                courses = self.db.list_courses()
-                for i in self.db.list_instructors():
-                    assigned = [c.course_id for c in courses if c.instructor_id == i.instructor_id]
-                    w.writerow([i.instructor_id, i.name, i.age, i.email, ';'.join(assigned)])
-            with open(f'{folder}/courses.csv', 'w', newline='', encoding='utf-8') as f:
-                w = csv.writer(f)
-                w.writerow(['course_id', 'course_name', 'instructor_id', 'enrolled_student_ids'])
-                for c in self.db.list_courses():
-                    s_ids = self.db.course_students(c.course_id)
-                    w.writerow([c.course_id, c.course_name, c.instructor_id or '', ';'.join(s_ids)])
+            self.db.export_csv(folder)
             messagebox.showinfo('Exported', f'CSV files saved to:\n{folder}')
         except Exception as e:
             messagebox.showerror('Export error', str(e))
@@ -119,8 +149,53 @@ class App(tk.Tk):
         self._build_students_tab()
         self._build_instructors_tab()
         self._build_courses_tab()
+        self.nb = nb
+        self._relations_built = False
+        if not self._lazy_start:
+            self._ensure_relations_tab()
+        nb.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+
+    def _ensure_relations_tab(self):
+        '''"""Build the Relations tab once, the first time it is needed.
+
+"""'''
+        if self._relations_built:
+            return
+        self._relations_built = True
         self._build_relations_tab()
 
+    def _on_tab_changed(self, event=None):
+        '''    """Build the Relations tab on its first visit and catch up a stale table tab.
+
+Parameters:
+    event: parameter.
+    """'''
+        if self.nb.select() == str(self.tab_relations) and (not self._relations_built):
+            self._ensure_relations_tab()
+            self._fill_relation_dd()
+        self._views.show(self._visible_view())
+
+    def _visible_view(self):
+        '''"""Name of the table tab on screen, or None for the Relations tab.
+
+"""'''
+        return {str(self.tab_students): 'students', str(self.tab_instructors): 'instructors', str(self.tab_courses): 'courses'}.get(self.nb.select())
+
+    def _sort_by(self, view: str, column: int):
+        '''    """ sort a table view by the clicked column (click again to reverse); the ordering runs in SQL.
+
+Parameters:
+    view: parameter.
+    column: parameter.
+    """'''
+        column, descending = self._sort.click(view, column)
+        tree, rows, refresh = {'students': (self.tree_students, self.rows_students, self._refresh_students), 'instructors': (self.tree_instructors, self.rows_instructors, self._refresh_instructors), 'courses': (self.tree_courses, self.rows_courses, self._refresh_courses)}[view]
+        for i, c in enumerate(tree['columns']):
+            tree.heading(c, text=c.capitalize() + ((' ▼' if descending else ' ▲') if i == column else ''))
+        rows.clear()
+        refresh(self.var_search.get().strip() if self.var_search_scope.get().lower() == view else '')
+        self._views.clean(view)
+
     def _build_students_tab(self):
         '''""" build students tab.
 
@@ -148,12 +223,13 @@ class App(tk.Tk):
         ttk.Button(btns, text='Update', command=self._update_student).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self._delete_student).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self._clear_student_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'age', 'email', 'courses')
+        cols = ('id', 'name', 'age', 'email', 'courses', 'count')
         self.tree_students = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (110, 180, 60, 220, 360)):
-            self.tree_students.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (110, 180, 60, 220, 300, 60)):
+            self.tree_students.heading(c, text=c.capitalize(), command=lambda c=c: self._sort_by('students', cols.index(c)))
             self.tree_students.column(c, width=w, anchor='w')
         self.tree_students.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_students = TreeRows(self.tree_students)
         self.tree_students.bind('<<TreeviewSelect>>', self._on_student_select)
 
     def _add_student(self):
@@ -164,7 +240,6 @@ class App(tk.Tk):
             self.db.add_student(self.s_name.get(), int(self.s_age.get()), self.s_email.get(), self.s_id.get())
             messagebox.showinfo('Success', 'Student added')
             self._clear_student_form()
-            self._refresh_all()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Add error', str(e))
 
@@ -177,7 +252,6 @@ class App(tk.Tk):
         try:
             self.db.update_student(self.sel_student_id, name=self.s_name.get(), age=int(self.s_age.get()), email=self.s_email.get())
             messagebox.showinfo('Updated', 'Student updated')
-            self._refresh_all()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Update error', str(e))
 
@@ -191,7 +265,6 @@ class App(tk.Tk):
             return
         self.db.delete_student(self.sel_student_id)
         self._clear_student_form()
-        self._refresh_all()
 
     def _clear_student_form(self):
         '''""" clear student form.
@@ -212,7 +285,7 @@ Parameters:
         sel = self.tree_students.selection()
         if not sel:
             return
-        sid, name, age, email, _ = self.tree_students.item(sel[0], 'values')
+        sid, name, age, email, _, _ = self.tree_students.item(sel[0], 'values')
         self.sel_student_id = sid
         self.s_id.set(sid)
         self.s_name.set(name)
@@ -225,13 +298,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_students.delete(*self.tree_students.get_children())
-        ft = (filter_text or '').lower()
-        for s in self.db.list_students():
-            courses = ', '.join(self.db.student_courses(s.student_id)) or 'None'
-            row = (s.student_id, s.name, s.age, s.email, courses)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_students.insert('', tk.END, values=row)
+        self.rows_students.begin()
+        hits = self.db.match_ids('students', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for s in keyset_rows(self.db.list_students, 'student_id', where=self._filters['students'], **self._sort.kwargs('students')):
+                if hits is not None and s.student_id not in hits:
+                    continue
+                courses = ', '.join(self.db.student_courses(s.student_id)) if s.course_count else 'None'
+                row = (s.student_id, s.name, s.age, s.email, courses, s.course_count)
+                yield row
+        self._loader.start('students', rows(), self.rows_students.feed, self.rows_students.end)
 
     def _build_instructors_tab(self):
         '''""" build instructors tab.
@@ -260,12 +337,13 @@ Parameters:
         ttk.Button(btns, text='Update', command=self._update_instructor).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self._delete_instructor).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self._clear_instructor_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'age', 'email', 'courses')
+        cols = ('id', 'name', 'age', 'email', 'courses', 'count')
         self.tree_instructors = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (120, 180, 60, 220, 360)):
-            self.tree_instructors.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (120, 180, 60, 220, 300, 60)):
+            self.tree_instructors.heading(c, text=c.capitalize(), command=lambda c=c: self._sort_by('instructors', cols.index(c)))
             self.tree_instructors.column(c, width=w, anchor='w')
         self.tree_instructors.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_instructors = TreeRows(self.tree_instructors)
         self.tree_instructors.bind('<<TreeviewSelect>>', self._on_instructor_select)
 
     def _add_instructor(self):
@@ -276,7 +354,6 @@ Parameters:
             self.db.add_instructor(self.i_name.get(), int(self.i_age.get()), self.i_email.get(), self.i_id.get())
             messagebox.showinfo('Success', 'Instructor added')
             self._clear_instructor_form()
-            self._refresh_all()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Add error', str(e))
 
@@ -289,7 +366,6 @@ Parameters:
         try:
             self.db.update_instructor(self.sel_instructor_id, name=self.i_name.get(), age=int(self.i_age.get()), email=self.i_email.get())
             messagebox.showinfo('Updated', 'Instructor updated')
-            self._refresh_all()
         except (ValidationError, ValueError) as e:
             messagebox.showerror('Update error', str(e))
 
@@ -303,7 +379,6 @@ Parameters:
             return
         self.db.delete_instructor(self.sel_instructor_id)
         self._clear_instructor_form()
-        self._refresh_all()
 
     def _clear_instructor_form(self):
         '''""" clear instructor form.
@@ -324,7 +399,7 @@ Parameters:
         sel = self.tree_instructors.selection()
         if not sel:
             return
-        iid, name, age, email, _ = self.tree_instructors.item(sel[0], 'values')
+        iid, name, age, email, _, _ = self.tree_instructors.item(sel[0], 'values')
         self.sel_instructor_id = iid
         self.i_id.set(iid)
         self.i_name.set(name)
@@ -337,14 +412,17 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_instructors.delete(*self.tree_instructors.get_children())
-        ft = (filter_text or '').lower()
-        all_courses = self.db.list_courses()
-        for i in self.db.list_instructors():
-            course_ids = [c.course_id for c in all_courses if c.instructor_id == i.instructor_id]
-            row = (i.instructor_id, i.name, i.age, i.email, ', '.join(course_ids) or 'None')
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_instructors.insert('', tk.END, values=row)
+        self.rows_instructors.begin()
+        hits = self.db.match_ids('instructors', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for i in keyset_rows(self.db.list_instructors, 'instructor_id', where=self._filters['instructors'], **self._sort.kwargs('instructors')):
+                if hits is not None and i.instructor_id not in hits:
+                    continue
+                courses = ', '.join(self.db.instructor_courses(i.instructor_id)) if i.course_count else 'None'
+                row = (i.instructor_id, i.name, i.age, i.email, courses, i.course_count)
+                yield row
+        self._loader.start('instructors', rows(), self.rows_instructors.feed, self.rows_instructors.end)
 
     def _build_courses_tab(self):
         '''""" build courses tab.
@@ -355,24 +433,29 @@ Parameters:
         form.pack(side=tk.TOP, fill=tk.X)
         self.c_id = tk.StringVar()
         self.c_name = tk.StringVar()
+        self.c_capacity = tk.StringVar()
         grid = ttk.Frame(form)
         grid.pack(fill=tk.X)
         ttk.Label(grid, text='Course ID').grid(row=0, column=0, sticky='w', padx=4, pady=4)
         ttk.Entry(grid, textvariable=self.c_id, width=18).grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(grid, text='Course Name').grid(row=0, column=2, sticky='w', padx=4, pady=4)
         ttk.Entry(grid, textvariable=self.c_name, width=30).grid(row=0, column=3, padx=4, pady=4)
+        ttk.Label(grid, text='Capacity').grid(row=0, column=4, sticky='w', padx=4, pady=4)
+        ttk.Entry(grid, textvariable=self.c_capacity, width=8).grid(row=0, column=5, padx=4, pady=4)
         btns = ttk.Frame(form)
         btns.pack(fill=tk.X, pady=6)
         ttk.Button(btns, text='Add', command=self._add_course).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Update Name', command=self._update_course).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btns, text='Set Capacity', command=self._set_course_capacity).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Delete', command=self._delete_course).pack(side=tk.LEFT, padx=2)
         ttk.Button(btns, text='Clear Form', command=self._clear_course_form).pack(side=tk.LEFT, padx=8)
-        cols = ('id', 'name', 'instructor', 'students')
+        cols = ('id', 'name', 'instructor', 'students', 'seats')
         self.tree_courses = ttk.Treeview(frm, columns=cols, show='headings', height=12)
-        for c, w in zip(cols, (120, 260, 160, 460)):
-            self.tree_courses.heading(c, text=c.capitalize())
+        for c, w in zip(cols, (120, 260, 160, 380, 80)):
+            self.tree_courses.heading(c, text=c.capitalize(), command=lambda c=c: self._sort_by('courses', cols.index(c)))
             self.tree_courses.column(c, width=w, anchor='w')
         self.tree_courses.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.rows_courses = TreeRows(self.tree_courses)
         self.tree_courses.bind('<<TreeviewSelect>>', self._on_course_select)
 
     def _add_course(self):
@@ -380,10 +463,9 @@ Parameters:
 
 """'''
         try:
-            self.db.add_course(self.c_id.get(), self.c_name.get())
+            self.db.add_course(self.c_id.get(), self.c_name.get(), parse_capacity(self.c_capacity.get()))
             messagebox.showinfo('Success', 'Course added')
             self._clear_course_form()
-            self._refresh_all()
         except ValidationError as e:
             messagebox.showerror('Add error', str(e))
 
@@ -396,7 +478,18 @@ Parameters:
         try:
             self.db.update_course_name(self.sel_course_id, self.c_name.get())
             messagebox.showinfo('Updated', 'Course renamed')
-            self._refresh_all()
+        except ValidationError as e:
+            messagebox.showerror('Update error', str(e))
+
+    def _set_course_capacity(self):
+        '''""" set course capacity.
+
+"""'''
+        if not self.sel_course_id:
+            return messagebox.showerror('No selection', 'Select a course')
+        try:
+            self.db.set_course_capacity(self.sel_course_id, parse_capacity(self.c_capacity.get()))
+            messagebox.showinfo('Updated', 'Course capacity set')
         except ValidationError as e:
             messagebox.showerror('Update error', str(e))
 
@@ -410,7 +503,6 @@ Parameters:
             return
         self.db.delete_course(self.sel_course_id)
         self._clear_course_form()
-        self._refresh_all()
 
     def _clear_course_form(self):
         '''""" clear course form.
@@ -419,6 +511,7 @@ Parameters:
         self.sel_course_id = None
         self.c_id.set('')
         self.c_name.set('')
+        self.c_capacity.set('')
 
     def _on_course_select(self, _):
         '''    """ on course select.
@@ -429,10 +522,11 @@ Parameters:
         sel = self.tree_courses.selection()
         if not sel:
             return
-        cid, name, _ins, _students = self.tree_courses.item(sel[0], 'values')
+        cid, name, _ins, _students, seats = self.tree_courses.item(sel[0], 'values')
         self.sel_course_id = cid
         self.c_id.set(cid)
         self.c_name.set(name)
+        self.c_capacity.set(capacity_text(seats))
 
     def _refresh_courses(self, filter_text: str=''):
         '''    """ refresh courses.
@@ -440,14 +534,18 @@ Parameters:
 Parameters:
     filter_text: parameter.
     """'''
-        self.tree_courses.delete(*self.tree_courses.get_children())
-        ft = (filter_text or '').lower()
-        for c in self.db.list_courses():
-            ins = c.instructor_id or 'None'
-            students = ', '.join(self.db.course_students(c.course_id)) or 'None'
-            row = (c.course_id, c.course_name, ins, students)
-            if not ft or any((ft in str(x).lower() for x in row)):
-                self.tree_courses.insert('', tk.END, values=row)
+        self.rows_courses.begin()
+        hits = self.db.match_ids('courses', filter_text, self.var_prefix.get()) if filter_text else None
+
+        def rows():
+            for c in keyset_rows(self.db.list_courses, 'course_id', where=self._filters['courses'], **self._sort.kwargs('courses')):
+                if hits is not None and c.course_id not in hits:
+                    continue
+                ins = c.instructor_id or 'None'
+                students = ', '.join(self.db.course_students(c.course_id)) if c.enrolled_count else 'None'
+                row = (c.course_id, c.course_name, ins, students, seats_text(c.enrolled_count, c.capacity))
+                yield row
+        self._loader.start('courses', rows(), self.rows_courses.feed, self.rows_courses.end)
 
     def _build_relations_tab(self):
         '''""" build relations tab.
@@ -459,10 +557,10 @@ Parameters:
         self.var_student = tk.StringVar()
         self.var_course_enroll = tk.StringVar()
         ttk.Label(enroll, text='Student ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_student = ttk.Combobox(enroll, textvariable=self.var_student, width=20, state='readonly')
+        self.cmb_student = IdPicker(enroll, self._id_search('students'), textvariable=self.var_student, width=20)
         self.cmb_student.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(enroll, text='Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_enroll = ttk.Combobox(enroll, textvariable=self.var_course_enroll, width=20, state='readonly')
+        self.cmb_course_enroll = IdPicker(enroll, self._id_search('courses'), textvariable=self.var_course_enroll, width=20)
         self.cmb_course_enroll.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(enroll, text='Enroll', command=self._enroll_student).grid(row=0, column=4, padx=6, pady=4)
         assign = ttk.LabelFrame(frm, text='Assign Instructor to Course', padding=10)
@@ -470,10 +568,10 @@ Parameters:
         self.var_instructor = tk.StringVar()
         self.var_course_assign = tk.StringVar()
         ttk.Label(assign, text='Instructor ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_instructor = ttk.Combobox(assign, textvariable=self.var_instructor, width=20, state='readonly')
+        self.cmb_instructor = IdPicker(assign, self._id_search('instructors'), textvariable=self.var_instructor, width=20)
         self.cmb_instructor.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(assign, text='Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_assign = ttk.Combobox(assign, textvariable=self.var_course_assign, width=20, state='readonly')
+        self.cmb_course_assign = IdPicker(assign, self._id_search('courses'), textvariable=self.var_course_assign, width=20)
         self.cmb_course_assign.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(assign, text='Assign', command=self._assign_instructor).grid(row=0, column=4, padx=6, pady=4)
         drop = ttk.LabelFrame(frm, text='Drop / Unassign', padding=10)
@@ -482,29 +580,33 @@ Parameters:
         self.var_course_drop = tk.StringVar()
         self.var_course_unassign = tk.StringVar()
         ttk.Label(drop, text='Drop Student ID').grid(row=0, column=0, padx=4, pady=4, sticky='w')
-        self.cmb_student_drop = ttk.Combobox(drop, textvariable=self.var_student_drop, width=20, state='readonly')
+        self.cmb_student_drop = IdPicker(drop, self._id_search('students'), textvariable=self.var_student_drop, width=20)
         self.cmb_student_drop.grid(row=0, column=1, padx=4, pady=4)
         ttk.Label(drop, text='From Course ID').grid(row=0, column=2, padx=4, pady=4, sticky='w')
-        self.cmb_course_drop = ttk.Combobox(drop, textvariable=self.var_course_drop, width=20, state='readonly')
+        self.cmb_course_drop = IdPicker(drop, self._id_search('courses'), textvariable=self.var_course_drop, width=20)
         self.cmb_course_drop.grid(row=0, column=3, padx=4, pady=4)
         ttk.Button(drop, text='Drop', command=self._drop_student).grid(row=0, column=4, padx=6, pady=4)
         ttk.Label(drop, text='Unassign Instructor from Course ID').grid(row=1, column=0, padx=4, pady=8, sticky='w')
-        self.cmb_course_unassign = ttk.Combobox(drop, textvariable=self.var_course_unassign, width=20, state='readonly')
+        self.cmb_course_unassign = IdPicker(drop, self._id_search('courses'), textvariable=self.var_course_unassign, width=20)
         self.cmb_course_unassign.grid(row=1, column=1, padx=4, pady=8)
         ttk.Button(drop, text='Unassign', command=self._unassign_instructor).grid(row=1, column=2, padx=6, pady=8)
 
+    def _id_search(self, table: str):
+        '''    """Prefix search callable for an IdPicker, resolved against the current store at call time.
+
+Parameters:
+    table: parameter.
+    """'''
+        return lambda prefix, limit: self.db.search_ids(table, prefix, limit)
+
     def _fill_relation_dd(self):
         '''""" fill relation dd.
 
 """'''
-        self.cmb_student['values'] = [s.student_id for s in self.db.list_students()]
-        self.cmb_student_drop['values'] = [s.student_id for s in self.db.list_students()]
-        self.cmb_instructor['values'] = [i.instructor_id for i in self.db.list_instructors()]
-        cids = [c.course_id for c in self.db.list_courses()]
-        self.cmb_course_enroll['values'] = cids
-        self.cmb_course_assign['values'] = cids
-        self.cmb_course_drop['values'] = cids
-        self.cmb_course_unassign['values'] = cids
+        if not self._relations_built:
+            return
+        for picker in (self.cmb_student, self.cmb_student_drop, self.cmb_instructor, self.cmb_course_enroll, self.cmb_course_assign, self.cmb_course_drop, self.cmb_course_unassign):
+            picker.refresh()
 
     def _enroll_student(self):
         '''""" enroll student.
@@ -517,7 +619,6 @@ Parameters:
         try:
             self.db.enroll_student_in_course(sid, cid)
             messagebox.showinfo('Enrolled', f'{sid} → {cid}')
-            self._refresh_all()
         except ValidationError as e:
             messagebox.showerror('Enroll error', str(e))
 
@@ -532,7 +633,6 @@ Parameters:
         try:
             self.db.assign_instructor_to_course(iid, cid)
             messagebox.showinfo('Assigned', f'{iid} → {cid}')
-            self._refresh_all()
         except ValidationError as e:
             messagebox.showerror('Assign error', str(e))
 
@@ -547,7 +647,6 @@ Parameters:
         try:
             self.db.drop_student_from_course(sid, cid)
             messagebox.showinfo('Dropped', f'{sid} ✕ {cid}')
-            self._refresh_all()
         except ValidationError as e:
             messagebox.showerror('Drop error', str(e))
 
@@ -561,7 +660,6 @@ Parameters:
         try:
             self.db.unassign_instructor_from_course(cid)
             messagebox.showinfo('Unassigned', f'Cleared instructor for {cid}')
-            self._refresh_all()
         except ValidationError as e:
             messagebox.showerror('Unassign error', str(e))
 
@@ -577,6 +675,7 @@ Parameters:
             self._refresh_instructors(q)
         else:
             self._refresh_courses(q)
+        self._views.clean(scope.lower())
 
     def _clear_search(self):
         '''""" clear search.
@@ -585,48 +684,120 @@ Parameters:
         self.var_search.set('')
         self._apply_search()
 
+    def _apply_filter(self):
+        '''""" apply filter to the view chosen in the search scope; the criteria run as one SQL query.
+
+Blank age and size boxes (or anything that is not a whole number) mean "any"; 0 is a real bound.
+"""'''
+        view = self.var_search_scope.get().lower()
+        values = {'min_age': bound_value(self.var_f_min_age.get()), 'max_age': bound_value(self.var_f_max_age.get()), 'course_id': self.var_f_course.get(), 'instructor_id': self.var_f_instructor.get(), 'empty': self.var_f_empty.get(), 'min_size': bound_value(self.var_f_min_size.get())}
+        self._filters[view] = view_filter(view, values)
+        self._apply_search()
+
+    def _clear_filter(self):
+        '''""" clear filter.
+
+"""'''
+        for var in (self.var_f_min_age, self.var_f_max_age, self.var_f_min_size):
+            var.set('')
+        self.var_f_course.set('')
+        self.var_f_instructor.set('')
+        self.var_f_empty.set(False)
+        self._filters[self.var_search_scope.get().lower()] = None
+        self._apply_search()
+
     def _refresh_all(self):
         '''""" refresh all.
 
+Every tab is marked stale; only the visible one is rebuilt now.
 """'''
-        self._refresh_students()
-        self._refresh_instructors()
-        self._refresh_courses()
-        self._fill_relation_dd()
+        self._invalidate()
+
+    def _invalidate(self, *tables):
+        '''    """Rebuild the visible tab if it shows any of tables and mark the other affected tabs stale.
+
+Parameters:
+    tables: tables a write touched; none means all.
+    """'''
+        self._metrics.begin_tick()
+        self._views.invalidate(*tables)
+        with self._metrics.measure('relations'):
+            self._fill_relation_dd()
+
+    def _on_db_change(self, tables):
+        '''    """Store subscriber: collect the changed tables and refresh once the current event is done.
+
+Parameters:
+    tables: tables a committed write touched.
+    """'''
+        if not self._pending_tables:
+            self.after_idle(self._flush_changes)
+        self._pending_tables.update(tables)
+
+    def _flush_changes(self):
+        '''"""Invalidate every table reported since the last flush.
+
+"""'''
+        tables, self._pending_tables = (self._pending_tables, set())
+        if tables:
+            self._invalidate(*tables)
+
+    def _toggle_diagnostics(self):
+        '''"""Show or hide the refresh-timing status bar.
+
+"""'''
+        if self._diagnostics_enabled.get():
+            self.lbl_status.pack(side=tk.BOTTOM, fill=tk.X, before=self.nb)
+            self._show_metrics(self._metrics)
+        else:
+            self.lbl_status.pack_forget()
+
+    def _show_metrics(self, metrics: RefreshMetrics):
+        '''    """Put the latest refresh timings in the status bar.
+
+Parameters:
+    metrics: parameter.
+    """'''
+        if self._diagnostics_enabled.get():
+            self.lbl_status.configure(text=metrics.summary())
 
     def _toggle_auto_refresh(self):
         '''""" toggle auto refresh.
 
 """'''
         if self._auto_refresh_enabled.get():
-            self._schedule_auto_refresh()
+            self._scheduler.start()
         else:
-            self._cancel_auto_refresh()
+            self._scheduler.stop()
 
-    def _schedule_auto_refresh(self):
-        '''""" schedule auto refresh.
+    def _refresh_busy(self) -> bool:
+        '''"""True while a refresh is queued or still streaming rows.
 
 """'''
-        self._refresh_all()
-        self._auto_refresh_job = self.after(2000, self._schedule_auto_refresh)
+        return bool(self._pending_tables) or self._loader.busy()
 
-    def _cancel_auto_refresh(self):
-        '''""" cancel auto refresh.
+    def _window_active(self) -> bool:
+        '''"""False while the window is minimized or another application has the focus.
 
 """'''
-        if self._auto_refresh_job is not None:
-            try:
-                self.after_cancel(self._auto_refresh_job)
-            except Exception:
-                pass
-            self._auto_refresh_job = None
+        return self.state() != 'iconic' and self.focus_displayof() is not None
+
+    def _show_interval(self, scheduler: AdaptiveScheduler):
+        '''    """Show the current auto-refresh interval on its checkbox.
+
+Parameters:
+    scheduler: parameter.
+    """'''
+        self._auto_refresh_label.set(f'Auto-Refresh ({scheduler.label()})')
 
     def on_close(self):
         '''"""Gracefully handle application shutdown and resource cleanup.
 
 """'''
         try:
-            self._cancel_auto_refresh()
+            self._scheduler.stop()
+            self._watcher.stop()
+            self._loader.cancel_all()
             self.db.close()
         finally:
             self.destroy()
@@ -13,15 +13,11 @@ Contents:
 - Key classes and functions defined here
 - Notes on usage and important behaviors
 """'''
-import re
-
-class ValidationError(Exception):
-    """ValidationError class used within the School Management System."""
-    pass
+from validators import ValidationError, EMAIL_RE, check_name, check_age, check_email
 
 class Person:
     """Base class for people in the system with validated name, age, and email fields."""
-    EMAIL_RE = re.compile('^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$')
+    EMAIL_RE = EMAIL_RE
 
     def __init__(self, name: str, age: int, email: str):
         '''    """  init  .
@@ -35,6 +31,21 @@ Parameters:
         self.age = age
         self.email = email
 
+    @classmethod
+    def from_trusted(cls, name: str, age: int, email: str) -> 'Person':
+        '''    """Build an instance from already-validated data without running the setters.
+
+Parameters:
+    name: parameter.
+    age: parameter.
+    email: parameter.
+    """'''
+        obj = cls.__new__(cls)
+        obj._name = name
+        obj._age = age
+        obj._email = email
+        return obj
+
     @property
     def name(self) -> str:
         '''"""Name.
@@ -49,9 +60,8 @@ Parameters:
 Parameters:
     value: parameter.
     """'''
-        if not isinstance(value, str) or not value.strip():
-            raise ValidationError('Name cannot be empty.')
-        self._name = value.strip()
+        self._name = check_name(value)
+        self._changed()
 
     @property
     def age(self) -> int:
@@ -67,9 +77,7 @@ Parameters:
 Parameters:
     value: parameter.
     """'''
-        if not isinstance(value, int) or value < 0:
-            raise ValidationError('Age must be a non-negative integer.')
-        self._age = value
+        self._age = check_age(value)
 
     @property
     def email(self) -> str:
@@ -85,9 +93,16 @@ Parameters:
 Parameters:
     value: parameter.
     """'''
-        if not isinstance(value, str) or not self.EMAIL_RE.match(value):
-            raise ValidationError(f'Invalid email format: {value}')
-        self._email = value
+        self._email = check_email(value)
+        self._changed()
+
+    def _changed(self) -> None:
+        '''"""Notify the owning store (if any) that a searchable field changed, so its search index stays current.
+
+"""'''
+        on_change = self.__dict__.get('_on_change')
+        if on_change is not None:
+            on_change(self)
 
     def introduce(self) -> str:
         '''"""Return a concise descriptive string for the entity.
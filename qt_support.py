@@ -0,0 +1,184 @@
+'''"""
+PyQt Widgets — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- IdPicker: editable combobox with a QCompleter whose model is filled by prefix queries on demand
+- TableRows: KeyedRows for a QTableWidget, touching only the rows and cells that changed
+- DBWatcher: QFileSystemWatcher on the database files that asks the store to confirm changes
+- Used by the Relations tab of both PyQt front-ends instead of fully populated comboboxes
+"""'''
+import os
+from typing import Any, Callable, List
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QComboBox, QCompleter, QTableWidget, QTableWidgetItem
+from ui_support import PICKER_LIMIT, WATCH_DEBOUNCE_MS, KeyedRows, db_files
+
+class IdPicker(QComboBox):
+    """Type-ahead ID picker that only ever holds the current page of prefix matches.
+
+The completer model is re-queried as the user types, and the drop-down list is
+filled from the same query when opened. currentText() is the chosen ID.
+"""
+
+    def __init__(self, search: Callable[[str, int], List[str]], limit: int=PICKER_LIMIT, parent=None):
+        '''    """  init  .
+
+Parameters:
+    search: callable(prefix, limit) returning matching IDs, e.g. a bound DBStore.search_ids.
+    limit: matches kept in the model.
+    parent: parameter.
+    """'''
+        super().__init__(parent)
+        self.search = search
+        self.limit = limit
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        self.setMinimumContentsLength(16)
+        self.model_ids = QtCore.QStringListModel(self)
+        completer = QCompleter(self.model_ids, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCompleter(completer)
+        self.lineEdit().textEdited.connect(self._on_edited)
+
+    def _on_edited(self, text: str):
+        '''    """Refresh the completer model for the new prefix.
+
+Parameters:
+    text: parameter.
+    """'''
+        self.model_ids.setStringList(self.search(text, self.limit))
+        if self.model_ids.rowCount():
+            self.completer().complete()
+
+    def showPopup(self):
+        '''"""Fill the drop-down with the matches for the current text just before it opens.
+
+"""'''
+        text = self.currentText()
+        self.blockSignals(True)
+        self.clear()
+        self.addItems(self.search(text, self.limit))
+        self.setEditText(text)
+        self.blockSignals(False)
+        super().showPopup()
+
+    def refresh(self):
+        '''"""Re-run the query for the current text (after the data changed).
+
+"""'''
+        if self.completer().popup().isVisible():
+            self.model_ids.setStringList(self.search(self.currentText(), self.limit))
+
+class TableRows(KeyedRows):
+    """Keyed reconciliation against a QTableWidget whose rows are string tuples."""
+
+    def __init__(self, table: QTableWidget, key_column: int=0):
+        '''    """  init  .
+
+Parameters:
+    table: parameter.
+    key_column: parameter.
+    """'''
+        super().__init__(key_column)
+        self.table = table
+
+    def _insert(self, index: int, key: Any, row: tuple) -> None:
+        '''    """ insert.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    row: parameter.
+    """'''
+        self.table.insertRow(index)
+        for c, val in enumerate(row):
+            self.table.setItem(index, c, QTableWidgetItem(val))
+
+    def _update(self, index: int, key: Any, old: tuple, row: tuple) -> None:
+        '''    """Rewrite only the cells whose text changed.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    old: parameter.
+    row: parameter.
+    """'''
+        for c, (a, b) in enumerate(zip(old, row)):
+            if a != b:
+                self.table.item(index, c).setText(b)
+
+    def _delete(self, index: int, keys: List[Any]) -> None:
+        '''    """Truncate when the range runs to the end, else remove rows one by one.
+
+Parameters:
+    index: parameter.
+    keys: parameter.
+    """'''
+        if index + len(keys) == self.table.rowCount():
+            self.table.setRowCount(index)
+            return
+        for _ in keys:
+            self.table.removeRow(index)
+
+class DBWatcher(QtCore.QObject):
+    """Calls poll() shortly after the SQLite file, its WAL or its journal is written by any process.
+
+The directory is watched too, so a journal or WAL that appears later is picked
+up; bursts of notifications are debounced into one poll (normally
+DBStore.poll_changes, which checks PRAGMA data_version).
+"""
+
+    def __init__(self, db_path: str, poll: Callable[[], bool], parent=None, debounce_ms: int=WATCH_DEBOUNCE_MS):
+        '''    """  init  .
+
+Parameters:
+    db_path: parameter.
+    poll: called after the files changed.
+    parent: parameter.
+    debounce_ms: parameter.
+    """'''
+        super().__init__(parent)
+        self.paths = db_files(db_path)
+        self.poll = poll
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(lambda: self.poll())
+        self.fs = QtCore.QFileSystemWatcher(self)
+        self.fs.addPath(os.path.dirname(self.paths[0]))
+        self._watch_files()
+        self.fs.fileChanged.connect(self._touched)
+        self.fs.directoryChanged.connect(self._touched)
+
+    def _watch_files(self) -> None:
+        '''""" watch files.
+
+Files are re-added after SQLite deletes and recreates them.
+"""'''
+        watched = set(self.fs.files())
+        for path in self.paths:
+            if path not in watched and os.path.exists(path):
+                self.fs.addPath(path)
+
+    def _touched(self, path: str) -> None:
+        '''    """ touched.
+
+Parameters:
+    path: parameter.
+    """'''
+        self._watch_files()
+        self._timer.start()
+
+    def stop(self) -> None:
+        '''"""Stop watching.
+
+"""'''
+        self._timer.stop()
+        self.fs.removePaths(self.fs.files() + self.fs.directories())
@@ -0,0 +1,173 @@
+'''"""
+Registration Engine — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- RegistrationEngine: capacity-checked enrollment for many clerks working on one school.db at once
+- Each batch is one BEGIN IMMEDIATE transaction of conditional inserts, so a seat is claimed and counted atomically
+- EnrollResult: the outcome of one request, with a precise reason when it was refused
+- The capacity trigger installed by DBStore enforces the same rule on every other write path
+"""'''
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+from db_store import COURSE_FULL, DBStore, _SQL
+from person import ValidationError
+ENROLLED = 'enrolled'
+ALREADY_ENROLLED = 'already_enrolled'
+UNKNOWN_STUDENT = 'unknown_student'
+UNKNOWN_COURSE = 'unknown_course'
+ROLLED_BACK = 'rolled_back'
+REASONS = (ENROLLED, ALREADY_ENROLLED, COURSE_FULL, UNKNOWN_STUDENT, UNKNOWN_COURSE, ROLLED_BACK)
+DEFAULT_BUSY_TIMEOUT_MS = 30000
+_MESSAGES = {ENROLLED: "Student '{0}' enrolled in '{1}'.", ALREADY_ENROLLED: "Student '{0}' already enrolled in '{1}'.", COURSE_FULL: "Course '{1}' is full.", UNKNOWN_STUDENT: "Unknown student_id '{0}'.", UNKNOWN_COURSE: "Unknown course_id '{1}'.", ROLLED_BACK: "Enrollment of '{0}' in '{1}' was rolled back with its batch."}
+
+@dataclass(frozen=True)
+class EnrollResult:
+    """Outcome of one enrollment request; reason is one of REASONS."""
+    student_id: str
+    course_id: str
+    reason: str
+
+    @property
+    def ok(self) -> bool:
+        '''"""True when the student now holds a seat that this request claimed.
+
+"""'''
+        return self.reason == ENROLLED
+
+    @property
+    def message(self) -> str:
+        '''"""Human-readable outcome, worded like the DBStore errors.
+
+"""'''
+        return _MESSAGES[self.reason].format(self.student_id, self.course_id)
+
+    def raise_for_error(self) -> None:
+        '''"""Raise ValidationError with message unless the request succeeded.
+
+"""'''
+        if not self.ok:
+            raise ValidationError(self.message)
+
+class RegistrationEngine:
+    """Capacity-enforcing enrollment on a DBStore's connection, safe to run from many processes against one file.
+
+Every batch takes SQLite's write lock up front (BEGIN IMMEDIATE) and claims each
+seat with a single conditional INSERT, so the capacity check and the
+trigger-maintained enrolled_count update cannot interleave with another
+writer. Refusals are diagnosed inside the same transaction, against the same
+snapshot that refused them.
+"""
+
+    def __init__(self, db: DBStore, busy_timeout_ms: int=DEFAULT_BUSY_TIMEOUT_MS):
+        '''    """  init  .
+
+Parameters:
+    db: store whose connection the engine writes through; its caches and subscribers are notified after each commit.
+    busy_timeout_ms: how long a batch waits for another process's write lock before failing with sqlite3.OperationalError.
+    """'''
+        self.db = db
+        self.db.conn.execute(f'PRAGMA busy_timeout = {int(busy_timeout_ms)}')
+        self.stats: Dict[str, int] = dict.fromkeys(REASONS, 0)
+
+    def enroll(self, student_id: str, course_id: str) -> EnrollResult:
+        '''    """Claim one seat in its own transaction.
+
+Parameters:
+    student_id: parameter.
+    course_id: parameter.
+    """'''
+        return self.enroll_batch([(student_id, course_id)])[0]
+
+    def allocate(self, course_id: str, student_ids: Iterable[str], all_or_nothing: bool=False) -> List[EnrollResult]:
+        '''    """Hand out a course's free seats to students in the order given, in one transaction.
+
+Parameters:
+    course_id: parameter.
+    student_ids: parameter.
+    all_or_nothing: enroll nobody unless every student gets a seat.
+    """'''
+        return self.enroll_batch(((sid, course_id) for sid in student_ids), all_or_nothing)
+
+    def enroll_batch(self, pairs: Iterable[Tuple[str, str]], all_or_nothing: bool=False) -> List[EnrollResult]:
+        '''    """Process many enrollment requests under one write lock and one commit.
+
+Requests are served in order, so when a course fills up the earlier ones win.
+Returns one EnrollResult per pair. Raises ValidationError, without touching it,
+when the store's connection already has a transaction open: BEGIN IMMEDIATE
+cannot nest, and committing or rolling back the caller's work is the caller's call.
+
+Parameters:
+    pairs: (student_id, course_id) tuples.
+    all_or_nothing: roll the whole batch back if any request is refused; the requests that would have succeeded report ROLLED_BACK.
+    """'''
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        conn = self.db.conn
+        if conn.in_transaction:
+            raise ValidationError('Commit or roll back the open transaction before enrolling a batch.')
+        results = []
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for sid, cid in pairs:
+                if conn.execute(_SQL['claim_seat'], (sid, cid)).rowcount:
+                    results.append(EnrollResult(sid, cid, ENROLLED))
+                else:
+                    results.append(EnrollResult(sid, cid, self._refusal(sid, cid)))
+            if all_or_nothing and (not all((r.ok for r in results))):
+                conn.rollback()
+                results = [replace(r, reason=ROLLED_BACK) if r.ok else r for r in results]
+            else:
+                conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        for r in results:
+            self.stats[r.reason] += 1
+        if any((r.ok for r in results)):
+            self.db.notify_changed('registrations')
+        return results
+
+    def _refusal(self, student_id: str, course_id: str) -> str:
+        '''    """Reason the conditional insert for (student_id, course_id) inserted nothing; only runs on the failure path.
+
+Parameters:
+    student_id: parameter.
+    course_id: parameter.
+    """'''
+        student_ok, full, enrolled = self.db.conn.execute(_SQL['enroll_refusal'], (student_id, course_id)).fetchone()
+        if not student_ok:
+            return UNKNOWN_STUDENT
+        if full is None:
+            return UNKNOWN_COURSE
+        if enrolled:
+            return ALREADY_ENROLLED
+        return COURSE_FULL
+
+    def seats_left(self, course_id: str) -> Optional[int]:
+        '''    """Free seats in a course right now, or None when its capacity is unlimited.
+
+Parameters:
+    course_id: parameter.
+    """'''
+        row = self.db.conn.execute(_SQL['course_seats'], (course_id,)).fetchone()
+        if row is None:
+            raise ValidationError(f"Unknown course_id '{course_id}'.")
+        capacity, enrolled = row
+        return None if capacity is None else max(capacity - enrolled, 0)
+
+    def audit(self) -> Dict[str, List[str]]:
+        '''"""Courses holding more students than their capacity, and courses whose enrolled_count disagrees with registrations.
+
+Both lists are empty on a healthy file; the second query scans every registration.
+"""'''
+        conn = self.db.conn
+        return {'overbooked': [row[0] for row in conn.execute(_SQL['overbooked_courses'])], 'drifted': [row[0] for row in conn.execute(_SQL['drifted_courses'])]}
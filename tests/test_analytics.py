@@ -0,0 +1,76 @@
+import sqlite3
+import numpy as np
+import pytest
+from analytics import EnrollmentMatrix
+from db_store import DBStore
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    for n, age in enumerate((19, 22, 35)):
+        store.add_student(f'N{n}', age, f'n{n}@x.com', f'S{n}')
+    store.add_instructor('Ivy', 40, 'ivy@x.com', 'I1')
+    store.add_instructor('Jon', 50, 'jon@x.com', 'I2')
+    for cid in ('C1', 'C2', 'C3'):
+        store.add_course(cid, cid)
+    store.assign_instructor_to_course('I1', 'C1')
+    store.assign_instructor_to_course('I1', 'C2')
+    for sid, cid in (('S0', 'C1'), ('S1', 'C1'), ('S2', 'C1'), ('S0', 'C2'), ('S1', 'C2')):
+        store.enroll_student_in_course(sid, cid)
+    yield store
+    store.close()
+
+def test_counts(db):
+    m = EnrollmentMatrix.from_db(db)
+    assert m.students_per_course().tolist() == [3, 2, 0]
+    assert m.courses_per_student().tolist() == [2, 2, 1]
+    assert m.courses_per_instructor().tolist() == [2, 0]
+    assert m.students_per_instructor().tolist() == [5, 0]
+    assert m.unenrolled_students() == []
+    assert m.summary()['unassigned_courses'] == 1
+
+def test_csr_shape(db):
+    m = EnrollmentMatrix.from_db(db)
+    assert m.indptr.tolist() == [0, 3, 5, 5]
+    assert m.indices.tolist() == [0, 1, 2, 0, 1]
+    assert len(m.t_indptr) == m.n_students + 1 and m.n_registrations == 5
+    assert m.course_students('C2') == ['S0', 'S1']
+    assert m.student_courses('S2') == ['C1']
+
+def test_top_k_breaks_ties_by_id_order(db):
+    m = EnrollmentMatrix.from_db(db)
+    assert m.top_courses(2) == [('C1', 3), ('C2', 2)]
+    assert m.top_students(2) == [('S0', 2), ('S1', 2)]
+    assert m.top_k(m.course_ids, np.array([1, 5, 5]), 5) == [('C2', 5), ('C3', 5), ('C1', 1)]
+    assert m.top_k(m.course_ids, m.students_per_course(), 0) == []
+
+def test_snapshot_ignores_concurrent_commit(db):
+    db.conn.execute('PRAGMA journal_mode = wal')
+    real = db.conn
+
+    class Interleaving:
+
+        def __init__(self):
+            self.calls = 0
+
+        def __getattr__(self, name):
+            return getattr(real, name)
+
+        def execute(self, sql, *args):
+            cur = real.execute(sql, *args)
+            self.calls += 1
+            if self.calls == 2:
+                other = sqlite3.connect(db.db_path)
+                other.execute("INSERT INTO students(student_id,name,age,email) VALUES('S9','New',20,'new@x.com')")
+                other.execute("INSERT INTO courses(course_id,course_name) VALUES('C9','New')")
+                other.execute("INSERT INTO registrations(student_id,course_id) VALUES('S9','C9')")
+                other.commit()
+                other.close()
+            return cur
+    db.conn = Interleaving()
+    try:
+        m = EnrollmentMatrix.from_db(db)
+    finally:
+        db.conn = real
+    assert m.n_students == 3 and m.n_courses == 3 and m.n_registrations == 5
+    assert EnrollmentMatrix.from_db(db).n_registrations == 6
@@ -0,0 +1,70 @@
+import sqlite3
+import pytest
+import db_store
+from db_store import DBStore
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    store.add_student('Ann', 20, 'ann@x.com', 'S1')
+    store.add_course('C1', 'Math')
+    yield store
+    store.close()
+
+def _ids(rows):
+    return [getattr(r, 'student_id', None) or r.course_id for r in rows]
+
+def test_repeated_reads_hit_the_cache(db):
+    db.list_students()
+    hits = db.cache_info()['hits']
+    assert _ids(db.list_students()) == ['S1']
+    assert db.cache_info()['hits'] == hits + 1
+
+def test_write_invalidates_only_the_tables_it_touched(db):
+    db.list_students()
+    db.list_courses()
+    seen = []
+    db.subscribe(seen.append)
+    db.add_student('Bob', 21, 'bob@x.com', 'S2')
+    assert seen == [('students',)]
+    info = db.cache_info()
+    assert _ids(db.list_students()) == ['S1', 'S2']
+    assert db.cache_info()['misses'] == info['misses'] + 1
+    assert _ids(db.list_courses()) == ['C1']
+    assert db.cache_info()['hits'] == info['hits'] + 1
+
+def test_enrollment_refreshes_cached_relations_and_counts(db):
+    assert db.student_courses('S1') == []
+    assert db.list_courses()[0].enrolled_count == 0
+    db.enroll_student_in_course('S1', 'C1')
+    assert db.student_courses('S1') == ['C1']
+    assert db.course_students('C1') == ['S1']
+    assert db.list_courses()[0].enrolled_count == 1
+
+def test_commit_from_another_connection_bumps_data_version(db, monkeypatch):
+    monkeypatch.setattr(db_store, 'CACHE_CHECK_INTERVAL', 0.0)
+    assert _ids(db.list_students()) == ['S1']
+    seen = []
+    db.subscribe(seen.append)
+    other = sqlite3.connect(db.db_path)
+    try:
+        other.execute("INSERT INTO students(student_id,name,age,email) VALUES('S2','Bob',21,'bob@x.com')")
+        other.commit()
+    finally:
+        other.close()
+    assert _ids(db.list_students()) == ['S1', 'S2']
+    assert db.poll_changes()
+    assert seen == [db_store.TABLES]
+    assert not db.poll_changes()
+
+def test_poll_changes_ignores_own_commits(db):
+    db.list_students()
+    db.add_student('Bob', 21, 'bob@x.com', 'S2')
+    assert not db.poll_changes()
+
+def test_invalidate_cache_forces_a_reload(db):
+    db.list_students()
+    db.invalidate_cache()
+    misses = db.cache_info()['misses']
+    db.list_students()
+    assert db.cache_info()['misses'] == misses + 1
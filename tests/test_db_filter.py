@@ -0,0 +1,42 @@
+import pytest
+from db_filter import Filter, compile_filter
+from db_store import DBStore
+from ui_support import ANY_BOUND, bound_value, view_filter
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    store.add_student('Baby', 0, 'baby@x.com', 'S0')
+    store.add_student('Ann', 20, 'ann@x.com', 'S1')
+    store.add_course('C0', 'Empty')
+    store.add_course('C1', 'Math')
+    store.enroll_student_in_course('S1', 'C1')
+    yield store
+    store.close()
+
+def test_zero_bound_is_active():
+    assert Filter(max_age=0, max_size=0, min_age=0).active() == ('min_age', 'max_age', 'max_size')
+    assert Filter(no_courses=False, course_id='').active() == ()
+
+def test_zero_bound_is_compiled():
+    sql, params, _ = compile_filter('students', Filter(max_age=0))
+    assert sql == 's.age <= ?1' and params == (0,)
+
+def test_zero_bounds_filter_rows(db):
+    assert [s.student_id for s in db.list_students(where=Filter(max_age=0))] == ['S0']
+    assert [c.course_id for c in db.list_courses(where=Filter(max_size=0))] == ['C0']
+
+@pytest.mark.parametrize('value, expected', [(0, 0), ('0', 0), (' 18 ', 18), (ANY_BOUND, None), ('', None), ('abc', None), ('-3', None)])
+def test_bound_value(value, expected):
+    assert bound_value(value) == expected
+
+def test_view_filter_keeps_zero_bounds_like_the_compiled_filter(db):
+    any_bounds = {'min_age': None, 'max_age': None, 'course_id': ' ', 'instructor_id': '', 'empty': False, 'min_size': None}
+    assert view_filter('students', any_bounds) is None
+    where = view_filter('students', dict(any_bounds, max_age=0))
+    assert where == Filter(max_age=0)
+    assert [s.student_id for s in db.list_students(where=where)] == ['S0']
+    where = view_filter('courses', dict(any_bounds, min_size=0, max_age=0))
+    assert where == Filter(min_size=0)
+    assert [c.course_id for c in db.list_courses(where=where)] == ['C0', 'C1']
+    assert view_filter('courses', dict(any_bounds, empty=True)) == Filter(no_students=True)
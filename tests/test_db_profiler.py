@@ -0,0 +1,68 @@
+import sqlite3
+from db_profiler import ProfilingConnection, normalize_sql
+from db_store import DBStore
+
+def _by_sql(stats):
+    return {s['sql']: s for s in stats['statements']}
+
+def test_disabled_store_reports_no_statistics(tmp_path):
+    db = DBStore(str(tmp_path / 'school.db'))
+    try:
+        assert db.stats() == {'enabled': False, 'queries': 0, 'total_ms': 0.0, 'statements': []}
+        assert isinstance(db.conn, sqlite3.Connection)
+    finally:
+        db.close()
+
+def test_profiler_counts_statements_rows_and_histogram(tmp_path):
+    db = DBStore(str(tmp_path / 'school.db'), cache_size=0)
+    try:
+        db.enable_profiling(slow_ms=1000000.0)
+        assert isinstance(db.conn, ProfilingConnection)
+        for n in range(3):
+            db.add_student(f'S{n}', 20 + n, f's{n}@x.com', f'S{n}')
+        db.list_students()
+        db.list_students()
+        stats = db.stats()
+        assert stats['enabled']
+        assert stats['queries'] == sum((s['count'] for s in stats['statements']))
+        inserts = [s for s in stats['statements'] if s['sql'].upper().startswith('INSERT INTO STUDENTS')]
+        assert len(inserts) == 1
+        assert inserts[0]['count'] == 3 and inserts[0]['rows'] == 3
+        selects = [s for s in stats['statements'] if s['sql'].upper().startswith('SELECT') and 'FROM students' in s['sql'] and s['rows'] == 6]
+        assert len(selects) == 1 and selects[0]['count'] == 2
+        for s in stats['statements']:
+            assert sum(s['histogram'].values()) == s['count']
+            assert s['sql'] == normalize_sql(s['sql'])
+            assert s['plan'] is None
+    finally:
+        db.close()
+
+def test_slow_selects_go_to_sinks_with_a_plan(tmp_path):
+    db = DBStore(str(tmp_path / 'school.db'), cache_size=0)
+    events = []
+    try:
+        db.add_student('Ann', 20, 'ann@x.com', 'S1')
+        db.enable_profiling(slow_ms=0.0, sinks=[events.append])
+        db.list_students()
+        selects = [e for e in events if e['sql'].upper().startswith('SELECT')]
+        assert selects and selects[0]['rows'] == 1
+        assert selects[0]['plan'] and all((isinstance(line, str) for line in selects[0]['plan']))
+        assert 'ann@x.com' not in repr(events)
+    finally:
+        db.close()
+
+def test_disable_profiling_restores_the_raw_connection(tmp_path):
+    db = DBStore(str(tmp_path / 'school.db'), cache_size=0)
+    try:
+        raw = db.conn
+        db.enable_profiling()
+        db.list_students()
+        prof = db.disable_profiling()
+        assert db.conn is raw
+        queries = prof.snapshot()['queries']
+        assert queries >= 1
+        db.list_students()
+        assert db.stats()['enabled'] is False
+        assert prof.snapshot()['queries'] == queries
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+import sqlite3
+import pytest
+from db_store import DBStore
+from person import ValidationError
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    store.add_student('Ann', 20, 'ann@x.com', 'S1')
+    store.add_instructor('Ivy', 40, 'ivy@x.com', 'I1')
+    store.add_course('C1', 'Math', 1)
+    store.add_course('C2', 'Art')
+    store.enroll_student_in_course('S1', 'C1')
+    yield store
+    store.close()
+
+def _other_writer_can_commit(db):
+    other = sqlite3.connect(db.db_path, timeout=0)
+    try:
+        other.execute("INSERT INTO courses(course_id,course_name) VALUES('C9','Other')")
+        other.commit()
+    finally:
+        other.close()
+
+@pytest.mark.parametrize('student_id, course_id, message', [('S1', 'C1', 'already enrolled'), ('S9', 'C2', "Unknown student_id 'S9'"), ('S1', 'C9', "Unknown course_id 'C9'")])
+def test_refused_enrollment_releases_the_write_lock(db, student_id, course_id, message):
+    with pytest.raises(ValidationError, match=message):
+        db.enroll_student_in_course(student_id, course_id)
+    assert not db.conn.in_transaction
+    _other_writer_can_commit(db)
+
+def test_enrollment_refused_by_capacity_releases_the_write_lock(db):
+    db.add_student('Bob', 21, 'bob@x.com', 'S2')
+    with pytest.raises(ValidationError, match="Course 'C1' is full"):
+        db.enroll_student_in_course('S2', 'C1')
+    assert not db.conn.in_transaction
+    _other_writer_can_commit(db)
+
+@pytest.mark.parametrize('instructor_id, course_id, message', [('I9', 'C1', "Unknown instructor_id 'I9'"), ('I1', 'C9', "Unknown course_id 'C9'")])
+def test_refused_assignment_releases_the_write_lock(db, instructor_id, course_id, message):
+    with pytest.raises(ValidationError, match=message):
+        db.assign_instructor_to_course(instructor_id, course_id)
+    assert not db.conn.in_transaction
+    _other_writer_can_commit(db)
+
+@pytest.mark.parametrize('refused', [lambda db: db.enroll_student_in_course('S1', 'C1'), lambda db: db.enroll_student_in_course('S9', 'C2'), lambda db: db.assign_instructor_to_course('I9', 'C1'), lambda db: db.assign_instructor_to_course('I1', 'C9'), lambda db: db.set_course_capacity('C9', 5), lambda db: db.set_course_capacity('C1', 0), lambda db: db.enroll_many(['S1', 'S9'], 'C2')], ids=['duplicate', 'unknown-student', 'unknown-instructor', 'unknown-course', 'capacity-unknown-course', 'capacity-below-enrolled', 'batch-unknown-student'])
+def test_refusal_keeps_unrelated_pending_writes(db, refused):
+    db.conn.execute("UPDATE courses SET course_name='Algebra' WHERE course_id='C1'")
+    with pytest.raises(ValidationError):
+        refused(db)
+    assert db.conn.in_transaction
+    db.conn.commit()
+    assert [c.course_name for c in db.list_courses()] == ['Algebra', 'Art']
+    assert db.student_courses('S1') == ['C1']
+
+def test_refused_capacity_and_batch_release_the_write_lock(db):
+    with pytest.raises(ValidationError, match='below the 1 already enrolled'):
+        db.set_course_capacity('C1', 0)
+    with pytest.raises(ValidationError, match="Unknown student_id 'S9'"):
+        db.enroll_many(['S9'], 'C2')
+    assert not db.conn.in_transaction
+    _other_writer_can_commit(db)
+
+@pytest.mark.parametrize('student_ids', [[], ['S1']])
+def test_enroll_many_refuses_unknown_course(db, student_ids):
+    with pytest.raises(ValidationError, match="Unknown course_id 'C9'"):
+        db.enroll_many(student_ids, 'C9')
+    assert db.enroll_many([], 'C2') == 0
+    assert db.enroll_many(['S1', 'S1'], 'C2') == 1
+
+def test_vacuum_reclaims_free_pages(db):
+    for n in range(300):
+        db.add_student('Tmp', 20, f't{n}@x.com', f'T{n:03d}')
+    for n in range(300):
+        db.delete_student(f'T{n:03d}')
+    assert db.conn.execute('PRAGMA freelist_count').fetchone()[0] > 0
+    db.vacuum()
+    assert db.conn.execute('PRAGMA freelist_count').fetchone()[0] == 0
+    assert [s.student_id for s in db.list_students()] == ['S1']
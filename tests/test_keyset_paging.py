@@ -0,0 +1,80 @@
+import pytest
+from db_filter import Filter
+from db_store import SORT_KEYS, DBStore
+from person import ValidationError
+from ui_support import VIEW_SORT_KEYS
+PK = {'students': 'student_id', 'instructors': 'instructor_id', 'courses': 'course_id'}
+KEYS = {'students': {'id': lambda r: r.student_id, 'name': lambda r: r.name.lower(), 'age': lambda r: r.age, 'email': lambda r: r.email.lower(), 'courses': lambda r: r.course_count}, 'instructors': {'id': lambda r: r.instructor_id, 'name': lambda r: r.name.lower(), 'age': lambda r: r.age, 'email': lambda r: r.email.lower(), 'courses': lambda r: r.course_count}, 'courses': {'id': lambda r: r.course_id, 'name': lambda r: r.course_name.lower(), 'instructor': lambda r: r.instructor_id or '', 'students': lambda r: r.enrolled_count}}
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    store = DBStore(str(tmp_path_factory.mktemp('paging') / 'school.db'))
+    names = ['Ann', 'bob', 'ann', 'Bob', 'Cy', 'ann', 'Dee']
+    for n, name in enumerate(names):
+        store.add_student(name, 18 + n % 3, f'{name.lower()}{n % 2}@x{n}.com', f'S{n}')
+    for n, name in enumerate(['Ivy', 'ivy', 'Al', 'Ivy']):
+        store.add_instructor(name, 40 + n % 2, f'i{n}@x.com', f'I{n}')
+    for n, name in enumerate(['Math', 'art', 'Art', 'math', 'Bio', 'Art']):
+        store.add_course(f'C{n}', name)
+    for n, iid in enumerate(['I1', None, 'I0', 'I1', None, 'I0']):
+        if iid:
+            store.assign_instructor_to_course(iid, f'C{n}')
+    for cid, sids in {'C0': ['S0', 'S1', 'S2'], 'C1': ['S0', 'S3'], 'C2': ['S1', 'S4'], 'C3': ['S2'], 'C5': ['S5']}.items():
+        store.enroll_many(sids, cid)
+    yield store
+    store.close()
+
+def _expected(rows, table, key, descending):
+    pk = PK[table]
+    return sorted(rows, key=lambda r: (KEYS[table][key](r), getattr(r, pk)), reverse=descending)
+
+def _walk(db, table, page, **kwargs):
+    list_page = getattr(db, f'list_{table}')
+    out, after = ([], None)
+    while True:
+        rows = list_page(after_id=after, limit=page, **kwargs)
+        assert len(rows) <= page
+        out.extend(rows)
+        if len(rows) < page:
+            return out
+        after = getattr(rows[-1], PK[table])
+
+CASES = [(table, key, descending) for table in SORT_KEYS for key in SORT_KEYS[table] for descending in (False, True)]
+
+@pytest.mark.parametrize('table, key, descending', CASES)
+def test_full_list_orders_by_key_then_id(db, table, key, descending):
+    rows = getattr(db, f'list_{table}')(order_by=key, descending=descending)
+    assert rows == _expected(rows, table, key, descending)
+
+@pytest.mark.parametrize('page', [1, 2, 3])
+@pytest.mark.parametrize('table, key, descending', CASES)
+def test_pages_cover_every_row_once_across_duplicate_keys(db, table, key, descending, page):
+    full = getattr(db, f'list_{table}')(order_by=key, descending=descending)
+    assert _walk(db, table, page, order_by=key, descending=descending) == full
+
+@pytest.mark.parametrize('table, key, descending', CASES)
+def test_iter_matches_list(db, table, key, descending):
+    assert list(getattr(db, f'iter_{table}')(batch_size=2, order_by=key, descending=descending)) == getattr(db, f'list_{table}')(order_by=key, descending=descending)
+
+@pytest.mark.parametrize('key', SORT_KEYS['students'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_filtered_pages_keep_the_sort_order(db, key, descending):
+    where = Filter(min_age=19)
+    full = db.list_students(order_by=key, descending=descending, where=where)
+    assert [s.student_id for s in full] == [s.student_id for s in _expected(full, 'students', key, descending)]
+    assert {s.age for s in full} == {19, 20}
+    assert _walk(db, 'students', 2, order_by=key, descending=descending, where=where) == full
+
+@pytest.mark.parametrize('table, key', [('students', 'instructor'), ('courses', 'age'), ('students', 'NAME'), ('students', 's.name'), ('instructors', 'name; DROP TABLE students'), ('courses', '')])
+def test_order_by_rejects_keys_outside_the_whitelist(db, table, key):
+    with pytest.raises(ValidationError, match='Cannot sort'):
+        getattr(db, f'list_{table}')(order_by=key)
+    with pytest.raises(ValidationError, match='Cannot sort'):
+        getattr(db, f'list_{table}')(order_by=key, after_id='S1', limit=2, where=Filter(min_age=19))
+    with pytest.raises(ValidationError, match='Cannot sort'):
+        next(getattr(db, f'iter_{table}')(order_by=key))
+    assert len(db.list_students()) == 7
+
+def test_every_view_column_sorts_by_a_whitelisted_key():
+    for view, keys in VIEW_SORT_KEYS.items():
+        assert set(keys) <= set(SORT_KEYS[view])
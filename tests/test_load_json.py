@@ -0,0 +1,39 @@
+import json
+from types import SimpleNamespace
+import pytest
+from db_store import DBStore
+DATA = {'students': [{'student_id': 'S1', 'name': 'Ann', 'age': 20, 'email': 'ann@x.com'}], 'instructors': [], 'courses': [{'course_id': 7, 'course_name': 'Bad', 'students': ['S1']}, {'course_id': 'C1', 'course_name': 'Math', 'students': ['S1']}]}
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text(json.dumps(DATA), encoding='utf-8')
+    return str(path)
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    yield store
+    store.close()
+
+def _check(db, shown):
+    assert [title for title, _ in shown] == ['Loaded']
+    assert '1 invalid row(s) skipped.' in shown[0][1]
+    assert [c.course_id for c in db.list_courses()] == ['C1']
+    assert db.course_students('C1') == ['S1']
+
+def test_tk_load_json_skips_rejected_course_rows(monkeypatch, db, data_file):
+    main_tk = pytest.importorskip('main_tk')
+    shown = []
+    monkeypatch.setattr(main_tk.filedialog, 'askopenfilename', lambda **kw: data_file)
+    monkeypatch.setattr(main_tk, 'messagebox', SimpleNamespace(showinfo=lambda *a: shown.append(a), showerror=lambda *a: shown.append(a)))
+    main_tk.App.load_json(SimpleNamespace(ds=db, refresh_all=lambda: None))
+    _check(db, shown)
+
+def test_qt_load_json_skips_rejected_course_rows(monkeypatch, db, data_file):
+    main_Qt = pytest.importorskip('main_Qt')
+    shown = []
+    monkeypatch.setattr(main_Qt.QFileDialog, 'getOpenFileName', lambda *a: (data_file, ''))
+    monkeypatch.setattr(main_Qt, 'QMessageBox', SimpleNamespace(information=lambda w, *a: shown.append(a), critical=lambda w, *a: shown.append(a)))
+    main_Qt.MainWindow._load_json(SimpleNamespace(db=db, refresh_all=lambda: None))
+    _check(db, shown)
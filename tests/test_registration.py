@@ -0,0 +1,56 @@
+import pytest
+from db_store import COURSE_FULL, DBStore
+from person import ValidationError
+from registration import ALREADY_ENROLLED, ENROLLED, ROLLED_BACK, UNKNOWN_COURSE, UNKNOWN_STUDENT, RegistrationEngine
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    for n in range(4):
+        store.add_student(f'N{n}', 20, f'n{n}@x.com', f'S{n}')
+    store.add_course('C1', 'Math', 2)
+    store.add_course('C2', 'Art')
+    yield store
+    store.close()
+
+def test_batch_reasons(db):
+    engine = RegistrationEngine(db)
+    results = engine.enroll_batch([('S0', 'C1'), ('S0', 'C1'), ('S1', 'C1'), ('S2', 'C1'), ('S9', 'C2'), ('S0', 'C9')])
+    assert [r.reason for r in results] == [ENROLLED, ALREADY_ENROLLED, ENROLLED, COURSE_FULL, UNKNOWN_STUDENT, UNKNOWN_COURSE]
+    assert engine.seats_left('C1') == 0 and engine.seats_left('C2') is None
+    assert engine.audit() == {'overbooked': [], 'drifted': []}
+
+def test_all_or_nothing_rolls_back(db):
+    results = RegistrationEngine(db).allocate('C2', ['S0', 'S9'], all_or_nothing=True)
+    assert [r.reason for r in results] == [ROLLED_BACK, UNKNOWN_STUDENT]
+    assert db.course_students('C2') == []
+
+def test_batch_after_refused_single_enroll(db):
+    db.enroll_student_in_course('S0', 'C1')
+    with pytest.raises(ValidationError):
+        db.enroll_student_in_course('S0', 'C1')
+    results = RegistrationEngine(db).enroll_batch([('S1', 'C1'), ('S2', 'C2')])
+    assert [r.reason for r in results] == [ENROLLED, ENROLLED]
+
+def test_batch_refuses_to_run_inside_an_open_transaction(db):
+    engine = RegistrationEngine(db)
+    db.conn.execute("UPDATE courses SET course_name='Algebra' WHERE course_id='C1'")
+    with pytest.raises(ValidationError, match='open transaction'):
+        engine.enroll('S0', 'C1')
+    assert db.conn.in_transaction
+    db.conn.rollback()
+    assert db.list_courses()[0].course_name == 'Math'
+    assert db.course_students('C1') == []
+    assert engine.stats[ENROLLED] == 0
+    assert engine.enroll('S0', 'C1').ok
+
+def test_batch_notifies_subscribers_and_refreshes_cached_reads(db):
+    seen = []
+    db.subscribe(seen.append)
+    assert db.course_students('C1') == []
+    engine = RegistrationEngine(db)
+    engine.enroll_batch([('S0', 'C1'), ('S1', 'C1')])
+    assert seen == [('registrations',)]
+    assert db.course_students('C1') == ['S0', 'S1']
+    engine.enroll('S9', 'C1')
+    assert seen == [('registrations',)]
@@ -0,0 +1,81 @@
+import pytest
+from Data_Managment import DataStore
+from text_search import TrigramIndex
+
+def _ids(rows):
+    return [getattr(r, 'student_id', None) or getattr(r, 'instructor_id', None) or r.course_id for r in rows]
+
+def _brute(index, query):
+    from text_search import normalize
+    q = normalize(query)
+    return [k for k, t in zip(index._keys, index._texts) if t is not None and q in t]
+
+@pytest.fixture
+def ds():
+    store = DataStore()
+    store.add_student('José Alvarez', 20, 'jose@school.edu', 'S1')
+    store.add_student('Maria Lopez', 21, 'maria@school.edu', 'S2')
+    store.add_instructor('Ada Byron', 40, 'ada@school.edu', 'I1')
+    store.add_course('C1', 'Physics')
+    return store
+
+def test_search_ignores_case_and_accents(ds):
+    assert _ids(ds.search('students', 'JOSE')) == ['S1']
+    assert _ids(ds.search('students', 'school.edu')) == ['S1', 'S2']
+    assert _ids(ds.search('students', 'school.edu', limit=1)) == ['S1']
+
+def test_name_setter_reindexes_the_student(ds):
+    ds.students['S1'].name = 'Joe Zed'
+    assert ds.search('students', 'alvarez') == []
+    assert _ids(ds.search('students', 'zed')) == ['S1']
+    assert _ids(ds.search('students', 'jose@')) == ['S1']
+
+def test_email_setter_reindexes_the_instructor(ds):
+    ds.instructors['I1'].email = 'lovelace@uni.org'
+    assert ds.search('instructors', 'school.edu') == []
+    assert _ids(ds.search('instructors', 'lovelace')) == ['I1']
+    assert _ids(ds.search('instructors', 'byron')) == ['I1']
+
+def test_renamed_course_is_reindexed_when_passed_back(ds):
+    course = ds.courses['C1']
+    course.course_name = 'Chemistry'
+    ds.index_entity(course)
+    assert ds.search('courses', 'physics') == []
+    assert _ids(ds.search('courses', 'chem')) == ['C1']
+
+def test_matches_never_span_two_fields(ds):
+    assert ds.search('students', 'lopezmaria') == []
+    assert ds.search('students', 'ezm') == []
+
+@pytest.mark.parametrize('query, expected', [('', ['S1', 'S2']), ('j', ['S1']), ('Jo', ['S1']), ('é', ['S1', 'S2']), ('@', ['S1', 'S2']), ('zz', [])])
+def test_queries_shorter_than_a_trigram_scan_the_texts(ds, query, expected):
+    assert _ids(ds.search('students', query)) == expected
+    assert _ids(ds.search('students', query, limit=1)) == expected[:1]
+
+def test_remove_and_readd_keep_postings_consistent():
+    idx = TrigramIndex()
+    for n, name in enumerate(['alpha', 'alpine', 'beta', 'alphabet']):
+        idx.add(n, name)
+    idx.remove(1)
+    idx.remove(1)
+    assert len(idx) == 3
+    assert idx.search('alp') == [0, 3]
+    assert idx.search('al') == [0, 3]
+    assert 1 not in idx.candidates('pin')
+    idx.add(1, 'alpine')
+    idx.add(0, 'gamma')
+    assert idx.search('alp') == [3, 1]
+    assert idx.search('amm') == [0]
+    for query in ('alp', 'bet', 'a', 'pha', 'xyz', ''):
+        assert sorted(idx.search(query)) == sorted(_brute(idx, query))
+    assert all((list(p) == sorted(p) and p for p in idx._postings.values()))
+    assert idx.memory_usage()['entities'] == 4
+
+def test_removing_every_entity_drops_every_posting():
+    idx = TrigramIndex()
+    idx.add('a', 'hello', 'world')
+    idx.add('b', 'yellow')
+    idx.remove('a')
+    idx.remove('b')
+    assert len(idx) == 0 and idx.memory_usage()['trigrams'] == 0
+    assert idx.search('llo') == [] and idx.search('l') == []
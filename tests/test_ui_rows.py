@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+import pytest
+from db_store import DBStore
+from ui_support import SortOrder, capacity_text
+UIS = [('main_tk', 'App', 'refresh_'), ('main_tk_SQL_Version', 'App', '_refresh_'), ('main_Qt', 'MainWindow', '_refresh_'), ('main_qt_SQL_Version', 'MainWindow', '_refresh_')]
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    store.add_student('Ann', 20, 'ann@x.com', 'S1')
+    store.add_student('Bob', 21, 'bob@x.com', 'S2')
+    store.add_instructor('Ivy', 40, 'ivy@x.com', 'I1')
+    store.add_instructor('Al', 50, 'al@x.com', 'I2')
+    store.add_course('C1', 'Math', 30)
+    store.add_course('C2', 'Art')
+    store.add_course('C3', 'Bio')
+    store.assign_instructor_to_course('I1', 'C1')
+    store.assign_instructor_to_course('I1', 'C3')
+    store.enroll_many(['S1', 'S2'], 'C1')
+    store.enroll_student_in_course('S1', 'C2')
+    yield store
+    store.close()
+
+def _rows(module, cls, prefix, db, view):
+    ui = pytest.importorskip(module)
+    shown = []
+    fake = SimpleNamespace(db=db, ds=db, filters=dict.fromkeys(('students', 'instructors', 'courses')), sort=SortOrder(), var_prefix=SimpleNamespace(get=lambda: False), chk_prefix=SimpleNamespace(isChecked=lambda: False), loader=SimpleNamespace(start=lambda key, rows, feed, end: shown.extend(rows)))
+    fake._filters, fake._sort, fake._loader = (fake.filters, fake.sort, fake.loader)
+    for name in ('students', 'instructors', 'courses'):
+        setattr(fake, f'rows_{name}', SimpleNamespace(begin=lambda: None, feed=None, end=None))
+    getattr(getattr(ui, cls), prefix + view)(fake)
+    return [tuple((str(v) for v in row)) for row in shown]
+
+@pytest.mark.parametrize('module, cls, prefix', UIS)
+def test_rows_keep_related_ids_next_to_the_counts(db, module, cls, prefix):
+    assert _rows(module, cls, prefix, db, 'students') == [('S1', 'Ann', '20', 'ann@x.com', 'C1, C2', '2'), ('S2', 'Bob', '21', 'bob@x.com', 'C1', '1')]
+    assert _rows(module, cls, prefix, db, 'instructors') == [('I1', 'Ivy', '40', 'ivy@x.com', 'C1, C3', '2'), ('I2', 'Al', '50', 'al@x.com', 'None', '0')]
+    courses = _rows(module, cls, prefix, db, 'courses')
+    assert courses == [('C1', 'Math', 'I1', 'S1, S2', '2 / 30'), ('C2', 'Art', 'None', 'S1', '1'), ('C3', 'Bio', 'I1', 'None', '0')]
+    assert [capacity_text(row[-1]) for row in courses] == ['30', '', '']
+
+def test_instructor_courses_follow_reassignment(db):
+    assert db.instructor_courses('I1') == ['C1', 'C3']
+    db.assign_instructor_to_course('I2', 'C3')
+    assert db.instructor_courses('I1') == ['C1']
+    assert db.instructor_courses('I2') == ['C3']
@@ -0,0 +1,28 @@
+import pytest
+from db_filter import Filter
+from db_store import DBStore
+from ui_support import keyset_rows
+
+@pytest.fixture
+def db(tmp_path):
+    store = DBStore(str(tmp_path / 'school.db'))
+    store.bulk_upsert_students([(f'S{n:02d}', f'N{n % 3}', 18 + n % 4, f'n{n}@x.com') for n in range(23)])
+    yield store
+    store.close()
+
+@pytest.mark.parametrize('order_by, descending', [('id', False), ('name', True), ('age', False)])
+def test_keyset_rows_matches_the_full_list(db, order_by, descending):
+    full = db.list_students(order_by=order_by, descending=descending, where=Filter(min_age=19))
+    streamed = list(keyset_rows(db.list_students, 'student_id', page=5, order_by=order_by, descending=descending, where=Filter(min_age=19)))
+    assert streamed == full
+
+def test_keyset_rows_fetches_pages_lazily(db):
+    calls = []
+
+    def list_page(**kw):
+        calls.append(kw['after_id'])
+        return db.list_students(**kw)
+    rows = keyset_rows(list_page, 'student_id', page=10)
+    assert [next(rows).student_id for _ in range(10)] == [f'S{n:02d}' for n in range(10)]
+    assert calls == [None]
+    assert len(list(rows)) == 13 and calls == [None, 'S09', 'S19']
@@ -0,0 +1,12 @@
+import pytest
+from validators import E_BAD_AGE, validate_batch
+
+@pytest.mark.parametrize('age', ['²', '-1', 'abc', ' ', -3, 1.5])
+def test_bad_age_is_reported(age):
+    report = validate_batch([{'student_id': 'S1', 'name': 'Ann', 'age': age, 'email': 'ann@x.com'}], 'student')
+    assert [(e.row, e.code) for e in report.errors] == [(0, E_BAD_AGE)]
+
+def test_other_rows_survive_a_bad_age():
+    rows = [{'student_id': 'S1', 'name': 'Ann', 'age': '²', 'email': 'ann@x.com'}, {'student_id': 'S2', 'name': 'Bob', 'age': ' 21 ', 'email': 'bob@x.com'}, {'student_id': 'S3', 'name': 'Cy', 'age': 30, 'email': 'cy@x.com'}]
+    report = validate_batch(rows, 'student')
+    assert report.rejected_rows() == {0}
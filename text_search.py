@@ -0,0 +1,268 @@
+'''"""
+Text Search — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- normalize: casefolded, accent-stripped form of a string used for every comparison
+- SearchKeys: one precomputed key per entity so filtering is a plain substring test per row
+- Substring matching mirrors the old per-cell filter; token-prefix matching finds words that start with each query word
+- TrigramIndex: incrementally maintained trigram inverted index for substring lookups without a full scan
+"""'''
+import re
+import sys
+from array import array
+from bisect import bisect_left
+import unicodedata
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+_NON_WORD = re.compile('[\\W_]+')
+_FIELD_SEP = '\n'
+
+def normalize(text: object) -> str:
+    '''    """Casefold text and strip accents, so 'José' and 'JOSE' compare equal.
+
+Parameters:
+    text: any value; converted with str().
+    """'''
+    s = unicodedata.normalize('NFKD', str(text).casefold())
+    return ''.join((ch for ch in s if not unicodedata.combining(ch)))
+
+def _tokens(text: str) -> str:
+    '''    """Space-delimited words of an already normalized string, with a leading space.
+
+Parameters:
+    text: parameter.
+    """'''
+    return ' ' + _NON_WORD.sub(' ', text).strip()
+
+class SearchKeys:
+    """Normalized search keys for one entity table, built once and reused by every keystroke.
+
+Each entity keeps two strings: its fields joined by a newline (for substring
+search, so a match never spans two fields) and its words joined by spaces (for
+token-prefix search). A query is normalized once; testing a row is then a
+substring check against a stored string and allocates nothing.
+"""
+
+    def __init__(self, rows: Iterable[Tuple[object, ...]]):
+        '''    """  init  .
+
+Parameters:
+    rows: tuples whose first item is the entity ID, followed by the searchable fields (None is skipped).
+    """'''
+        self.keys: Dict[str, Tuple[str, str]] = {}
+        for row in rows:
+            text = _FIELD_SEP.join((normalize(v) for v in row if v is not None))
+            self.keys[row[0]] = (text, _tokens(text))
+
+    def match(self, query: str, token_prefix: bool=False) -> Set[str]:
+        '''    """IDs of the entities matching query.
+
+Parameters:
+    query: user input; empty matches everything.
+    token_prefix: every query word must start a word of the entity, instead of the whole query appearing as a substring.
+    """'''
+        q = normalize(query).strip()
+        if not q:
+            return set(self.keys)
+        if not token_prefix:
+            return {k for k, (text, _) in self.keys.items() if q in text}
+        words = _tokens(q).split(' ')[1:]
+        needles = [' ' + w for w in words]
+        return {k for k, (_, toks) in self.keys.items() if all((n in toks for n in needles))}
+
+    def __len__(self) -> int:
+        '''"""Number of entities indexed.
+
+"""'''
+        return len(self.keys)
+
+def trigrams(text: str) -> Set[str]:
+    '''    """Distinct three-character substrings of an already normalized string, never spanning two fields.
+
+Parameters:
+    text: parameter.
+    """'''
+    return {g for g in (text[i:i + 3] for i in range(len(text) - 2)) if _FIELD_SEP not in g}
+
+def _has(posting: array, doc: int) -> bool:
+    '''    """Binary-search a sorted posting array for doc.
+
+Parameters:
+    posting: parameter.
+    doc: parameter.
+    """'''
+    i = bisect_left(posting, doc)
+    return i < len(posting) and posting[i] == doc
+
+class TrigramIndex:
+    """Inverted index from trigrams to entity keys, updated one entity at a time.
+
+Every entity gets a small integer document number and each trigram keeps a
+sorted array('I') of the numbers that contain it, which costs four bytes per
+posting instead of a set slot. A query of three or more characters intersects
+the posting arrays of its trigrams, smallest first, and then confirms each
+candidate against its stored text (trigram hits can be false positives).
+Shorter queries fall back to a scan of the stored texts.
+"""
+
+    def __init__(self):
+        '''"""  init  .
+
+"""'''
+        self._postings: Dict[str, array] = {}
+        self._doc_ids: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._texts: List[Optional[str]] = []
+
+    def add(self, key: Hashable, *fields: object) -> None:
+        '''    """Index (or re-index) one entity.
+
+Parameters:
+    key: entity ID.
+    fields: searchable values; None is skipped.
+    """'''
+        text = _FIELD_SEP.join((normalize(v) for v in fields if v is not None))
+        doc = self._doc_ids.get(key)
+        if doc is None:
+            doc = self._doc_ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+            for g in trigrams(text):
+                posting = self._postings.get(g)
+                if posting is None:
+                    posting = self._postings[g] = array('I')
+                posting.append(doc)
+            return
+        old = self._texts[doc]
+        if old == text:
+            return
+        old_grams = trigrams(old)
+        new_grams = trigrams(text)
+        self._unpost(doc, old_grams - new_grams)
+        for g in new_grams - old_grams:
+            posting = self._postings.get(g)
+            if posting is None:
+                posting = self._postings[g] = array('I')
+            posting.insert(bisect_left(posting, doc), doc)
+        self._texts[doc] = text
+
+    def _unpost(self, doc: int, grams: Iterable[str]) -> None:
+        '''    """Remove doc from the posting arrays of grams.
+
+Parameters:
+    doc: parameter.
+    grams: parameter.
+    """'''
+        for g in grams:
+            posting = self._postings[g]
+            del posting[bisect_left(posting, doc)]
+            if not posting:
+                del self._postings[g]
+
+    def remove(self, key: Hashable) -> None:
+        '''    """Drop one entity from the index.
+
+Parameters:
+    key: parameter.
+    """'''
+        doc = self._doc_ids.pop(key, None)
+        if doc is None:
+            return
+        self._unpost(doc, trigrams(self._texts[doc]))
+        self._keys[doc] = None
+        self._texts[doc] = None
+
+    def _postings_for(self, q: str) -> Optional[List[array]]:
+        '''    """Posting arrays for the trigrams of a normalized query, smallest first; None when the query is too short to have any.
+
+Parameters:
+    q: parameter.
+    """'''
+        grams = trigrams(q)
+        if not grams:
+            return None
+        return sorted((self._postings.get(g, array('I')) for g in grams), key=len)
+
+    def _candidate_docs(self, q: str) -> Iterator[int]:
+        '''    """Lazily yield document numbers containing every trigram of the normalized query, in insertion order.
+
+Parameters:
+    q: parameter.
+    """'''
+        postings = self._postings_for(q)
+        if postings is None:
+            yield from (d for d, text in enumerate(self._texts) if text is not None)
+            return
+        rest = postings[1:]
+        for d in postings[0]:
+            if all((_has(p, d) for p in rest)):
+                yield d
+
+    def _candidate_set(self, q: str) -> Optional[Set[int]]:
+        '''    """Eagerly intersect the posting arrays of a normalized query; None when the query is too short to have trigrams.
+
+Parameters:
+    q: parameter.
+    """'''
+        postings = self._postings_for(q)
+        if postings is None:
+            return None
+        docs = set(postings[0])
+        for posting in postings[1:]:
+            if not docs:
+                break
+            docs.intersection_update(posting)
+        return docs
+
+    def candidates(self, query: str) -> Set[Hashable]:
+        '''    """Keys that contain every trigram of query (a superset of the true matches).
+
+Parameters:
+    query: parameter.
+    """'''
+        docs = self._candidate_set(normalize(query))
+        if docs is None:
+            return set(self._doc_ids)
+        keys = self._keys
+        return {keys[d] for d in docs}
+
+    def search(self, query: str, limit: Optional[int]=None) -> List[Hashable]:
+        '''    """Keys whose indexed text contains query, accent- and case-insensitively, in insertion order.
+
+Parameters:
+    query: parameter.
+    limit: stop after this many matches; candidates are then checked lazily, so a broad query returns early.
+    """'''
+        q = normalize(query)
+        keys, texts = (self._keys, self._texts)
+        if limit is None:
+            docs = self._candidate_set(q)
+            if docs is not None:
+                return [keys[d] for d in sorted(docs) if q in texts[d]]
+        out = []
+        for d in self._candidate_docs(q):
+            if q in texts[d]:
+                out.append(keys[d])
+                if limit is not None and len(out) >= limit:
+                    break
+        return out
+
+    def memory_usage(self) -> Dict[str, int]:
+        '''"""Approximate bytes held by the index (containers and the strings they own), with entry counts.
+
+"""'''
+        postings = sys.getsizeof(self._postings) + sum((sys.getsizeof(g) + sys.getsizeof(p) for g, p in self._postings.items()))
+        docs = sys.getsizeof(self._doc_ids) + sys.getsizeof(self._keys) + sys.getsizeof(self._texts) + sum((sys.getsizeof(t) for t in self._texts if t is not None))
+        return {'entities': len(self._doc_ids), 'trigrams': len(self._postings), 'postings': sum((len(p) for p in self._postings.values())), 'postings_bytes': postings, 'text_bytes': docs, 'total_bytes': postings + docs}
+
+    def __len__(self) -> int:
+        '''"""Number of entities indexed.
+
+"""'''
+        return len(self._doc_ids)
@@ -0,0 +1,226 @@
+'''"""
+Tkinter Widgets — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- IdPicker: type-ahead entry whose popup lists IDs fetched by prefix, a page at a time
+- TreeRows: KeyedRows for a ttk.Treeview, using the entity ID as the item iid
+- DBWatcher: stats the database files on the Tk event loop and asks the store to confirm changes
+- Used by the Relations tab of both Tkinter front-ends instead of fully populated comboboxes
+"""'''
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List
+from ui_support import PICKER_LIMIT, WATCH_POLL_MS, KeyedRows, db_files, file_stamp
+
+class IdPicker(ttk.Entry):
+    """Entry with a popup of matching IDs, queried on demand by prefix with a limit.
+
+Typing, the Down key or a click opens the popup; Up/Down/Return or a click picks
+an ID. Only the visible matches are ever loaded, however large the table is.
+"""
+
+    def __init__(self, master, search: Callable[[str, int], List[str]], limit: int=PICKER_LIMIT, **kw):
+        '''    """  init  .
+
+Parameters:
+    master: parent widget.
+    search: callable(prefix, limit) returning matching IDs, e.g. a bound DBStore.search_ids.
+    limit: rows shown in the popup.
+    kw: passed to ttk.Entry (textvariable, width, ...).
+    """'''
+        super().__init__(master, **kw)
+        self.search = search
+        self.limit = limit
+        self._popup = None
+        self._list = None
+        self.bind('<KeyRelease>', self._on_key)
+        self.bind('<Down>', self._on_down)
+        self.bind('<Return>', lambda e: self._choose(0))
+        self.bind('<Escape>', lambda e: self.hide())
+        self.bind('<Button-1>', lambda e: self.after_idle(self.show))
+        self.bind('<FocusOut>', lambda e: self.after(150, self._hide_if_unfocused))
+
+    def _on_key(self, event):
+        '''    """ on key.
+
+Parameters:
+    event: parameter.
+    """'''
+        if event.keysym not in ('Down', 'Up', 'Return', 'Escape', 'Tab', 'ISO_Left_Tab'):
+            self.show()
+
+    def _on_down(self, event):
+        '''    """Open the popup, or move into it when already open.
+
+Parameters:
+    event: parameter.
+    """'''
+        if self._popup is None:
+            self.show()
+        if self._list is not None:
+            self._list.focus_set()
+            self._list.selection_clear(0, tk.END)
+            self._list.selection_set(0)
+            self._list.activate(0)
+        return 'break'
+
+    def show(self):
+        '''"""Query IDs for the current text and (re)open the popup under the entry.
+
+"""'''
+        items = self.search(self.get(), self.limit)
+        if not items:
+            self.hide()
+            return
+        if self._popup is None:
+            self._popup = tk.Toplevel(self)
+            self._popup.overrideredirect(True)
+            self._list = tk.Listbox(self._popup, exportselection=False, activestyle='dotbox')
+            self._list.pack(fill=tk.BOTH, expand=True)
+            self._list.bind('<ButtonPress-1>', lambda e: self._list.focus_set())
+            self._list.bind('<ButtonRelease-1>', lambda e: self._choose(self._list.nearest(e.y)))
+            self._list.bind('<Return>', lambda e: self._choose(self._list.index(tk.ACTIVE)))
+            self._list.bind('<Escape>', lambda e: self._back())
+            self._list.bind('<FocusOut>', lambda e: self.after(150, self._hide_if_unfocused))
+        self._list.delete(0, tk.END)
+        self._list.insert(tk.END, *items)
+        self._list.configure(height=min(len(items), 10))
+        self._popup.geometry(f'{max(self.winfo_width(), 120)}x{self._list.winfo_reqheight()}+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}')
+        self._popup.lift()
+
+    def _choose(self, index: int):
+        '''    """Put the ID at index into the entry and close the popup.
+
+Parameters:
+    index: parameter.
+    """'''
+        if self._list is not None and self._list.size():
+            value = self._list.get(index)
+            self.delete(0, tk.END)
+            self.insert(0, value)
+        self._back()
+        return 'break'
+
+    def _back(self):
+        '''""" back.
+
+"""'''
+        self.hide()
+        self.focus_set()
+        self.icursor(tk.END)
+
+    def _hide_if_unfocused(self):
+        '''""" hide if unfocused.
+
+"""'''
+        focus = self.focus_get()
+        if focus is not self and focus is not self._list:
+            self.hide()
+
+    def hide(self):
+        '''"""Close the popup.
+
+"""'''
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+            self._list = None
+
+    def refresh(self):
+        '''"""Re-run the query if the popup is open (after the data changed).
+
+"""'''
+        if self._popup is not None:
+            self.show()
+
+class TreeRows(KeyedRows):
+    """Keyed reconciliation against a flat ttk.Treeview; item iids are the row IDs."""
+
+    def __init__(self, tree: ttk.Treeview, key_column: int=0):
+        '''    """  init  .
+
+Parameters:
+    tree: parameter.
+    key_column: parameter.
+    """'''
+        super().__init__(key_column)
+        self.tree = tree
+
+    def _insert(self, index: int, key: Any, row: tuple) -> None:
+        '''    """ insert.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    row: parameter.
+    """'''
+        self.tree.insert('', index, iid=key, values=row)
+
+    def _update(self, index: int, key: Any, old: tuple, row: tuple) -> None:
+        '''    """ update.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    old: parameter.
+    row: parameter.
+    """'''
+        self.tree.item(key, values=row)
+
+    def _delete(self, index: int, keys: List[Any]) -> None:
+        '''    """ delete.
+
+Parameters:
+    index: parameter.
+    keys: parameter.
+    """'''
+        self.tree.delete(*keys)
+
+class DBWatcher:
+    """Notices writes to the SQLite files from any process and calls poll() to confirm them.
+
+Tk has no file-notification API, so the files are stat()ed every interval_ms;
+only when their signature moves is poll (normally DBStore.poll_changes, which
+checks PRAGMA data_version) called.
+"""
+
+    def __init__(self, widget: tk.Misc, db_path: str, poll: Callable[[], bool], interval_ms: int=WATCH_POLL_MS):
+        '''    """  init  .
+
+Parameters:
+    widget: any widget, used for after() scheduling.
+    db_path: parameter.
+    poll: called when the files changed.
+    interval_ms: parameter.
+    """'''
+        self.widget = widget
+        self.paths = db_files(db_path)
+        self.poll = poll
+        self.interval_ms = interval_ms
+        self._stamp = file_stamp(self.paths)
+        self._job = widget.after(interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        '''""" tick.
+
+"""'''
+        stamp = file_stamp(self.paths)
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.poll()
+        self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        '''"""Stop watching.
+
+"""'''
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
@@ -0,0 +1,692 @@
+'''"""
+Toolkit-Neutral UI Helpers — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- PagedLoader: streams table rows into a widget page by page through the toolkit's event loop
+- keyset_rows: lazily walks a DBStore.list_* result one keyset page at a time, so nothing materializes the whole table
+- RefreshMetrics: per-table rows, DB time vs widget time, and refresh tick duration against the timer interval
+- AdaptiveScheduler: non-overlapping auto-refresh whose interval follows the measured refresh cost
+- SortOrder: per-view column sort chosen from header clicks, handed to DBStore.list_* as order_by/descending
+- view_filter / bound_value: turn the filter bar's values into a db_filter.Filter for one view; a 0 bound is a real bound, as in the compiled filter
+- seats_text / capacity_text / parse_capacity: the course Seats column and the course form's capacity field
+- DirtyViews: per-tab staleness so a write rebuilds only the visible tab and hidden tabs catch up when shown
+- db_files / file_stamp: cheap stat signature of the SQLite file and its journal, for change watchers
+- KeyedRows: keyed reconciliation of a streamed row set against a table widget (insert/update/move/delete only what changed)
+- Shared by the Tkinter and PyQt front-ends; imports neither toolkit
+"""'''
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from db_filter import FILTER_FIELDS, Filter
+from validators import ValidationError
+STARTUP_PAGE = 200
+STREAM_PAGE = 500
+AUTO_REFRESH_MS = 2000
+AUTO_REFRESH_MAX_MS = 30000
+REFRESH_LOAD_FACTOR = 4
+IDLE_CHECK_MS = 50
+PICKER_LIMIT = 50
+WATCH_POLL_MS = 250
+WATCH_DEBOUNCE_MS = 50
+VIEW_TABLES = {'students': ('students', 'registrations'), 'instructors': ('instructors', 'courses'), 'courses': ('courses', 'registrations')}
+ANY_BOUND = -1
+VIEW_SORT_KEYS = {'students': ('id', 'name', 'age', 'email', 'courses', 'courses'), 'instructors': ('id', 'name', 'age', 'email', 'courses', 'courses'), 'courses': ('id', 'name', 'instructor', 'students', 'students')}
+
+@dataclass
+class TableTiming:
+    """Cost of the most recent rebuild of one table (or other refresh step)."""
+    rows: int = 0
+    db_ms: float = 0.0
+    widget_ms: float = 0.0
+    wall_ms: float = 0.0
+    started: float = 0.0
+
+class RefreshMetrics:
+    """Timing of refresh passes, split into DB work and widget work per table.
+
+A tick runs from begin_tick() until every table started during it has
+finished streaming; tick_ms is that wall time, work_ms the part spent in our
+code. A tick longer than interval_ms counts as an overrun.
+"""
+
+    def __init__(self, interval_ms: int=AUTO_REFRESH_MS):
+        '''    """  init  .
+
+Parameters:
+    interval_ms: auto-refresh period the tick is compared against.
+    """'''
+        self.interval_ms = interval_ms
+        self.tables: Dict[str, TableTiming] = {}
+        self._pending: Dict[str, TableTiming] = {}
+        self._tick_start: Optional[float] = None
+        self._tick_work = 0.0
+        self.tick_ms = 0.0
+        self.work_ms = 0.0
+        self.ticks = 0
+        self.overruns = 0
+        self.listener: Optional[Callable[['RefreshMetrics'], None]] = None
+
+    def begin_tick(self) -> None:
+        '''"""Mark the start of a refresh pass.
+
+"""'''
+        self._tick_start = time.perf_counter()
+        self._tick_work = 0.0
+
+    def start(self, key: str) -> None:
+        '''    """A table rebuild began.
+
+Parameters:
+    key: parameter.
+    """'''
+        self._pending[key] = TableTiming(started=time.perf_counter())
+
+    def add(self, key: str, db_s: float, widget_s: float, rows: int) -> None:
+        '''    """Account one page.
+
+Parameters:
+    key: parameter.
+    db_s: seconds spent producing the rows.
+    widget_s: seconds spent inserting them.
+    rows: parameter.
+    """'''
+        t = self._pending.get(key)
+        if t is None:
+            return
+        t.rows += rows
+        t.db_ms += db_s * 1000.0
+        t.widget_ms += widget_s * 1000.0
+
+    def finish(self, key: str) -> None:
+        '''    """A table rebuild completed.
+
+Parameters:
+    key: parameter.
+    """'''
+        t = self._pending.pop(key, None)
+        if t is None:
+            return
+        t.wall_ms = (time.perf_counter() - t.started) * 1000.0
+        self.tables[key] = t
+        self._tick_work += t.db_ms + t.widget_ms
+        self._maybe_end_tick()
+
+    def discard(self, key: str) -> None:
+        '''    """Forget a rebuild that was cancelled.
+
+Parameters:
+    key: parameter.
+    """'''
+        self._pending.pop(key, None)
+        self._maybe_end_tick()
+
+    @contextmanager
+    def measure(self, key: str, widget: bool=True) -> Iterator[TableTiming]:
+        '''    """Time a synchronous refresh step, such as filling the relation dropdowns.
+
+Parameters:
+    key: parameter.
+    widget: book the time as widget time (else DB time).
+    """'''
+        self.start(key)
+        t = self._pending[key]
+        try:
+            yield t
+        finally:
+            ms = (time.perf_counter() - t.started) * 1000.0
+            if widget:
+                t.widget_ms += ms - t.db_ms
+            else:
+                t.db_ms += ms
+            self.finish(key)
+
+    def _maybe_end_tick(self) -> None:
+        '''""" maybe end tick.
+
+"""'''
+        if self._tick_start is None or self._pending:
+            self._notify()
+            return
+        self.tick_ms = (time.perf_counter() - self._tick_start) * 1000.0
+        self.work_ms = self._tick_work
+        self._tick_start = None
+        self.ticks += 1
+        if self.tick_ms > self.interval_ms:
+            self.overruns += 1
+        self._notify()
+
+    def _notify(self) -> None:
+        '''""" notify.
+
+"""'''
+        if self.listener is not None:
+            self.listener(self)
+
+    def summary(self) -> str:
+        '''"""One-line status-bar text.
+
+"""'''
+        parts = [f'{k} {t.rows} rows {t.wall_ms:.0f} ms (db {t.db_ms:.0f} / ui {t.widget_ms:.0f})' for k, t in self.tables.items()]
+        tick = f'tick {self.tick_ms:.0f} ms (work {self.work_ms:.0f}) / {self.interval_ms} ms'
+        if self.overruns:
+            tick += f'  OVERRUN x{self.overruns}'
+        return '  |  '.join(parts + [tick])
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''"""Current figures as plain data.
+
+"""'''
+        return {'tables': {k: {'rows': t.rows, 'db_ms': round(t.db_ms, 2), 'widget_ms': round(t.widget_ms, 2), 'wall_ms': round(t.wall_ms, 2)} for k, t in self.tables.items()}, 'tick_ms': round(self.tick_ms, 2), 'work_ms': round(self.work_ms, 2), 'interval_ms': self.interval_ms, 'ticks': self.ticks, 'overruns': self.overruns}
+
+class AdaptiveScheduler:
+    """Periodic refresh that never overlaps itself and backs off when refreshing is expensive.
+
+The next tick is scheduled only once the previous one has finished, including
+any pages still streaming (busy()). Its cost is the time spent in tick() plus
+the work RefreshMetrics booked for the refresh it triggered; the interval is
+load_factor times that cost, never below base_ms nor above max_ms, so refresh
+work takes at most 1/load_factor of the event loop. While active() is false
+(window minimized or in the background) ticks are skipped.
+"""
+
+    def __init__(self, call_later: Callable[[int, Callable[[], None]], Any], tick: Callable[[], Any], busy: Callable[[], bool]=lambda: False, active: Callable[[], bool]=lambda: True, metrics: Optional[RefreshMetrics]=None, base_ms: int=AUTO_REFRESH_MS, max_ms: int=AUTO_REFRESH_MAX_MS, load_factor: float=REFRESH_LOAD_FACTOR):
+        '''    """  init  .
+
+Parameters:
+    call_later: callable(ms, fn) running fn after ms on the event loop (Tk after, QTimer.singleShot).
+    tick: the refresh step, e.g. a DBStore.poll_changes call.
+    busy: true while a previous refresh is still streaming rows.
+    active: false while the window is minimized or idle.
+    metrics: RefreshMetrics whose work_ms is added to the cost; its interval_ms is kept in sync.
+    base_ms: parameter.
+    max_ms: parameter.
+    load_factor: parameter.
+    """'''
+        self.call_later = call_later
+        self.tick = tick
+        self.busy = busy
+        self.active = active
+        self.metrics = metrics
+        self.base_ms = base_ms
+        self.max_ms = max_ms
+        self.load_factor = load_factor
+        self.interval_ms = base_ms
+        self.last_cost_ms = 0.0
+        self.skipped = 0
+        self.running = False
+        self.listener: Optional[Callable[['AdaptiveScheduler'], None]] = None
+        self._gen = 0
+
+    def start(self) -> None:
+        '''"""Run a tick now and keep ticking.
+
+"""'''
+        if self.running:
+            return
+        self.running = True
+        self._gen += 1
+        self._fire(self._gen)
+
+    def stop(self) -> None:
+        '''"""Stop ticking; a tick already scheduled becomes a no-op.
+
+"""'''
+        self.running = False
+        self._gen += 1
+
+    def _schedule(self, gen: int, ms: float, fn: Callable[[int], None]) -> None:
+        '''    """ schedule.
+
+Parameters:
+    gen: parameter.
+    ms: parameter.
+    fn: parameter.
+    """'''
+        self.call_later(int(ms), lambda: fn(gen))
+
+    def _fire(self, gen: int) -> None:
+        '''    """ fire.
+
+Parameters:
+    gen: parameter.
+    """'''
+        if gen != self._gen:
+            return
+        if not self.active() or self.busy():
+            self.skipped += 1
+            self._schedule(gen, self.interval_ms, self._fire)
+            return
+        ticks = self.metrics.ticks if self.metrics is not None else 0
+        t0 = time.perf_counter()
+        self.tick()
+        self._settle(gen, (time.perf_counter() - t0) * 1000.0, ticks)
+
+    def _settle(self, gen: int, cost_ms: float, ticks: int) -> None:
+        '''    """Wait until the refresh triggered by the tick is done, then set the interval and schedule the next tick.
+
+Parameters:
+    gen: parameter.
+    cost_ms: time spent in tick().
+    ticks: metrics.ticks before the tick.
+    """'''
+        if gen != self._gen:
+            return
+        if self.busy():
+            self.call_later(IDLE_CHECK_MS, lambda: self._settle(gen, cost_ms, ticks))
+            return
+        if self.metrics is not None and self.metrics.ticks != ticks:
+            cost_ms += self.metrics.work_ms
+        self.last_cost_ms = cost_ms
+        interval = min(self.max_ms, max(self.base_ms, cost_ms * self.load_factor))
+        if interval != self.interval_ms:
+            self.interval_ms = interval
+            if self.metrics is not None:
+                self.metrics.interval_ms = int(interval)
+            if self.listener is not None:
+                self.listener(self)
+        self._schedule(gen, self.interval_ms, self._fire)
+
+    def label(self) -> str:
+        '''"""Current interval for display, e.g. '2.0 s'.
+
+"""'''
+        return f'{self.interval_ms / 1000.0:.1f} s'
+
+def db_files(db_path: str) -> Tuple[str, ...]:
+    '''    """The database file plus the WAL and rollback journal SQLite may write beside it.
+
+Parameters:
+    db_path: parameter.
+    """'''
+    path = os.path.abspath(db_path)
+    return (path, path + '-wal', path + '-journal')
+
+def file_stamp(paths: Iterable[str]) -> Tuple[Any, ...]:
+    '''    """(mtime_ns, size) per path, None for missing files; changes whenever any of them is written.
+
+Parameters:
+    paths: parameter.
+    """'''
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamp.append(None)
+        else:
+            stamp.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+class SortOrder:
+    """Sort key and direction of each table view, driven by header clicks.
+
+Clicking a column sorts by it ascending; clicking the same column again flips
+the direction. Keys are DBStore sort keys, so the ordering happens in SQL.
+"""
+
+    def __init__(self, columns: Dict[str, Tuple[str, ...]]=VIEW_SORT_KEYS):
+        '''    """  init  .
+
+Parameters:
+    columns: view name -> sort key of each column, left to right.
+    """'''
+        self.columns = columns
+        self.current: Dict[str, Tuple[int, bool]] = {view: (0, False) for view in columns}
+
+    def click(self, view: str, column: int) -> Tuple[int, bool]:
+        '''    """Record a header click and return the new (column, descending).
+
+Parameters:
+    view: parameter.
+    column: parameter.
+    """'''
+        col, descending = self.current[view]
+        self.current[view] = (column, not descending if column == col else False)
+        return self.current[view]
+
+    def kwargs(self, view: str) -> Dict[str, Any]:
+        '''    """order_by/descending keyword arguments for the view's DBStore.list_* call.
+
+Parameters:
+    view: parameter.
+    """'''
+        col, descending = self.current[view]
+        return {'order_by': self.columns[view][col], 'descending': descending}
+
+def bound_value(value: object) -> Optional[int]:
+    '''    """Numeric filter-bar bound from a spin box, or None for "any".
+
+Parameters:
+    value: the widget's value or text; blank, ANY_BOUND and anything that is not a whole number mean "any".
+    """'''
+    text = str(value).strip()
+    return int(text) if text.isdecimal() else None
+
+def view_filter(view: str, values: Dict[str, Any]) -> Optional[Filter]:
+    '''    """Filter for one table view from the filter bar, keeping only criteria that apply to it.
+
+None, empty and unchecked values mean "any"; a 0 bound is kept, exactly as
+Filter.active() and compile_filter treat it. The single "empty" checkbox means
+no courses for students and instructors and no students for courses.
+
+Parameters:
+    view: 'students', 'instructors' or 'courses'.
+    values: min_age, max_age, course_id, instructor_id, empty, min_size as read from the widgets.
+    """'''
+    values = dict(values)
+    if values.pop('empty', False):
+        values['no_students' if view == 'courses' else 'no_courses'] = True
+    kw = {k: v.strip() if isinstance(v, str) else v for k, v in values.items() if k in FILTER_FIELDS[view]}
+    kw = {k: v for k, v in kw.items() if k in Filter(**kw).active()}
+    return Filter(**kw) if kw else None
+
+def seats_text(enrolled: int, capacity: Optional[int]) -> str:
+    '''    """Seats column of a course row: the enrollment, followed by the capacity when there is one.
+
+Parameters:
+    enrolled: parameter.
+    capacity: parameter.
+    """'''
+    return str(enrolled) if capacity is None else f'{enrolled} / {capacity}'
+
+def capacity_text(seats: str) -> str:
+    '''    """Capacity part of a seats_text() cell, '' when unlimited, for filling the course form from a selected row.
+
+Parameters:
+    seats: parameter.
+    """'''
+    return str(seats).partition(' / ')[2]
+
+def parse_capacity(text: str) -> Optional[int]:
+    '''    """Capacity typed into a course form; blank means unlimited.
+
+Parameters:
+    text: parameter.
+    """'''
+    text = text.strip()
+    if not text:
+        return None
+    if not text.isdigit():
+        raise ValidationError('Capacity must be a non-negative integer.')
+    return int(text)
+
+class DirtyViews:
+    """Tracks which table views are stale and rebuilds only the one on screen.
+
+Writes call invalidate() with the tables they touched; every view reading one
+of them is marked dirty, the visible one is rebuilt at once and the others wait
+until show() is called for them (on tab activation).
+"""
+
+    def __init__(self, refresh: Dict[str, Callable[[], None]], visible: Callable[[], Optional[str]], views: Dict[str, Tuple[str, ...]]=VIEW_TABLES):
+        '''    """  init  .
+
+Parameters:
+    refresh: view name -> callable rebuilding that view.
+    visible: returns the name of the view on screen, or None.
+    views: view name -> tables the view reads.
+    """'''
+        self.refresh = refresh
+        self.visible = visible
+        self.views = views
+        self.dirty: Set[str] = set(refresh)
+
+    def invalidate(self, *tables: str) -> None:
+        '''    """Mark views reading any of tables stale and rebuild the visible one.
+
+Parameters:
+    tables: tables a write touched; none means every view.
+    """'''
+        for view in self.refresh:
+            if not tables or set(self.views.get(view, ())).intersection(tables):
+                self.dirty.add(view)
+        self.show(self.visible())
+
+    def show(self, view: Optional[str]) -> None:
+        '''    """Rebuild view if it is stale (call when its tab becomes visible).
+
+Parameters:
+    view: parameter.
+    """'''
+        if view in self.dirty:
+            self.dirty.discard(view)
+            self.refresh[view]()
+
+    def clean(self, view: str) -> None:
+        '''    """Record that view was just rebuilt by other means (e.g. a search).
+
+Parameters:
+    view: parameter.
+    """'''
+        self.dirty.discard(view)
+
+class KeyedRows:
+    """Reconciles a table widget with a new row set, keyed by the entity ID in the first column.
+
+A pass is begin(), any number of feed() calls with consecutive pages, then
+end(). Rows already on screen with the same key and values are left alone, so
+selection and scroll position survive and a one-row change costs one widget
+operation. Subclasses implement the three widget primitives; the key order and
+values mirrored here make every decision without reading the widget back.
+"""
+
+    def __init__(self, key_column: int=0):
+        '''    """  init  .
+
+Parameters:
+    key_column: index of the ID within each row.
+    """'''
+        self.key_column = key_column
+        self.keys: List[Any] = []
+        self.values: Dict[Any, tuple] = {}
+        self._pos = 0
+
+    def begin(self) -> None:
+        '''"""Start a reconciliation pass.
+
+"""'''
+        self._pos = 0
+
+    def feed(self, batch: List[tuple]) -> None:
+        '''    """Reconcile the next page of the new row set.
+
+Parameters:
+    batch: rows in display order.
+    """'''
+        for row in batch:
+            key = row[self.key_column]
+            pos = self._pos
+            old = self.values.get(key)
+            if old is None:
+                self.keys.insert(pos, key)
+                self._insert(pos, key, row)
+            else:
+                if self.keys[pos] != key:
+                    self._drop(pos, self.keys.index(key, pos))
+                if old != row:
+                    self._update(pos, key, old, row)
+            self.values[key] = row
+            self._pos = pos + 1
+
+    def end(self) -> None:
+        '''"""Finish the pass: drop every row the new set did not contain.
+
+"""'''
+        self._drop(self._pos, len(self.keys))
+
+    def _drop(self, start: int, stop: int) -> None:
+        '''    """Delete the rows between start and stop.
+
+Rows standing between the cursor and the next wanted key are removed rather
+than moved: in an ordered stream they cannot reappear, and if they do (the
+order changed) they are simply inserted again.
+
+Parameters:
+    start: parameter.
+    stop: parameter.
+    """'''
+        keys = self.keys[start:stop]
+        if not keys:
+            return
+        del self.keys[start:stop]
+        for key in keys:
+            del self.values[key]
+        self._delete(start, keys)
+
+    def clear(self) -> None:
+        '''"""Remove every row.
+
+"""'''
+        self.begin()
+        self.end()
+
+    def _insert(self, index: int, key: Any, row: tuple) -> None:
+        '''    """Insert a new row at index.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    row: parameter.
+    """'''
+        raise NotImplementedError
+
+    def _update(self, index: int, key: Any, old: tuple, row: tuple) -> None:
+        '''    """Replace the values of the row at index.
+
+Parameters:
+    index: parameter.
+    key: parameter.
+    old: values currently shown.
+    row: new values.
+    """'''
+        raise NotImplementedError
+
+    def _delete(self, index: int, keys: List[Any]) -> None:
+        '''    """Delete len(keys) consecutive rows starting at index.
+
+Parameters:
+    index: parameter.
+    keys: keys of the deleted rows.
+    """'''
+        raise NotImplementedError
+
+def keyset_rows(list_page: Callable[..., List[Any]], id_attr: str, page: int=STREAM_PAGE, **kwargs: Any) -> Iterator[Any]:
+    '''    """Yield every row of a DBStore.list_* query, fetching the next keyset page only when the previous one is used up.
+
+Parameters:
+    list_page: bound list_students/list_instructors/list_courses.
+    id_attr: ID attribute of the row type, passed back as after_id.
+    page: rows per query.
+    kwargs: order_by, descending and where, forwarded to every page.
+    """'''
+    after = None
+    while True:
+        rows = list_page(after_id=after, limit=page, **kwargs)
+        yield from rows
+        if len(rows) < page:
+            return
+        after = getattr(rows[-1], id_attr)
+
+class PagedLoader:
+    """Feeds rows to a widget sink in pages, yielding to the event loop between pages.
+
+The first page is delivered synchronously so the user sees data immediately;
+later pages are scheduled through the toolkit callback (Tk ``after`` or Qt
+``QTimer.singleShot``). Starting a new load for the same key cancels the old one.
+"""
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], Any], first_page: int=STARTUP_PAGE, page: int=STREAM_PAGE, metrics: Optional[RefreshMetrics]=None):
+        '''    """  init  .
+
+Parameters:
+    schedule: callable that runs a zero-argument function on the next event-loop turn.
+    first_page: rows delivered synchronously.
+    page: rows delivered per later turn.
+    metrics: optional RefreshMetrics fed with per-page DB and widget time.
+    """'''
+        self.schedule = schedule
+        self.first_page = first_page
+        self.page = page
+        self.metrics = metrics
+        self._gen: Dict[str, int] = {}
+        self._active: Dict[str, bool] = {}
+
+    def start(self, key: str, rows: Iterable[Any], sink: Callable[[List[Any]], None], done: Optional[Callable[[], None]]=None) -> None:
+        '''    """Begin streaming rows for key, replacing any stream already running for it.
+
+Parameters:
+    key: widget/table name.
+    rows: row iterable; consumed lazily.
+    sink: receives each page as a list.
+    done: called once every row has been delivered.
+    """'''
+        gen = self._gen.get(key, 0) + 1
+        self._gen[key] = gen
+        self._active[key] = True
+        if self.metrics is not None:
+            self.metrics.start(key)
+        it = iter(rows)
+        self._step(key, gen, it, sink, done, self.first_page)
+
+    def _step(self, key: str, gen: int, it: Iterator[Any], sink: Callable[[List[Any]], None], done: Optional[Callable[[], None]], n: int) -> None:
+        '''    """ step.
+
+Parameters:
+    key: parameter.
+    gen: parameter.
+    it: parameter.
+    sink: parameter.
+    done: parameter.
+    n: parameter.
+    """'''
+        if self._gen.get(key) != gen:
+            return
+        t0 = time.perf_counter()
+        batch = list(islice(it, n))
+        t1 = time.perf_counter()
+        if batch:
+            sink(batch)
+        if self.metrics is not None:
+            self.metrics.add(key, t1 - t0, time.perf_counter() - t1, len(batch))
+        if len(batch) < n:
+            self._active[key] = False
+            if self.metrics is not None:
+                self.metrics.finish(key)
+            if done:
+                done()
+            return
+        self.schedule(lambda: self._step(key, gen, it, sink, done, self.page))
+
+    def cancel(self, key: str) -> None:
+        '''    """Stop the stream for key, if any.
+
+Parameters:
+    key: parameter.
+    """'''
+        self._gen[key] = self._gen.get(key, 0) + 1
+        if self._active.get(key) and self.metrics is not None:
+            self.metrics.discard(key)
+        self._active[key] = False
+
+    def cancel_all(self) -> None:
+        '''"""Stop every running stream (call before closing the data store).
+
+"""'''
+        for key in list(self._gen):
+            self.cancel(key)
+
+    def busy(self) -> bool:
+        '''"""True while any stream still has rows to deliver.
+
+"""'''
+        return any(self._active.values())
@@ -0,0 +1,248 @@
+'''"""
+Shared Field Validators — School Management System
+
+This module is part of a course project that demonstrates a simple School Management System.
+It follows the same documentation style across modules: a clear overview, responsibilities,
+and how this component interacts with others in the project.
+
+Date: 2025-09-22
+Author: Anthony Haddad
+
+Contents:
+- ValidationError, re-exported by person and db_store
+- The precompiled email pattern and scalar field checks shared by Person, Course and DBStore
+- Column-wise masks for validating whole imported columns in one pass
+- validate_batch: per-row error reports for large imports, optionally across a process pool
+"""'''
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+class ValidationError(Exception):
+    """ValidationError class used within the School Management System."""
+    pass
+EMAIL_RE = re.compile('^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$')
+_email_match = EMAIL_RE.match
+
+def require_text(value: Any, message: str) -> str:
+    '''    """Return value stripped, or raise when it is not a non-blank string.
+
+Parameters:
+    value: parameter.
+    message: error message used for the ValidationError.
+    """'''
+    if not isinstance(value, str) or not value.strip():
+        raise ValidationError(message)
+    return value.strip()
+
+def check_name(value: Any) -> str:
+    '''    """Validate and normalize a person name.
+
+Parameters:
+    value: parameter.
+    """'''
+    return require_text(value, 'Name cannot be empty.')
+
+def check_age(value: Any) -> int:
+    '''    """Validate an age.
+
+Parameters:
+    value: parameter.
+    """'''
+    if not isinstance(value, int) or value < 0:
+        raise ValidationError('Age must be a non-negative integer.')
+    return value
+
+def check_email(value: Any) -> str:
+    '''    """Validate an email address against the shared precompiled pattern.
+
+Parameters:
+    value: parameter.
+    """'''
+    if not isinstance(value, str) or not _email_match(value):
+        raise ValidationError(f'Invalid email format: {value}')
+    return value
+
+def check_capacity(value: Any) -> Optional[int]:
+    '''    """Validate a course capacity; None means unlimited.
+
+Parameters:
+    value: parameter.
+    """'''
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+        raise ValidationError('Capacity must be a non-negative integer.')
+    return value
+
+def text_mask(values: Sequence[Any]) -> List[bool]:
+    '''    """Column check: True where the value is a non-blank string.
+
+Parameters:
+    values: one column of imported values.
+    """'''
+    try:
+        return list(map(bool, map(str.strip, values)))
+    except TypeError:
+        return [isinstance(v, str) and bool(v.strip()) for v in values]
+
+def age_mask(values: Sequence[Any]) -> List[bool]:
+    '''    """Column check: True where the value is a non-negative int.
+
+Parameters:
+    values: one column of imported values.
+    """'''
+    return [isinstance(v, int) and v >= 0 for v in values]
+
+def email_mask(values: Sequence[Any]) -> List[bool]:
+    '''    """Column check: True where the value matches the email pattern.
+
+Parameters:
+    values: one column of imported values.
+    """'''
+    try:
+        return list(map(bool, map(_email_match, values)))
+    except TypeError:
+        return [isinstance(v, str) and _email_match(v) is not None for v in values]
+KIND_FIELDS = {'student': ('student_id', 'name', 'age', 'email'), 'instructor': ('instructor_id', 'name', 'age', 'email'), 'course': ('course_id', 'course_name')}
+E_NOT_A_RECORD = 'not_a_record'
+E_MISSING_ID = 'missing_id'
+E_DUPLICATE_ID = 'duplicate_id'
+E_EMPTY_NAME = 'empty_name'
+E_BAD_AGE = 'bad_age'
+E_BAD_EMAIL = 'bad_email'
+E_EMPTY_COURSE_NAME = 'empty_course_name'
+BATCH_CHUNK_SIZE = 20000
+
+@dataclass
+class RowError:
+    """One rejected field of one input row."""
+    row: int
+    field: str
+    code: str
+    message: str
+
+@dataclass
+class BatchReport:
+    """Outcome of validate_batch: every per-row error plus helpers to split accepted and rejected rows."""
+    kind: str
+    total: int
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        '''"""True when no row was rejected.
+
+"""'''
+        return not self.errors
+
+    def rejected_rows(self) -> Set[int]:
+        '''"""Indexes of rows with at least one error.
+
+"""'''
+        return {e.row for e in self.errors}
+
+    def valid_rows(self) -> List[int]:
+        '''"""Indexes of rows that passed every check, in input order.
+
+"""'''
+        bad = self.rejected_rows()
+        return [n for n in range(self.total) if n not in bad]
+
+    def codes_by_row(self) -> Dict[int, List[str]]:
+        '''"""Map of row index to its error codes.
+
+"""'''
+        out: Dict[int, List[str]] = {}
+        for e in self.errors:
+            out.setdefault(e.row, []).append(e.code)
+        return out
+
+    def counts(self) -> Dict[str, int]:
+        '''"""Number of errors per error code.
+
+"""'''
+        out: Dict[str, int] = {}
+        for e in self.errors:
+            out[e.code] = out.get(e.code, 0) + 1
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''"""JSON-serializable form of the report.
+
+"""'''
+        return {'kind': self.kind, 'total': self.total, 'rejected': len(self.rejected_rows()), 'counts': self.counts(), 'errors': [asdict(e) for e in self.errors]}
+
+def _age_value(v: Any) -> Any:
+    '''    """ age value.
+
+Parameters:
+    v: parameter.
+    """'''
+    if isinstance(v, str) and v.strip().isdecimal():
+        return int(v)
+    return v
+
+def _validate_chunk(records: Sequence[Any], kind: str, offset: int) -> List[RowError]:
+    '''    """Field-level checks for one slice of records; runs in the parent or a worker process.
+
+Parameters:
+    records: slice of input records.
+    kind: 'student', 'instructor' or 'course'.
+    offset: row index of records[0] in the full batch.
+    """'''
+    fields = KIND_FIELDS[kind]
+    errors: List[RowError] = []
+    is_rec = [isinstance(r, dict) for r in records]
+    for n, flag in enumerate(is_rec):
+        if not flag:
+            errors.append(RowError(offset + n, '', E_NOT_A_RECORD, 'Row is not an object.'))
+    recs = [r if flag else {} for r, flag in zip(records, is_rec)]
+    cols = {f: [r.get(f) for r in recs] for f in fields}
+    id_field = fields[0]
+    checks = [(id_field, text_mask(cols[id_field]), E_MISSING_ID, f'{id_field} cannot be empty.')]
+    if kind == 'course':
+        checks.append(('course_name', text_mask(cols['course_name']), E_EMPTY_COURSE_NAME, 'Course name cannot be empty.'))
+    else:
+        checks.append(('name', text_mask(cols['name']), E_EMPTY_NAME, 'Name cannot be empty.'))
+        checks.append(('age', age_mask(list(map(_age_value, cols['age']))), E_BAD_AGE, 'Age must be a non-negative integer.'))
+        checks.append(('email', email_mask(cols['email']), E_BAD_EMAIL, 'Invalid email format.'))
+    for fname, mask, code, message in checks:
+        for n, good in enumerate(mask):
+            if not good and is_rec[n]:
+                errors.append(RowError(offset + n, fname, code, message))
+    return errors
+
+def validate_batch(records: Sequence[Any], kind: str, *, processes: Optional[int]=None, chunk_size: int=BATCH_CHUNK_SIZE) -> BatchReport:
+    '''    """Validate many incoming records at once without touching any store.
+
+Applies the same rules as Person, Course and DBStore column by column and
+reports every failing field instead of stopping at the first error. IDs
+repeated within the batch are reported as duplicate_id on the later rows.
+
+Parameters:
+    records: list of dicts shaped like DBStore.to_dict() entries.
+    kind: 'student', 'instructor' or 'course'.
+    processes: worker processes for large batches (None or 1 runs inline).
+    chunk_size: rows per worker task.
+    """'''
+    if kind not in KIND_FIELDS:
+        raise ValidationError(f"Unknown record kind '{kind}'.")
+    records = list(records)
+    if processes and processes > 1 and len(records) > chunk_size:
+        from concurrent.futures import ProcessPoolExecutor
+        starts = range(0, len(records), chunk_size)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = pool.map(_validate_chunk, [records[i:i + chunk_size] for i in starts], [kind] * len(starts), starts)
+            errors = [e for part in parts for e in part]
+    else:
+        errors = _validate_chunk(records, kind, 0)
+    id_field = KIND_FIELDS[kind][0]
+    seen: Set[str] = set()
+    for n, r in enumerate(records):
+        rid = r.get(id_field) if isinstance(r, dict) else None
+        if isinstance(rid, str) and rid.strip():
+            rid = rid.strip()
+            if rid in seen:
+                errors.append(RowError(n, id_field, E_DUPLICATE_ID, f"Duplicate {id_field} '{rid}' in batch."))
+            seen.add(rid)
+    errors.sort(key=lambda e: e.row)
+    return BatchReport(kind, len(records), errors)